@@ -56,6 +56,8 @@ def main():
         data_cli.execute_cli(args)
     elif args.command == "execute":
         execution_cli.execute_cli(args)
+    elif args.command == "broadcast":
+        execution_cli.broadcast_cli(args)
     elif args.command == "analyze":
         analyze_cli.execute_cli(args)
     elif args.command == "version":
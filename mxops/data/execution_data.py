@@ -6,12 +6,14 @@ This module contains the functions to load, write and update scenario data
 
 from __future__ import annotations
 from copy import deepcopy
-from dataclasses import asdict, dataclass, field, is_dataclass
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
+from functools import lru_cache
 import os
 from pathlib import Path
 import re
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from mxpyserializer.abi_serializer import AbiSerializer
 
@@ -19,14 +21,42 @@ from mxops.config.config import Config
 from mxops.data.path import (
     get_all_checkpoints_names,
     get_scenario_file_path,
+    get_scenario_journal_path,
 )
 from mxops import enums as mxops_enums
 from mxops import errors
-from mxops.data.utils import json_dump, json_load
+from mxops.data.serializers import get_serializer_dict, load_serializer_from_dict
+from mxops.data.utils import json_dump, json_dumps, json_load, json_loads
 from mxops.utils.logger import get_logger
 
 
 LOGGER = get_logger("data")
+# guards the modifications and the saves of the scenario data when steps are
+# executed concurrently
+_DATA_LOCK = threading.RLock()
+
+
+# This regex captures:
+# - words, possibly including hyphens
+# - numbers within square brackets
+VALUE_KEY_PATTERN = re.compile(r"([\w\-]+)|\[(\d+)\]")
+
+
+@lru_cache(maxsize=4096)
+def _parse_value_key(path: str) -> Tuple[int | str, ...]:
+    """
+    Parse a value key string into keys and indices. The results are cached as
+    the same keys are parsed again and again during an execution.
+
+    :param path: value key to parse
+    :type path: str
+    :return: keys and indices of the value key
+    :rtype: Tuple[int | str, ...]
+    """
+    tokens = VALUE_KEY_PATTERN.findall(path)
+
+    # Flatten the list and convert indices to int
+    return tuple(int(index) if index else key for key, index in tokens)
 
 
 def parse_value_key(path) -> List[int | str]:
@@ -35,14 +65,20 @@ def parse_value_key(path) -> List[int | str]:
 
     e.g. "key_1.key2[2].data" -> ['key_1', 'key2', 2, 'data']
     """
-    # This regex captures:
-    # - words, possibly including hyphens
-    # - numbers within square brackets
-    pattern = r"([\w\-]+)|\[(\d+)\]"
-    tokens = re.findall(pattern, path)
+    return list(_parse_value_key(path))
 
-    # Flatten the list and convert indices to int
-    return [int(index) if index else key for key, index in tokens]
+
+@lru_cache(maxsize=None)
+def _get_public_field_names(cls: type) -> FrozenSet[str]:
+    """
+    Return the names of the public fields of a dataclass
+
+    :param cls: dataclass to inspect
+    :type cls: type
+    :return: names of the fields
+    :rtype: FrozenSet[str]
+    """
+    return frozenset(f.name for f in fields(cls) if not f.name.startswith("_"))
 
 
 @dataclass(kw_only=True)
@@ -175,12 +211,9 @@ class SavedValuesData:
         :return: value saved under the attribute or the value key provided
         :rtype: Any
         """
-        try:
+        if value_key in _get_public_field_names(type(self)):
             return getattr(self, value_key)
-        except AttributeError:
-            pass
-        parsed_value_key = parse_value_key(value_key)
-        return self._get_element(parsed_value_key)
+        return self._get_element(parse_value_key(value_key))
 
 
 @dataclass
@@ -214,15 +247,41 @@ class ContractData(SavedValuesData):
         :return: this instance as a dictionary
         :rtype: Dict
         """
-        self_dict = asdict(self)
-        if self.serializer is None:
-            self_dict["serializer"] = None
-        else:
-            self_dict["serializer"] = self.serializer.to_dict()
+        # the serializer is converted separately as asdict would deep copy it
+        self_dict = {}
+        for data_field in fields(self):
+            if data_field.name == "serializer":
+                self_dict["serializer"] = None
+            else:
+                self_dict[data_field.name] = deepcopy(getattr(self, data_field.name))
+        if self.serializer is not None:
+            self_dict["serializer"] = get_serializer_dict(self.serializer)
         # add attribute to indicate internal/external
         self_dict["is_external"] = isinstance(self, ExternalContractData)
         return self_dict
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> ContractData:
+        """
+        Create an instance of InternalContractData or ExternalContractData
+        from a dictionary
+
+        :param data: dictionary to transform into ContractData
+        :type data: Dict
+        :return: instance from the input dictionary
+        :rtype: ContractData
+        """
+        data = dict(data)
+        is_external = data.pop("is_external", False)
+        serializer_kwargs = data.pop("serializer", None)
+        if isinstance(serializer_kwargs, dict):
+            data["serializer"] = load_serializer_from_dict(serializer_kwargs)
+        else:
+            data["serializer"] = None
+        if is_external:
+            return ExternalContractData(**data)
+        return InternalContractData(**data)
+
     def __eq__(self, other: Any) -> bool:
         """
         Define the equal operator
@@ -257,8 +316,8 @@ class InternalContractData(ContractData):
         :param value: value to save
         :type value: Any
         """
-        if value_key == "last_upgrade_time":
-            self.last_upgrade_time = value
+        if value_key in ("wasm_hash", "deploy_time", "last_upgrade_time"):
+            setattr(self, value_key, value)
         else:
             super().set_value(value_key, value)
 
@@ -345,6 +404,21 @@ class _ScenarioData(SavedValuesData):
     last_update_time: int
     contracts_data: Dict[str, ContractData] = field(default_factory=dict)
     tokens_data: Dict[str, TokenData] = field(default_factory=dict)
+    execution_cursor: Optional[Dict[str, Any]] = None
+    steps_fingerprints: Dict[str, List[Optional[str]]] = field(default_factory=dict)
+    _dirty_contracts: Set[str] = field(
+        default_factory=set, init=False, repr=False, compare=False
+    )
+    _dirty_tokens: Set[str] = field(
+        default_factory=set, init=False, repr=False, compare=False
+    )
+    _n_pending_changes: int = field(default=0, init=False, repr=False, compare=False)
+    _last_save_time: float = field(
+        default_factory=time.time, init=False, repr=False, compare=False
+    )
+    _n_saves: int = field(default=0, init=False, repr=False, compare=False)
+    _n_bytes_written: int = field(default=0, init=False, repr=False, compare=False)
+    _n_journal_records: int = field(default=0, init=False, repr=False, compare=False)
 
     def get_contract_value(self, contract_id: str, value_key: str) -> Any:
         """
@@ -372,13 +446,24 @@ class _ScenarioData(SavedValuesData):
         :param value_key: key for the value to set
         :type value_key: str
         """
-        self._set_update_time()
-        try:
-            contract = self.contracts_data[contract_id]
-        except KeyError as err:
-            raise errors.UnknownContract(self.name, contract_id) from err
-        contract.set_value(value_key, value)
-        self.save()
+        with _DATA_LOCK:
+            self._set_update_time()
+            try:
+                contract = self.contracts_data[contract_id]
+            except KeyError as err:
+                raise errors.UnknownContract(self.name, contract_id) from err
+            record_value = value
+            if value_key == "serializer" and value is not None:
+                # the serializer is journaled in its dictionary form, as in snapshots
+                record_value = get_serializer_dict(value)
+            record = {
+                "op": "set_contract",
+                "id": contract_id,
+                "key": value_key,
+                "value": record_value,
+            }
+            contract.set_value(value_key, value)
+            self._register_change(record, contract_id=contract_id)
 
     def add_contract_data(self, contract_data: ContractData):
         """
@@ -387,10 +472,27 @@ class _ScenarioData(SavedValuesData):
         :param contract_data: data to add to the scenario
         :type contract_data: ContractData
         """
-        self._set_update_time()
-        if contract_data.contract_id in self.contracts_data:
-            raise errors.ContractIdAlreadyExists(contract_data.contract_id)
-        self.contracts_data[contract_data.contract_id] = contract_data
+        with _DATA_LOCK:
+            self._set_update_time()
+            if contract_data.contract_id in self.contracts_data:
+                raise errors.ContractIdAlreadyExists(contract_data.contract_id)
+            self.contracts_data[contract_data.contract_id] = contract_data
+            record = {"op": "add_contract", "data": contract_data.to_dict()}
+            self._register_change(record, contract_id=contract_data.contract_id)
+
+    def remove_contract_data(self, contract_id: str):
+        """
+        Remove the data of a contract from the scenario
+
+        :param contract_id: unique id of the contract in the scenario
+        :type contract_id: str
+        """
+        with _DATA_LOCK:
+            self._set_update_time()
+            if self.contracts_data.pop(contract_id, None) is None:
+                raise errors.UnknownContract(self.name, contract_id)
+            record = {"op": "remove_contract", "id": contract_id}
+            self._register_change(record, contract_id=contract_id)
 
     def get_token_value(self, token_name: str, value_key: str) -> Any:
         """
@@ -418,13 +520,20 @@ class _ScenarioData(SavedValuesData):
         :param value_key: key for the value to set
         :type value_key: str
         """
-        self._set_update_time()
-        try:
-            token_data = self.tokens_data[token_name]
-        except KeyError as err:
-            raise errors.UnknownToken(self.name, token_name) from err
-        token_data.set_value(value_key, value)
-        self.save()
+        with _DATA_LOCK:
+            self._set_update_time()
+            try:
+                token_data = self.tokens_data[token_name]
+            except KeyError as err:
+                raise errors.UnknownToken(self.name, token_name) from err
+            token_data.set_value(value_key, value)
+            record = {
+                "op": "set_token",
+                "id": token_name,
+                "key": value_key,
+                "value": value,
+            }
+            self._register_change(record, token_name=token_name)
 
     def add_token_data(self, token_data: TokenData):
         """
@@ -433,10 +542,13 @@ class _ScenarioData(SavedValuesData):
         :param contract_data: data to add to the scenario
         :type contract_data: ContractData
         """
-        self._set_update_time()
-        if token_data.name in self.tokens_data:
-            raise errors.TokenNameAlreadyExists(token_data.name)
-        self.tokens_data[token_data.name] = token_data
+        with _DATA_LOCK:
+            self._set_update_time()
+            if token_data.name in self.tokens_data:
+                raise errors.TokenNameAlreadyExists(token_data.name)
+            self.tokens_data[token_data.name] = token_data
+            record = {"op": "add_token", "data": token_data.to_dict()}
+            self._register_change(record, token_name=token_data.name)
 
     def get_value(self, value_key: str) -> Any:
         """
@@ -448,18 +560,16 @@ class _ScenarioData(SavedValuesData):
         :return: value saved
         :rtype: Any
         """
-        parsed_value_key = parse_value_key(value_key)
+        parsed_value_key = _parse_value_key(value_key)
         if len(parsed_value_key) > 1:
             root_name = parsed_value_key[0]
             value_sub_key = value_key[len(root_name) + 1 :]  # remove also the dot
-            try:
-                return self.get_contract_value(root_name, value_sub_key)
-            except errors.UnknownContract:
-                pass
-            try:
-                return self.get_token_value(root_name, value_sub_key)
-            except errors.UnknownToken:
-                pass
+            contract_data = self.contracts_data.get(root_name)
+            if contract_data is not None:
+                return contract_data.get_value(value_sub_key)
+            token_data = self.tokens_data.get(root_name)
+            if token_data is not None:
+                return token_data.get_value(value_sub_key)
         return super().get_value(value_key)
 
     def set_value(self, value_key: str, value: Any):
@@ -471,19 +581,238 @@ class _ScenarioData(SavedValuesData):
         :param value: value to save
         :type value: Any
         """
-        parsed_value_key = parse_value_key(value_key)
-        if len(parsed_value_key) > 1:
-            root_name = parsed_value_key[0]
-            value_sub_key = value_key[len(root_name) + 1 :]  # remove also the dot
-            try:
-                return self.set_contract_value(root_name, value_sub_key, value)
-            except errors.UnknownContract:
-                pass
+        with _DATA_LOCK:
+            parsed_value_key = _parse_value_key(value_key)
+            if len(parsed_value_key) > 1:
+                root_name = parsed_value_key[0]
+                value_sub_key = value_key[len(root_name) + 1 :]  # remove also the dot
+                if root_name in self.contracts_data:
+                    return self.set_contract_value(root_name, value_sub_key, value)
+                if root_name in self.tokens_data:
+                    return self.set_token_value(root_name, value_sub_key, value)
+            super().set_value(value_key, value)
+            self._set_update_time()
+            self._register_change({"op": "set", "key": value_key, "value": value})
+
+    def set_execution_cursor(self, cursor: Optional[Dict[str, Any]]):
+        """
+        Set the position reached by the execution of the scenes, which allows to
+        resume an interrupted execution
+
+        :param cursor: position of the execution, None once the execution completed
+        :type cursor: Optional[Dict[str, Any]]
+        """
+        with _DATA_LOCK:
+            self.execution_cursor = cursor
+            self._register_change({"op": "set_cursor", "cursor": cursor})
+
+    def is_fingerprint_executed(self, fingerprint: str, occurrence: int) -> bool:
+        """
+        Indicate if a successful execution was recorded for an occurrence of a step
+        fingerprint. The occurrences may be recorded out of order, the ones not
+        recorded yet being left empty.
+
+        :param fingerprint: fingerprint of a step
+        :type fingerprint: str
+        :param occurrence: occurrence of the fingerprint, starting from 1
+        :type occurrence: int
+        :return: if the occurrence was executed successfully
+        :rtype: bool
+        """
+        with _DATA_LOCK:
+            tx_hashes = self.steps_fingerprints.get(fingerprint, [])
+            if occurrence > len(tx_hashes):
+                return False
+            return tx_hashes[occurrence - 1] is not None
+
+    def record_step_fingerprint(
+        self, fingerprint: str, occurrence: int, tx_hash: Optional[str]
+    ):
+        """
+        Record the successful execution of a step, identified by its fingerprint
+        and by the number of times this fingerprint was met during the execution
+
+        :param fingerprint: fingerprint of the step
+        :type fingerprint: str
+        :param occurrence: occurrence of the fingerprint, starting from 1
+        :type occurrence: int
+        :param tx_hash: hash of the transaction sent by the step
+        :type tx_hash: Optional[str]
+        """
+        with _DATA_LOCK:
+            self._set_fingerprint_execution(fingerprint, occurrence, tx_hash)
+            record = {
+                "op": "set_fingerprint",
+                "fingerprint": fingerprint,
+                "occurrence": occurrence,
+                "tx_hash": tx_hash,
+            }
+            self._register_change(record)
+
+    def _set_fingerprint_execution(
+        self, fingerprint: str, occurrence: int, tx_hash: Optional[str]
+    ):
+        """
+        Set the transaction of an occurrence of a step fingerprint
+
+        :param fingerprint: fingerprint of the step
+        :type fingerprint: str
+        :param occurrence: occurrence of the fingerprint, starting from 1
+        :type occurrence: int
+        :param tx_hash: hash of the transaction sent by the step
+        :type tx_hash: Optional[str]
+        """
+        tx_hashes = self.steps_fingerprints.setdefault(fingerprint, [])
+        tx_hashes.extend([None] * (occurrence - len(tx_hashes)))
+        tx_hashes[occurrence - 1] = tx_hash
+
+    def _register_change(
+        self,
+        record: Dict[str, Any],
+        contract_id: Optional[str] = None,
+        token_name: Optional[str] = None,
+    ):
+        """
+        Record a modification of the scenario data.
+        With the journal storage, the modification is appended to the journal
+        which is compacted into the snapshot once it is long enough.
+        With the snapshot storage, the modification is pending until the data is
+        saved, once the thresholds are reached.
+
+        :param record: description of the modification, used by the journal
+        :type record: Dict[str, Any]
+        :param contract_id: id of the modified contract, defaults to None
+        :type contract_id: Optional[str]
+        :param token_name: name of the modified token, defaults to None
+        :type token_name: Optional[str]
+        """
+        config = Config.get_config()
+        with _DATA_LOCK:
+            if config.get("DATA_STORAGE").lower() == "journal":
+                self._append_to_journal(record)
+                threshold = int(config.get("DATA_JOURNAL_COMPACTION_THRESHOLD"))
+                if self._n_journal_records >= threshold:
+                    self.save()
+                return
+            if contract_id is not None:
+                self._dirty_contracts.add(contract_id)
+            if token_name is not None:
+                self._dirty_tokens.add(token_name)
+            self._n_pending_changes += 1
+            self.save_if_needed()
+
+    def _append_to_journal(self, record: Dict[str, Any]):
+        """
+        Append a modification record to the journal of this scenario
+
+        :param record: description of the modification
+        :type record: Dict[str, Any]
+        """
+        record = {**record, "time": self.last_update_time}
+        line = json_dumps(record, indent=None) + "\n"
+        journal_path = get_scenario_journal_path(self.name)
+        with open(journal_path.as_posix(), "a", encoding="utf-8") as file:
+            file.write(line)
+        self._n_journal_records += 1
+        self._n_bytes_written += len(line.encode("utf-8"))
+
+    def _apply_journal_record(self, record: Dict[str, Any]):
+        """
+        Apply to this instance a modification read from the journal
+
+        :param record: description of the modification
+        :type record: Dict[str, Any]
+        """
+        operation = record["op"]
+        if operation == "set_contract":
+            value = record["value"]
+            if record["key"] == "serializer" and isinstance(value, dict):
+                value = load_serializer_from_dict(value)
+            self.contracts_data[record["id"]].set_value(record["key"], value)
+        elif operation == "set_token":
+            self.tokens_data[record["id"]].set_value(record["key"], record["value"])
+        elif operation == "add_contract":
+            contract_data = ContractData.from_dict(record["data"])
+            self.contracts_data[contract_data.contract_id] = contract_data
+        elif operation == "remove_contract":
+            del self.contracts_data[record["id"]]
+        elif operation == "add_token":
+            token_data = TokenData.from_dict(record["data"])
+            self.tokens_data[token_data.name] = token_data
+        elif operation == "set":
+            SavedValuesData.set_value(self, record["key"], record["value"])
+        elif operation == "set_cursor":
+            self.execution_cursor = record["cursor"]
+        elif operation == "set_fingerprint":
+            self._set_fingerprint_execution(
+                record["fingerprint"], record["occurrence"], record["tx_hash"]
+            )
+        else:
+            raise ValueError(f"Unknown journal operation: {operation}")
+        self.last_update_time = record["time"]
+
+    def replay_journal(self):
+        """
+        Apply the modifications recorded in the journal of this scenario, if any.
+        An incomplete last record, left by an interrupted write, is ignored.
+        """
+        journal_path = get_scenario_journal_path(self.name)
+        try:
+            with open(journal_path.as_posix(), "rb") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return
+        valid_size = 0
+        for i, line in enumerate(lines):
             try:
-                return self.set_token_value(root_name, value_sub_key, value)
-            except errors.UnknownToken:
-                pass
-        return super().set_value(value_key, value)
+                if not line.endswith(b"\n"):
+                    raise ValueError("Incomplete journal record")
+                record = json_loads(line.decode("utf-8"))
+            except ValueError:
+                if i < len(lines) - 1:
+                    raise
+                LOGGER.warning(f"Dropping the incomplete last record of {journal_path}")
+                # the next records must not be appended to the incomplete line
+                os.truncate(journal_path.as_posix(), valid_size)
+                break
+            self._apply_journal_record(record)
+            self._n_journal_records += 1
+            valid_size += len(line)
+
+    def has_pending_changes(self) -> bool:
+        """
+        Indicate if some modifications have not been saved yet
+
+        :return: if the scenario data is dirty
+        :rtype: bool
+        """
+        return self._n_pending_changes > 0
+
+    def save_if_needed(self):
+        """
+        Save the scenario data if the number of pending modifications or the time
+        since the last save exceed the thresholds set in the config
+        (DATA_SAVE_MAX_PENDING and DATA_SAVE_PERIOD)
+        """
+        config = Config.get_config()
+        with _DATA_LOCK:
+            if not self.has_pending_changes():
+                return
+            max_pending = int(config.get("DATA_SAVE_MAX_PENDING"))
+            save_period = float(config.get("DATA_SAVE_PERIOD"))
+            if (
+                self._n_pending_changes >= max_pending
+                or time.time() - self._last_save_time >= save_period
+            ):
+                self.save()
+
+    def flush(self):
+        """
+        Save the scenario data if it has any pending modification
+        """
+        with _DATA_LOCK:
+            if self.has_pending_changes():
+                self.save()
 
     def save(self, checkpoint: str = ""):
         """
@@ -493,8 +822,48 @@ class _ScenarioData(SavedValuesData):
         :param checkpoint: contract id or token name that hosts the value
         :type checkpoint: str
         """
-        scenario_path = get_scenario_file_path(self.name, checkpoint)
-        json_dump(scenario_path, self.to_dict())
+        with _DATA_LOCK:
+            scenario_path = get_scenario_file_path(self.name, checkpoint)
+            n_bytes = json_dump(scenario_path, self.to_dict())
+            self._n_saves += 1
+            self._n_bytes_written += n_bytes
+            if checkpoint == "":
+                # the snapshot now contains all the modifications of the journal
+                try:
+                    os.remove(get_scenario_journal_path(self.name).as_posix())
+                except FileNotFoundError:
+                    pass
+                self._n_journal_records = 0
+                LOGGER.debug(
+                    f"Scenario {self.name} saved ({n_bytes} bytes): "
+                    f"{self._n_pending_changes} modifications, "
+                    f"contracts {sorted(self._dirty_contracts)}, "
+                    f"tokens {sorted(self._dirty_tokens)}"
+                )
+                self._dirty_contracts = set()
+                self._dirty_tokens = set()
+                self._n_pending_changes = 0
+                self._last_save_time = time.time()
+
+    def get_persistence_metrics(self) -> Dict[str, int]:
+        """
+        Return the number of saves made by this instance and the number of bytes
+        they wrote
+
+        :return: persistence metrics
+        :rtype: Dict[str, int]
+        """
+        return {"saves": self._n_saves, "bytes_written": self._n_bytes_written}
+
+    def log_persistence_metrics(self):
+        """
+        Log the persistence metrics of this instance
+        """
+        metrics = self.get_persistence_metrics()
+        LOGGER.debug(
+            f"Scenario {self.name}: {metrics['saves']} saves, "
+            f"{metrics['bytes_written']} bytes written"
+        )
 
     def to_dict(self) -> Dict:
         """
@@ -503,7 +872,12 @@ class _ScenarioData(SavedValuesData):
         :return: this instance as a dictionary
         :rtype: Dict
         """
-        self_dict = {**self.__dict__}
+        self_dict = {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
+        # the execution records are only written once they exist
+        if self.execution_cursor is None:
+            del self_dict["execution_cursor"]
+        if len(self.steps_fingerprints) == 0:
+            del self_dict["steps_fingerprints"]
         for key, value in self_dict.items():
             if isinstance(value, dict):
                 self_dict[key] = {}
@@ -541,7 +915,10 @@ class _ScenarioData(SavedValuesData):
         :rtype: _ScenarioData
         """
         scenario_path = get_scenario_file_path(scenario_name, checkpoint_name)
-        return cls.load_from_path(scenario_path)
+        scenario_data = cls.load_from_path(scenario_path)
+        if checkpoint_name == "":
+            scenario_data.replay_journal()
+        return scenario_data
 
     @classmethod
     def load_from_path(cls, scenario_path: Path) -> _ScenarioData:
@@ -569,24 +946,7 @@ class _ScenarioData(SavedValuesData):
         contracts_data = {}
         for contract_id, contract_data in data["contracts_data"].items():
             if isinstance(contract_data, Dict):
-                try:
-                    is_external = contract_data.pop("is_external")
-                except KeyError:
-                    is_external = False
-                try:
-                    serializer_kwargs = contract_data.pop("serializer")
-                except KeyError:
-                    serializer_kwargs = None
-                if isinstance(serializer_kwargs, dict):
-                    contract_data["serializer"] = AbiSerializer.from_dict(
-                        serializer_kwargs
-                    )
-                else:
-                    contract_data["serializer"] = None
-                if is_external:
-                    contracts_data[contract_id] = ExternalContractData(**contract_data)
-                else:
-                    contracts_data[contract_id] = InternalContractData(**contract_data)
+                contracts_data[contract_id] = ContractData.from_dict(contract_data)
 
         tokens_data = data.get("tokens_data", {})
         tokens_data = {k: TokenData.from_dict(v) for k, v in tokens_data.items()}
@@ -733,6 +1093,11 @@ def delete_scenario_data(
             LOGGER.info(f"The data of the {description} has been deleted")
         except FileNotFoundError:
             LOGGER.warning(f"The {description} does not have any data recorded")
+        if ckp == "":
+            try:
+                os.remove(get_scenario_journal_path(scenario_name).as_posix())
+            except FileNotFoundError:
+                pass
 
 
 def clone_scenario_data(
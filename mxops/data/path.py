@@ -88,6 +88,19 @@ def get_scenario_file_path(scenario_name: str, checkpoint_name: str = "") -> Pat
     return data_path / network.name / f"{scenario_full_name}.json"
 
 
+def get_scenario_journal_path(scenario_name: str) -> Path:
+    """
+    Construct and return the path of the journal of a scenario:
+    <AppDir>/<Network>/<scenario_name>.journal
+
+    :param scenario_name: name of the scenario
+    :type scenario_name: str
+    :return: path to the journal of the scenario
+    :rtype: Path
+    """
+    return get_scenario_file_path(scenario_name).with_suffix(".journal")
+
+
 def get_all_scenarios_names() -> List[str]:
     """
     Return all the scenarios names that have locally saved data in the current network
@@ -0,0 +1,119 @@
+"""
+author: Etienne Wallet
+
+This module contains the process-wide cache of the ABI serializers
+"""
+import json
+from pathlib import Path
+import threading
+from typing import Callable, Dict
+from weakref import WeakKeyDictionary
+
+from mxpyserializer.abi_serializer import AbiSerializer
+
+from mxops.utils.artifacts import load_artifact
+
+
+# serializers keyed by the hash of their ABI file
+_SERIALIZERS: Dict[str, AbiSerializer] = {}
+# dictionary forms of the serializers, forgotten along with their serializer
+_SERIALIZERS_DICTS: "WeakKeyDictionary[AbiSerializer, Dict]" = WeakKeyDictionary()
+_LOCK = threading.Lock()
+
+
+def _get_or_create(key: str, factory: Callable[[], AbiSerializer]) -> AbiSerializer:
+    """
+    Return the cached serializer for a key or create it with the factory
+
+    :param key: content hash identifying the serializer
+    :type key: str
+    :param factory: function that creates the serializer if it is not cached
+    :type factory: Callable[[], AbiSerializer]
+    :return: serializer
+    :rtype: AbiSerializer
+    """
+    with _LOCK:
+        try:
+            return _SERIALIZERS[key]
+        except KeyError:
+            pass
+    serializer = factory()
+    with _LOCK:
+        return _SERIALIZERS.setdefault(key, serializer)
+
+
+def load_serializer_from_abi(abi_path: Path) -> AbiSerializer:
+    """
+    Return the serializer of an ABI file. The serializers are shared by all the
+    ABI files with the same content, so that an ABI is parsed only once per process.
+
+    :param abi_path: path of the ABI file
+    :type abi_path: Path
+    :return: serializer of the ABI
+    :rtype: AbiSerializer
+    """
+    artifact = load_artifact(Path(abi_path))
+    abi_content = artifact.content.decode("utf-8")
+    return _get_or_create(
+        artifact.sha256, lambda: AbiSerializer.from_abi_dict(json.loads(abi_content))
+    )
+
+
+def load_serializer_from_dict(data: Dict) -> AbiSerializer:
+    """
+    Instantiate the serializer described by a dictionary, as produced by
+    AbiSerializer.to_dict, and remember this dictionary as its exported form.
+    The dictionary is not hashed to look for an identical serializer: this would
+    cost more than the instantiation itself.
+
+    :param data: description of the serializer
+    :type data: Dict
+    :return: serializer
+    :rtype: AbiSerializer
+    """
+    serializer = AbiSerializer.from_dict(data)
+    with _LOCK:
+        _SERIALIZERS_DICTS[serializer] = data
+    return serializer
+
+
+def get_serializer_dict(serializer: AbiSerializer) -> Dict:
+    """
+    Return the dictionary form of a serializer. The conversion is made once per
+    serializer as it is costly for big ABIs and the serializers are never modified.
+    The returned dictionary must not be modified.
+
+    :param serializer: serializer to export
+    :type serializer: AbiSerializer
+    :return: dictionary form of the serializer
+    :rtype: Dict
+    """
+    with _LOCK:
+        try:
+            return _SERIALIZERS_DICTS[serializer]
+        except KeyError:
+            pass
+    data = serializer.to_dict()
+    with _LOCK:
+        _SERIALIZERS_DICTS[serializer] = data
+    return data
+
+
+def get_n_cached_serializers() -> int:
+    """
+    Return the number of serializers in the cache
+
+    :return: number of cached serializers
+    :rtype: int
+    """
+    with _LOCK:
+        return len(_SERIALIZERS)
+
+
+def clear_serializers_cache():
+    """
+    Empty the cache of the serializers
+    """
+    with _LOCK:
+        _SERIALIZERS.clear()
+        _SERIALIZERS_DICTS.clear()
@@ -5,8 +5,9 @@ This module contains some utils functions and classes
 """
 import json
 import base64
+import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 class CustomEncoder(json.JSONEncoder):
@@ -66,29 +67,40 @@ def custom_decoder(item: Any) -> Dict:
     return item
 
 
-def json_dump(file_path: Path, obj: Any):
+def json_dump(file_path: Path, obj: Any) -> int:
     """
-    Small wrapper arount json.dump that uses the custom encoder
+    Small wrapper arount json.dump that uses the custom encoder.
+    The data is first written to a temporary file which then replaces the
+    destination file, so that an interruption never leaves a partial file.
 
     :param path: path where to dump the data
     :type path: Path
     :param obj: obj to dump
     :type obj: Any
+    :return: number of bytes written
+    :rtype: int
     """
-    with open(file_path.as_posix(), "w", encoding="utf-8") as file:
-        json.dump(obj, file, cls=CustomEncoder, indent=4)
+    content = json_dumps(obj).encode("utf-8")
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    with open(tmp_path.as_posix(), "wb") as file:
+        file.write(content)
+    os.replace(tmp_path.as_posix(), file_path.as_posix())
+    return len(content)
 
 
-def json_dumps(obj: Any) -> str:
+def json_dumps(obj: Any, indent: Optional[int] = 4) -> str:
     """
     Small wrapper arount json.dumps that uses the custom encoder
 
     :param obj: obj to dump
     :type obj: Any
+    :param indent: indentation of the output, None for a single line,
+        defaults to 4
+    :type indent: Optional[int]
     :return: dumped data
     :rtype: str
     """
-    return json.dumps(obj, cls=CustomEncoder, indent=4)
+    return json.dumps(obj, cls=CustomEncoder, indent=indent)
 
 
 def json_load(file_path: Path) -> Any:
@@ -30,6 +30,15 @@ class TokenTypeEnum(Enum):
     META = "meta"
 
 
+class WalletPoolStrategyEnum(Enum):
+    """
+    Enum describing how the accounts of a wallet pool are chosen as senders
+    """
+
+    ROUND_ROBIN = "round_robin"
+    LEAST_LOADED = "least_loaded"
+
+
 def parse_enum(value: str, enum_class: Type[Enum]) -> Enum:
     """
     Try to match a string to the name or the value of an instance of an Enum class
@@ -88,6 +88,44 @@ class UnknownAccount(Exception):
         super().__init__(message)
 
 
+class InvalidWalletPool(Exception):
+    """
+    To be raised when a wallet pool of a scene is not correctly defined
+    """
+
+    def __init__(self, pool_name: str, reason: str) -> None:
+        message = f"Wallet pool {pool_name} is invalid: {reason}"
+        super().__init__(message)
+
+
+class WalletPoolExhausted(Exception):
+    """
+    To be raised when no account of a wallet pool has enough balance left to pay
+    for a transaction
+    """
+
+    def __init__(self, pool_name: str, required_balance: int) -> None:
+        message = (
+            f"No account of the wallet pool {pool_name} has a balance of at least "
+            f"{required_balance}"
+        )
+        super().__init__(message)
+
+
+class ResumePositionNotFound(Exception):
+    """
+    To be raised when the position saved by an interrupted execution was not
+    reached by the resumed execution
+    """
+
+    def __init__(self, scene_path: str) -> None:
+        message = (
+            f"The execution could not be resumed: the scene {scene_path} "
+            "was not part of the executed elements"
+        )
+        super().__init__(message)
+
+
 class ContractIdAlreadyExists(Exception):
     """
     To be raised when there is a conflict with contract id
@@ -98,6 +136,30 @@ class ContractIdAlreadyExists(Exception):
         super().__init__(message)
 
 
+class ContractAddressMismatch(Exception):
+    """
+    To be raised when a contract was deployed at another address than the one
+    computed for its deployment
+    """
+
+    def __init__(self, contract_id: str, expected: str, found: str) -> None:
+        message = (
+            f"Contract {contract_id} was expected at {expected} "
+            f"but was deployed at {found}"
+        )
+        super().__init__(message)
+
+
+class MissingSourceCode(Exception):
+    """
+    To be raised when the contract used as a source for a deployment has no code
+    """
+
+    def __init__(self, source_contract: str) -> None:
+        message = f"No code was found for the source contract {source_contract}"
+        super().__init__(message)
+
+
 class UnknownToken(Exception):
     """
     To be raised when a specified token is not found is a scenario
@@ -264,6 +326,40 @@ class TransactionExecutionError(TransactionError):
     """
 
 
+class TransactionNotAccepted(Exception):
+    """
+    To be raised when the network did not accept a transaction sent in a batch
+    """
+
+    def __init__(self, sender: str, nonce: int) -> None:
+        message = f"The transaction of {sender} with the nonce {nonce} was not accepted"
+        super().__init__(message)
+
+
+class FailedBundleTransactions(Exception):
+    """
+    To be raised when some transactions of a bundle were not successful
+    """
+
+    def __init__(self, n_failed: int, n_total: int) -> None:
+        message = f"{n_failed} transactions of the bundle out of {n_total} failed"
+        super().__init__(message)
+
+
+class SignOnlyNotSupported(Exception):
+    """
+    To be raised when a step that needs the result of its transaction is executed
+    in sign-only mode
+    """
+
+    def __init__(self, step_type: str) -> None:
+        message = (
+            f"{step_type} needs the result of its transaction and can not be "
+            "executed in sign-only mode"
+        )
+        super().__init__(message)
+
+
 class EmptyQueryResults(Exception):
     """
     To be raised when a query returned no results
@@ -351,3 +447,18 @@ class InvalidQueryResultsDefinition(Exception):
     """
     to be raise when the results types of a query are not correctly defined
     """
+
+
+class PythonFunctionTimeout(Exception):
+    """
+    to be raised when a user function executed in a worker process exceeds
+    the allowed duration
+    """
+
+    def __init__(self, function: str, timeout: float) -> None:
+        self.function = function
+        self.timeout = timeout
+        super().__init__()
+
+    def __str__(self) -> str:
+        return f"Python function {self.function} did not return within {self.timeout}s"
@@ -3,13 +3,331 @@ author: Etienne Wallet
 
 This modules contains the class and functions to manage multiversX accounts
 """
-from typing import Optional
+import threading
+import time
+from typing import Dict, List, Optional, Set
 
 from multiversx_sdk_cli.accounts import Account, LedgerAccount
-from multiversx_sdk_network_providers import ProxyNetworkProvider
+from multiversx_sdk_core import Transaction
 
-from mxops import errors
 from mxops.config.config import Config
+from mxops.enums import WalletPoolStrategyEnum, parse_enum
+from mxops import errors
+from mxops.execution.proxy import ProxyRegistry
+from mxops.utils.logger import get_logger
+
+
+LOGGER = get_logger("account")
+
+
+def get_max_cost(tx: Transaction) -> int:
+    """
+    Return the maximum amount of eGLD a transaction can take from its sender:
+    the gas limit times the gas price, plus the value
+
+    :param tx: transaction to evaluate
+    :type tx: Transaction
+    :return: maximum cost in eGLD atomic units
+    :rtype: int
+    """
+    return tx.gas_limit * tx.gas_price + tx.amount
+
+
+class NonceLane:
+    """
+    This class reserves the nonces of an account and follows its transactions
+    until they are executed. The number of transactions reserved or in flight
+    is capped by MAX_IN_FLIGHT_TXS_PER_SENDER, to stay within the limits of the
+    mempool. The nonce gaps are detected by comparing with the nonce of the
+    account on chain and refilled with the original signed transactions.
+    """
+
+    def __init__(self, account_name: str):
+        """
+        Create the nonce lane of an account
+
+        :param account_name: name of the account
+        :type account_name: str
+        """
+        self.account_name = account_name
+        self._condition = threading.Condition()
+        self._reserved: Set[int] = set()
+        self._in_flight: Dict[int, Transaction] = {}
+        self._last_on_chain_nonce: Optional[int] = None
+        self._last_check_time: float = 0
+
+    def get_n_in_flight(self) -> int:
+        """
+        Return the number of nonces reserved or sent and not yet executed
+
+        :return: number of transactions in flight
+        :rtype: int
+        """
+        with self._condition:
+            return len(self._reserved) + len(self._in_flight)
+
+    def reserve(self) -> int:
+        """
+        Reserve the next nonce of the account. If the account already has
+        MAX_IN_FLIGHT_TXS_PER_SENDER transactions in flight, wait for some of them
+        to be executed, checking the nonce on chain every NONCE_GAP_CHECK_PERIOD
+        seconds.
+
+        :return: reserved nonce
+        :rtype: int
+        """
+        config = Config.get_config()
+        max_in_flight = int(config.get("MAX_IN_FLIGHT_TXS_PER_SENDER"))
+        check_period = float(config.get("NONCE_GAP_CHECK_PERIOD"))
+        while True:
+            with self._condition:
+                if self.get_n_in_flight() < max_in_flight:
+                    account = AccountsManager.get_account(self.account_name)
+                    nonce = account.nonce
+                    account.nonce += 1
+                    self._reserved.add(nonce)
+                    return nonce
+            # the lane is not locked during the requests to the network
+            self.recover_gaps()
+            with self._condition:
+                if self.get_n_in_flight() >= max_in_flight:
+                    self._condition.wait(timeout=check_period)
+
+    def register_sent(self, tx: Transaction):
+        """
+        Register a signed transaction accepted by the network, so that it can be
+        sent again if a nonce gap is found
+
+        :param tx: signed transaction
+        :type tx: Transaction
+        """
+        with self._condition:
+            self._reserved.discard(tx.nonce)
+            self._in_flight[tx.nonce] = tx
+
+    def confirm(self, nonce: int):
+        """
+        Free a nonce whose transaction was executed or will never be sent by
+        MxOps, as in sign-only mode
+
+        :param nonce: nonce to free
+        :type nonce: int
+        """
+        with self._condition:
+            self._reserved.discard(nonce)
+            self._in_flight.pop(nonce, None)
+            self._condition.notify_all()
+
+    def release(self, nonce: int):
+        """
+        Free a reserved nonce whose transaction could not be sent. The nonce of
+        the account is rolled back if it was the last one reserved.
+
+        :param nonce: nonce to free
+        :type nonce: int
+        """
+        with self._condition:
+            self._reserved.discard(nonce)
+            account = AccountsManager.get_account(self.account_name)
+            if account.nonce == nonce + 1:
+                account.nonce = nonce
+            self._condition.notify_all()
+
+    def recover_gaps(self) -> int:
+        """
+        Compare the transactions in flight with the nonce of the account on chain.
+        The ones below this nonce are considered executed. If the nonce on chain
+        did not move since the previous check, made at least NONCE_GAP_CHECK_PERIOD
+        seconds before, the transaction holding this nonce is considered dropped
+        and the transactions in flight are sent again, starting from it.
+
+        :return: number of transactions sent again
+        :rtype: int
+        """
+        check_period = float(Config.get_config().get("NONCE_GAP_CHECK_PERIOD"))
+        account = AccountsManager.get_account(self.account_name)
+        on_chain_nonce = ProxyRegistry.get_proxy().get_account(account.address).nonce
+        to_resend: List[Transaction] = []
+        with self._condition:
+            for nonce in [n for n in self._in_flight if n < on_chain_nonce]:
+                del self._in_flight[nonce]
+            self._condition.notify_all()
+            now = time.monotonic()
+            is_stalled = (
+                on_chain_nonce == self._last_on_chain_nonce
+                and now - self._last_check_time >= check_period
+            )
+            if on_chain_nonce != self._last_on_chain_nonce or is_stalled:
+                self._last_on_chain_nonce = on_chain_nonce
+                self._last_check_time = now
+            if not is_stalled or len(self._in_flight) == 0:
+                return 0
+            if on_chain_nonce not in self._in_flight:
+                if on_chain_nonce not in self._reserved:
+                    LOGGER.warning(
+                        f"The nonce {on_chain_nonce} of {self.account_name} is "
+                        "missing and no transaction is known to fill it"
+                    )
+                return 0
+            to_resend = [self._in_flight[n] for n in sorted(self._in_flight)]
+        LOGGER.warning(
+            f"Nonce gap found for {self.account_name} at {on_chain_nonce}, "
+            f"{len(to_resend)} transactions are sent again"
+        )
+        # a lane holds at most MAX_IN_FLIGHT_TXS_PER_SENDER transactions
+        ProxyRegistry.get_proxy().send_transactions(to_resend)
+        return len(to_resend)
+
+    def reset(self):
+        """
+        Forget the nonces reserved and in flight, after the nonce of the account
+        was synchronised with the network
+        """
+        with self._condition:
+            self._reserved.clear()
+            self._in_flight.clear()
+            self._last_on_chain_nonce = None
+            self._condition.notify_all()
+
+
+class WalletPool:
+    """
+    This class represents a named group of loaded accounts that share the
+    transactions of the steps using the pool as sender. The balance of each
+    account is tracked, so that only the accounts able to pay for their
+    transactions are chosen.
+    """
+
+    def __init__(
+        self,
+        pool_name: str,
+        accounts: List[str],
+        strategy: WalletPoolStrategyEnum = WalletPoolStrategyEnum.ROUND_ROBIN,
+        min_balance: int = 0,
+    ):
+        """
+        Create a wallet pool from accounts already loaded
+
+        :param pool_name: name of the pool
+        :type pool_name: str
+        :param accounts: names of the accounts of the pool
+        :type accounts: List[str]
+        :param strategy: how the senders are chosen, defaults to round robin
+        :type strategy: WalletPoolStrategyEnum
+        :param min_balance: minimum balance, in eGLD atomic units, that an account
+            must keep to be chosen, defaults to 0
+        :type min_balance: int
+        """
+        self.pool_name = pool_name
+        self.accounts = accounts
+        self.strategy = strategy
+        self.min_balance = min_balance
+        self._balances: Dict[str, int] = {}
+        self._next_index = 0
+        self._lock = threading.Lock()
+
+    def sync_balances(self):
+        """
+        Fetch the balances of the accounts of the pool from the network
+        """
+        proxy = ProxyRegistry.get_proxy()
+        balances = {}
+        for account_name in self.accounts:
+            account = AccountsManager.get_account(account_name)
+            balances[account_name] = int(proxy.get_account(account.address).balance)
+        with self._lock:
+            self._balances = balances
+
+    def get_balance(self, account_name: str) -> int:
+        """
+        Return the balance of an account of the pool, minus the maximum cost of
+        the transactions sent since the last synchronisation
+
+        :param account_name: name of the account
+        :type account_name: str
+        :return: estimated balance of the account
+        :rtype: int
+        """
+        with self._lock:
+            return self._balances[account_name]
+
+    def _choose(self, cost: int) -> Optional[str]:
+        """
+        Choose the next sender among the accounts whose balance covers the cost of
+        the transaction while keeping the minimum balance of the pool
+
+        :param cost: maximum cost of the transaction to send
+        :type cost: int
+        :return: name of the chosen account, None if no account is eligible
+        :rtype: Optional[str]
+        """
+        with self._lock:
+            n_accounts = len(self.accounts)
+            candidates = [
+                self.accounts[(self._next_index + i) % n_accounts]
+                for i in range(n_accounts)
+            ]
+            candidates = [
+                account_name
+                for account_name in candidates
+                if self._balances[account_name] - self.min_balance >= cost
+            ]
+            if len(candidates) == 0:
+                return None
+            if self.strategy == WalletPoolStrategyEnum.LEAST_LOADED:
+                chosen = min(
+                    candidates,
+                    key=lambda name: AccountsManager.get_lane(name).get_n_in_flight(),
+                )
+            else:
+                chosen = candidates[0]
+            self._next_index = (self.accounts.index(chosen) + 1) % n_accounts
+            return chosen
+
+    def choose_sender(self, cost: int) -> str:
+        """
+        Choose the account that will send the next transaction of the pool.
+        If no account has enough balance left, the balances are synchronised once
+        with the network before giving up.
+
+        :param cost: maximum cost of the transaction to send, as given by
+            get_max_cost
+        :type cost: int
+        :return: name of the chosen account
+        :rtype: str
+        """
+        chosen = self._choose(cost)
+        if chosen is None:
+            self.sync_balances()
+            chosen = self._choose(cost)
+        if chosen is None:
+            raise errors.WalletPoolExhausted(self.pool_name, self.min_balance + cost)
+        return chosen
+
+    def charge(self, account_name: str, tx: Transaction):
+        """
+        Deduct the maximum cost of a transaction from the balance of its sender
+
+        :param account_name: name of the sender
+        :type account_name: str
+        :param tx: transaction of the sender
+        :type tx: Transaction
+        """
+        with self._lock:
+            self._balances[account_name] -= get_max_cost(tx)
+
+    def refund(self, account_name: str, tx: Transaction):
+        """
+        Give back the maximum cost of a transaction that will not reach the
+        network to the balance of its sender
+
+        :param account_name: name of the sender
+        :type account_name: str
+        :param tx: transaction of the sender that was charged
+        :type tx: Transaction
+        """
+        with self._lock:
+            self._balances[account_name] += get_max_cost(tx)
 
 
 class AccountsManager:
@@ -19,6 +337,12 @@ class AccountsManager:
     """
 
     _accounts = {}
+    _pem_paths: Dict[str, str] = {}
+    _nonce_locks: Dict[str, threading.Lock] = {}
+    _lanes: Dict[str, NonceLane] = {}
+    _wallet_pools: Dict[str, WalletPool] = {}
+    _pools_by_account: Dict[str, Dict[str, WalletPool]] = {}
+    _nonce_locks_lock = threading.Lock()
 
     @classmethod
     def load_account(
@@ -45,11 +369,99 @@ class AccountsManager:
             cls._accounts[account_name] = LedgerAccount(
                 ledger_account_index, ledger_address_index
             )
+            cls._pem_paths.pop(account_name, None)
         elif isinstance(pem_path, str):
             cls._accounts[account_name] = Account(pem_file=pem_path)
+            cls._pem_paths[account_name] = pem_path
+            return
         else:
             raise ValueError(f"{account_name} is not correctly configured")
 
+    @classmethod
+    def load_wallet_pool(
+        cls,
+        pool_name: str,
+        accounts: List[str],
+        strategy: str = WalletPoolStrategyEnum.ROUND_ROBIN.value,
+        min_balance: int = 0,
+    ):
+        """
+        Create a wallet pool from accounts already loaded and fetch their balances
+
+        :param pool_name: name that will be used as sender by the steps to send
+            their transactions from the pool. Must not be the name of an account.
+        :type pool_name: str
+        :param accounts: names of the accounts of the pool
+        :type accounts: List[str]
+        :param strategy: name of the strategy choosing the senders, either
+            round_robin or least_loaded, defaults to round_robin
+        :type strategy: str
+        :param min_balance: minimum balance, in eGLD atomic units, that an account
+            must keep to be chosen, defaults to 0
+        :type min_balance: int
+        """
+        if pool_name in cls._accounts:
+            raise errors.InvalidWalletPool(pool_name, "an account has the same name")
+        if len(accounts) == 0:
+            raise errors.InvalidWalletPool(pool_name, "no account was provided")
+        for account_name in accounts:
+            cls.get_account(account_name)
+        try:
+            pool_strategy = parse_enum(strategy, WalletPoolStrategyEnum)
+        except ValueError as err:
+            raise errors.InvalidWalletPool(
+                pool_name, f"unknown strategy {strategy}"
+            ) from err
+        wallet_pool = WalletPool(pool_name, accounts, pool_strategy, int(min_balance))
+        wallet_pool.sync_balances()
+        # a pool loaded again replaces the previous one for all its accounts
+        for account_pools in cls._pools_by_account.values():
+            account_pools.pop(pool_name, None)
+        cls._wallet_pools[pool_name] = wallet_pool
+        for account_name in accounts:
+            cls._pools_by_account.setdefault(account_name, {})[pool_name] = wallet_pool
+
+    @classmethod
+    def get_wallet_pool(cls, pool_name: str) -> Optional[WalletPool]:
+        """
+        Return the wallet pool with the provided name, if any
+
+        :param pool_name: name of the pool
+        :type pool_name: str
+        :return: wallet pool under the provided name
+        :rtype: Optional[WalletPool]
+        """
+        return cls._wallet_pools.get(pool_name)
+
+    @classmethod
+    def record_transaction_cost(cls, account_name: str, tx: Transaction):
+        """
+        Deduct the maximum cost of a transaction from the tracked balance of its
+        sender, in each wallet pool the sender belongs to
+
+        :param account_name: name of the sender
+        :type account_name: str
+        :param tx: transaction of the sender
+        :type tx: Transaction
+        """
+        for wallet_pool in cls._pools_by_account.get(account_name, {}).values():
+            wallet_pool.charge(account_name, tx)
+
+    @classmethod
+    def refund_transaction_cost(cls, account_name: str, tx: Transaction):
+        """
+        Give back the maximum cost of a transaction that will not reach the
+        network to the tracked balance of its sender, in each wallet pool the
+        sender belongs to
+
+        :param account_name: name of the sender
+        :type account_name: str
+        :param tx: transaction of the sender that was recorded
+        :type tx: Transaction
+        """
+        for wallet_pool in cls._pools_by_account.get(account_name, {}).values():
+            wallet_pool.refund(account_name, tx)
+
     @classmethod
     def get_account(cls, account_name: str) -> Account:
         """
@@ -65,6 +477,51 @@ class AccountsManager:
         except KeyError as err:
             raise errors.UnknownAccount(account_name) from err
 
+    @classmethod
+    def get_pem_path(cls, account_name: str) -> Optional[str]:
+        """
+        Return the path of the PEM file of an account, if it was loaded from one
+
+        :param account_name: name of the account
+        :type account_name: str
+        :return: path of the PEM file of the account
+        :rtype: Optional[str]
+        """
+        return cls._pem_paths.get(account_name)
+
+    @classmethod
+    def get_nonce_lock(cls, account_name: str) -> threading.Lock:
+        """
+        Return the lock that must be held to assign a nonce to a transaction of an
+        account and send it, so that concurrent steps of the same sender
+        broadcast their transactions with distinct and ordered nonces
+
+        :param account_name: name of the account
+        :type account_name: str
+        :return: nonce lock of the account
+        :rtype: threading.Lock
+        """
+        with cls._nonce_locks_lock:
+            return cls._nonce_locks.setdefault(account_name, threading.Lock())
+
+    @classmethod
+    def get_lane(cls, account_name: str) -> NonceLane:
+        """
+        Return the nonce lane of an account, which reserves its nonces and follows
+        its transactions in flight
+
+        :param account_name: name of the account
+        :type account_name: str
+        :return: nonce lane of the account
+        :rtype: NonceLane
+        """
+        with cls._nonce_locks_lock:
+            lane = cls._lanes.get(account_name)
+            if lane is None:
+                lane = NonceLane(account_name)
+                cls._lanes[account_name] = lane
+            return lane
+
     @classmethod
     def sync_account(cls, account_name: str):
         """
@@ -74,9 +531,9 @@ class AccountsManager:
         :param account_name: name of the account to synchronise
         :type account_name: str
         """
-        config = Config.get_config()
-        proxy = ProxyNetworkProvider(config.get("PROXY"))
+        proxy = ProxyRegistry.get_proxy()
         try:
             cls._accounts[account_name].sync_nonce(proxy)
         except KeyError as err:
             raise RuntimeError(f"Unkown account {account_name}") from err
+        cls.get_lane(account_name).reset()
@@ -0,0 +1,180 @@
+"""
+author: Etienne Wallet
+
+This module contains the bundle of signed transactions written by the sign-only
+execution mode and broadcasted later on
+"""
+import base64
+from itertools import islice
+import json
+from pathlib import Path
+import threading
+from typing import Dict, Iterator, Optional, TextIO
+
+from multiversx_sdk_core import Transaction, TransactionComputer
+from multiversx_sdk_network_providers.transactions import transaction_to_dictionary
+
+from mxops.config.config import Config
+from mxops import errors
+from mxops.execution.finality import FinalityTracker
+from mxops.execution.network import raise_on_errors, send_many
+from mxops.utils.logger import get_logger
+from mxops.utils.msc import RateThrottler, get_tx_link
+
+
+LOGGER = get_logger("bundle")
+
+
+def transaction_from_dictionary(data: Dict) -> Transaction:
+    """
+    Rebuild a signed transaction from its dictionary form, as sent to the proxy
+
+    :param data: dictionary form of the transaction
+    :type data: Dict
+    :return: signed transaction
+    :rtype: Transaction
+    """
+    return Transaction(
+        sender=data["sender"],
+        receiver=data["receiver"],
+        gas_limit=data["gasLimit"],
+        chain_id=data["chainID"],
+        nonce=data["nonce"],
+        amount=int(data["value"]),
+        sender_username=base64.b64decode(data["senderUsername"]).decode(),
+        receiver_username=base64.b64decode(data["receiverUsername"]).decode(),
+        gas_price=data["gasPrice"],
+        data=base64.b64decode(data["data"]),
+        version=data["version"],
+        options=data["options"],
+        guardian=data["guardian"],
+        signature=bytes.fromhex(data["signature"]),
+        guardian_signature=bytes.fromhex(data["guardianSignature"]),
+    )
+
+
+class TransactionBundle:
+    """
+    This class writes the transactions signed in sign-only mode to a bundle file,
+    with one transaction per line in the same format as the one sent to the proxy
+    """
+
+    _file: Optional[TextIO] = None
+    _n_transactions: int = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def start(cls, bundle_path: Path):
+        """
+        Start recording the signed transactions in a new bundle file
+
+        :param bundle_path: path of the bundle file
+        :type bundle_path: Path
+        """
+        with cls._lock:
+            cls._file = open(bundle_path, "w", encoding="utf-8")
+            cls._n_transactions = 0
+        LOGGER.info(f"Signed transactions will be written to {bundle_path}")
+
+    @classmethod
+    def is_recording(cls) -> bool:
+        """
+        Indicate if the transactions are written to a bundle instead of being sent
+
+        :return: if the sign-only mode is active
+        :rtype: bool
+        """
+        return cls._file is not None
+
+    @classmethod
+    def add(cls, tx: Transaction) -> str:
+        """
+        Write a signed transaction to the bundle
+
+        :param tx: signed transaction
+        :type tx: Transaction
+        :return: hash of the transaction
+        :rtype: str
+        """
+        tx_hash = TransactionComputer().compute_transaction_hash(tx).hex()
+        line = json.dumps(transaction_to_dictionary(tx), separators=(",", ":"))
+        with cls._lock:
+            cls._file.write(line + "\n")
+            cls._n_transactions += 1
+        LOGGER.info(f"Transaction {tx_hash} written to the bundle")
+        return tx_hash
+
+    @classmethod
+    def close(cls):
+        """
+        Stop recording and close the bundle file
+        """
+        with cls._lock:
+            if cls._file is None:
+                return
+            cls._file.close()
+            cls._file = None
+        LOGGER.info(f"{cls._n_transactions} transactions written to the bundle")
+
+
+def read_bundle(bundle_path: Path) -> Iterator[Transaction]:
+    """
+    Read lazily the signed transactions of a bundle file
+
+    :param bundle_path: path of the bundle file
+    :type bundle_path: Path
+    :yield: signed transactions in their signing order
+    :rtype: Iterator[Transaction]
+    """
+    with open(bundle_path, "r", encoding="utf-8") as file:
+        for line in file:
+            if len(line.strip()) > 0:
+                yield transaction_from_dictionary(json.loads(line))
+
+
+def broadcast_bundle(bundle_path: Path, rate: Optional[float] = None):
+    """
+    Broadcast the transactions of a bundle by chunks of TX_SEND_CHUNK_SIZE
+    transactions and wait for all of them to be completed
+
+    :param bundle_path: path of the bundle file
+    :type bundle_path: Path
+    :param rate: maximum number of transactions sent per second, defaults to None
+    :type rate: Optional[float]
+    """
+    chunk_size = int(Config.get_config().get("TX_SEND_CHUNK_SIZE"))
+    throttler = None if rate is None else RateThrottler(rate, 1)
+    tracker = FinalityTracker.get()
+    futures = []
+    n_rejected = 0
+    transactions = read_bundle(bundle_path)
+    while True:
+        chunk = list(islice(transactions, chunk_size))
+        if len(chunk) == 0:
+            break
+        if throttler is not None:
+            for _ in chunk:
+                throttler.tick()
+        for tx, tx_hash in zip(chunk, send_many(chunk)):
+            if tx_hash is None:
+                LOGGER.error(
+                    f"The transaction of {tx.sender} with the nonce {tx.nonce} "
+                    "was not accepted"
+                )
+                n_rejected += 1
+            else:
+                futures.append((tx_hash, tracker.track(tx_hash)))
+        LOGGER.info(f"{len(futures) + n_rejected} transactions broadcasted")
+
+    n_failed = n_rejected
+    for tx_hash, future in futures:
+        try:
+            # the transactions not completed within TX_TIMEOUT are failed as well
+            raise_on_errors(future.result())
+        except errors.TransactionError:
+            LOGGER.error(f"Transaction failed: {get_tx_link(tx_hash)}")
+            n_failed += 1
+    n_total = len(futures) + n_rejected
+    LOGGER.info(f"{n_total - n_failed}/{n_total} transactions successful")
+    if n_failed > 0:
+        raise errors.FailedBundleTransactions(n_failed, n_total)
@@ -11,7 +11,14 @@ from mxops.data import path
 from mxops.data.execution_data import ScenarioData, delete_scenario_data
 
 from mxops.enums import parse_network_enum
+from mxops.execution.bundle import TransactionBundle, broadcast_bundle
+from mxops.execution.cursor import ExecutionCursor
+from mxops.execution.fingerprints import StepsFingerprints
+from mxops.execution.pipeline import TransactionPipeline
+from mxops.execution.proxy import ProxyRegistry
 from mxops.execution.scene import execute_directory, execute_scene
+from mxops.execution.signing import TransactionSigner
+from mxops.execution.user_modules import UserFunctionWorkers
 from mxops import errors
 
 
@@ -51,6 +58,55 @@ def add_subparser(subparsers_action: _SubParsersAction):
         required=False,
         help="clean the scenario data before the execution",
     )
+    scenario_parser.add_argument(
+        "-p",
+        "--pipeline",
+        action="store_true",
+        required=False,
+        help=(
+            "send the transactions back-to-back and resolve their results later, "
+            "when possible"
+        ),
+    )
+    scenario_parser.add_argument(
+        "--max-parallel",
+        type=int,
+        required=False,
+        help=(
+            "maximum number of independent steps of a scene that can be executed "
+            "at the same time"
+        ),
+    )
+    scenario_parser.add_argument(
+        "-r",
+        "--resume",
+        action="store_true",
+        required=False,
+        help=(
+            "resume the execution from the step where the previous execution "
+            "was interrupted"
+        ),
+    )
+    scenario_parser.add_argument(
+        "-i",
+        "--incremental",
+        action="store_true",
+        required=False,
+        help=(
+            "skip the transaction steps already executed successfully in the "
+            "scenario with the same parameters"
+        ),
+    )
+    scenario_parser.add_argument(
+        "--sign-only",
+        type=str,
+        required=False,
+        metavar="BUNDLE_PATH",
+        help=(
+            "sign the transactions without sending them and write them to a bundle "
+            "file, to be sent later with the broadcast command"
+        ),
+    )
     scenario_parser.add_argument(
         "elements",
         nargs="+",
@@ -58,6 +114,26 @@ def add_subparser(subparsers_action: _SubParsersAction):
         help="Path to scene file and/or scene directory",
     )
 
+    broadcast_parser = subparsers_action.add_parser("broadcast")
+    broadcast_parser.add_argument(
+        "-n",
+        "--network",
+        type=parse_network_enum,
+        required=True,
+        help="Name of the network to which the transactions will be sent",
+    )
+    broadcast_parser.add_argument(
+        "--rate",
+        type=float,
+        required=False,
+        help="maximum number of transactions sent per second",
+    )
+    broadcast_parser.add_argument(
+        "bundle",
+        type=str,
+        help="Path to the bundle file written by a sign-only execution",
+    )
+
 
 def execute_cli(args: Namespace):
     """
@@ -71,6 +147,12 @@ def execute_cli(args: Namespace):
 
     path.initialize_data_folder()
     Config.set_network(args.network)
+    if args.pipeline:
+        Config.get_config().set_option("PIPELINE_TRANSACTIONS", "True")
+    if args.incremental:
+        Config.get_config().set_option("INCREMENTAL_EXECUTION", "True")
+    if args.max_parallel is not None:
+        Config.get_config().set_option("MAX_PARALLEL_STEPS", str(args.max_parallel))
 
     if args.clean:
         delete_scenario_data(args.scenario, ask_confirmation=False)
@@ -81,14 +163,47 @@ def execute_cli(args: Namespace):
         ScenarioData.create_scenario(args.scenario)
         ScenarioData.get().save()
 
-    for element in args.elements:
-        element_path = Path(element)
-        if os.path.isfile(element_path):
-            execute_scene(element_path)
-        elif os.path.isdir(element_path):
-            execute_directory(element_path)
-        else:
-            raise ValueError(f"{element_path} is not a file nor a directory")
+    scenario_data = ScenarioData.get()
+    ExecutionCursor.start(resume=args.resume)
+    StepsFingerprints.reset()
+    if args.sign_only is not None:
+        TransactionBundle.start(Path(args.sign_only))
+    try:
+        for element in args.elements:
+            element_path = Path(element)
+            if os.path.isfile(element_path):
+                execute_scene(element_path)
+            elif os.path.isdir(element_path):
+                execute_directory(element_path)
+            else:
+                raise ValueError(f"{element_path} is not a file nor a directory")
+        TransactionPipeline.flush()
+        ExecutionCursor.raise_if_resuming()
+        ExecutionCursor.clear()
+    finally:
+        # keep the modifications made before any error
+        scenario_data.flush()
+        TransactionBundle.close()
+        TransactionSigner.terminate()
+        UserFunctionWorkers.terminate()
+    ProxyRegistry.log_connections_stats()
+    TransactionSigner.log_signing_stats()
+    scenario_data.log_persistence_metrics()
 
     if args.delete:
         delete_scenario_data(args.scenario, ask_confirmation=False)
+
+
+def broadcast_cli(args: Namespace):
+    """
+    Broadcast the transactions of a bundle by following the given parsed arguments
+
+    :param args: parsed arguments
+    :type args: Namespace
+    """
+    if args.command != "broadcast":
+        raise ValueError(f"Command broadcast was expected, found {args.command}")
+
+    Config.set_network(args.network)
+    broadcast_bundle(Path(args.bundle), args.rate)
+    ProxyRegistry.log_connections_stats()
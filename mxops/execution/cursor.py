@@ -0,0 +1,371 @@
+"""
+author: Etienne Wallet
+
+This module contains the cursor that records the position of the execution in the
+scenario data, so that an interrupted execution can be resumed where it stopped
+"""
+from contextvars import ContextVar
+from copy import deepcopy
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from mxops.data.execution_data import ScenarioData
+from mxops import errors
+from mxops.utils.logger import get_logger
+
+
+LOGGER = get_logger("cursor")
+
+# position of a step, as the stack of the frames of its scenes and loops
+Position = List[Dict[str, Any]]
+
+# the steps executed concurrently do not have a single position to record
+_TRACKED: ContextVar[bool] = ContextVar("cursor_tracked", default=True)
+
+
+class ExecutionCursor:
+    """
+    This class tracks the position of the execution as a stack of frames, one per
+    scene or loop being executed. Each frame holds the index of the current step
+    and, for the loops, the index of the current iteration. The last transaction
+    sent is recorded along with the position.
+
+    The positions of the pipelined steps are held until their transactions are
+    resolved: the saved position is then the one of the oldest unresolved step and
+    the hashes of the other unresolved steps are saved along with it.
+
+    When resuming, the scenes and loops start from the position recorded by the
+    previous execution and the step at this position, as well as the pipelined
+    steps that were unresolved, are reconciled with their transaction, if they had
+    sent one.
+    """
+
+    _frames: Position = []
+    _resume_frames: Optional[Position] = None
+    _resume_tx_hash: Optional[str] = None
+    # positions of the pipelined steps not yet resolved, in their submission order
+    _held: Dict[str, Tuple[Position, Optional[str]]] = {}
+    # transactions of the pipelined steps left unresolved by the previous execution
+    _resume_pending: Dict[str, str] = {}
+
+    @classmethod
+    def start(cls, resume: bool = False):
+        """
+        Start tracking a new execution
+
+        :param resume: if the execution should resume from the cursor saved
+            in the scenario data, defaults to False
+        :type resume: bool
+        """
+        cls._frames = []
+        cls._resume_frames = None
+        cls._resume_tx_hash = None
+        cls._held = {}
+        cls._resume_pending = {}
+        if not resume:
+            return
+        cursor = ScenarioData.get().execution_cursor
+        if cursor is None:
+            LOGGER.warning("No interrupted execution to resume, starting from scratch")
+            return
+        cls._resume_frames = cursor["frames"]
+        cls._resume_tx_hash = cursor.get("tx_hash")
+        cls._resume_pending = {
+            cls._get_position_key(frames): tx_hash
+            for frames, tx_hash in cursor.get("pending", [])
+        }
+        LOGGER.info(f"Resuming the execution from {cls._resume_frames}")
+
+    @staticmethod
+    def _get_position_key(frames: Position) -> str:
+        """
+        Return a key identifying a position
+
+        :param frames: frames of the position
+        :type frames: Position
+        :return: key of the position
+        :rtype: str
+        """
+        return json.dumps(frames, sort_keys=True)
+
+    @staticmethod
+    def disable_tracking():
+        """
+        Stop tracking the position for the remaining of the current context
+        """
+        _TRACKED.set(False)
+
+    @staticmethod
+    def is_tracking() -> bool:
+        """
+        Indicate if the position is tracked in the current context
+
+        :return: if the position is tracked
+        :rtype: bool
+        """
+        return _TRACKED.get()
+
+    @classmethod
+    def is_resuming(cls) -> bool:
+        """
+        Indicate if the execution has not reached yet the position to resume from
+
+        :return: if the execution is resuming
+        :rtype: bool
+        """
+        return cls._resume_frames is not None
+
+    @classmethod
+    def _get_resume_frame(cls) -> Optional[Dict[str, Any]]:
+        """
+        Return the frame to resume from at the current depth, if any
+
+        :return: frame recorded by the previous execution
+        :rtype: Optional[Dict[str, Any]]
+        """
+        if not cls.is_resuming() or not cls.is_tracking():
+            return None
+        depth = len(cls._frames)
+        if depth >= len(cls._resume_frames):
+            return None
+        return cls._resume_frames[depth]
+
+    @classmethod
+    def stop_resuming(cls) -> Optional[str]:
+        """
+        Indicate that the position to resume from was reached
+
+        :return: hash of the last transaction sent by the previous execution
+        :rtype: Optional[str]
+        """
+        tx_hash = cls._resume_tx_hash
+        cls._resume_frames = None
+        cls._resume_tx_hash = None
+        return tx_hash
+
+    @classmethod
+    def is_at_resume_position(cls) -> bool:
+        """
+        Indicate if the step about to be executed is the one that was being executed
+        when the previous execution stopped
+
+        :return: if the current position is the position to resume from
+        :rtype: bool
+        """
+        if not cls.is_resuming() or not cls.is_tracking():
+            return False
+        return len(cls._frames) == len(cls._resume_frames)
+
+    @classmethod
+    def enter_scene(cls, scene_path: Path, n_steps: int) -> int:
+        """
+        Push the frame of a scene and return the index of the step to start from.
+        When resuming, the top level scenes that precede the scene to resume from
+        are considered completed.
+
+        :param scene_path: path of the scene
+        :type scene_path: Path
+        :param n_steps: number of steps of the scene
+        :type n_steps: int
+        :return: index of the first step to execute
+        :rtype: int
+        """
+        if not cls.is_tracking():
+            return 0
+        scene = Path(scene_path).resolve().as_posix()
+        start = 0
+        resume_frame = cls._get_resume_frame()
+        if resume_frame is not None:
+            if resume_frame.get("scene") == scene:
+                start = resume_frame["step"]
+            elif len(cls._frames) == 0:
+                LOGGER.info(f"Skipping the scene {scene_path}, already executed")
+                start = n_steps
+            else:
+                LOGGER.warning(
+                    f"The scene {scene_path} does not match the cursor, "
+                    "the execution is not resumed further"
+                )
+                cls.stop_resuming()
+        cls._frames.append({"scene": scene, "step": start})
+        return start
+
+    @classmethod
+    def enter_loop(cls) -> Tuple[int, int]:
+        """
+        Push the frame of a loop and return the iteration and the step to start from
+
+        :return: index of the first iteration and of its first step to execute
+        :rtype: Tuple[int, int]
+        """
+        if not cls.is_tracking():
+            return 0, 0
+        iteration, start = 0, 0
+        resume_frame = cls._get_resume_frame()
+        if resume_frame is not None:
+            if "iteration" in resume_frame:
+                iteration, start = resume_frame["iteration"], resume_frame["step"]
+            else:
+                LOGGER.warning(
+                    "The loop does not match the cursor, "
+                    "the execution is not resumed further"
+                )
+                cls.stop_resuming()
+        cls._frames.append({"iteration": iteration, "step": start})
+        return iteration, start
+
+    @classmethod
+    def move_to(cls, step_index: int, iteration: Optional[int] = None):
+        """
+        Record the position of the step about to be executed in the current frame
+
+        :param step_index: index of the step in its scene or loop
+        :type step_index: int
+        :param iteration: index of the iteration for a loop, defaults to None
+        :type iteration: Optional[int]
+        """
+        if not cls.is_tracking() or len(cls._frames) == 0:
+            return
+        frame = cls._frames[-1]
+        frame["step"] = step_index
+        if iteration is not None:
+            frame["iteration"] = iteration
+        cls._save()
+
+    @classmethod
+    def get_position(cls) -> Optional[Position]:
+        """
+        Return a copy of the position of the current step, if it is tracked
+
+        :return: frames of the current position
+        :rtype: Optional[Position]
+        """
+        if not cls.is_tracking() or len(cls._frames) == 0:
+            return None
+        return deepcopy(cls._frames)
+
+    @classmethod
+    def hold(cls, position: Optional[Position]):
+        """
+        Prevent the saved position from moving past a pipelined step until its
+        transaction is resolved
+
+        :param position: position of the step, as returned by get_position
+        :type position: Optional[Position]
+        """
+        if position is not None:
+            cls._held[cls._get_position_key(position)] = (position, None)
+
+    @classmethod
+    def record_pending_transactions(
+        cls, transactions: List[Tuple[Optional[Position], str]]
+    ):
+        """
+        Record the hashes of the transactions broadcasted for held positions
+
+        :param transactions: positions of the steps with the hashes of their
+            transactions
+        :type transactions: List[Tuple[Optional[Position], str]]
+        """
+        is_modified = False
+        for position, tx_hash in transactions:
+            key = None if position is None else cls._get_position_key(position)
+            if key in cls._held:
+                cls._held[key] = (position, tx_hash)
+                is_modified = True
+        if is_modified and len(cls._frames) > 0:
+            cls._save()
+
+    @classmethod
+    def release(cls, position: Optional[Position]):
+        """
+        Let the saved position move past a pipelined step whose transaction
+        was resolved. The position is saved again if it was held by this step.
+
+        :param position: position of the step, as returned by get_position
+        :type position: Optional[Position]
+        """
+        if position is None:
+            return
+        key = cls._get_position_key(position)
+        is_oldest = len(cls._held) > 0 and next(iter(cls._held)) == key
+        if cls._held.pop(key, None) is not None and is_oldest and len(cls._frames) > 0:
+            cls._save()
+
+    @classmethod
+    def pop_pending_transaction(cls) -> Optional[str]:
+        """
+        Return the hash of the transaction sent for the current position by a
+        pipelined step of the previous execution, if it was left unresolved
+
+        :return: hash of the transaction
+        :rtype: Optional[str]
+        """
+        if len(cls._resume_pending) == 0 or not cls.is_tracking():
+            return None
+        return cls._resume_pending.pop(cls._get_position_key(cls._frames), None)
+
+    @classmethod
+    def raise_if_resuming(cls):
+        """
+        Raise an error if the position to resume from was never reached,
+        as it happens when its scene is not part of the execution
+        """
+        if cls.is_resuming():
+            raise errors.ResumePositionNotFound(cls._resume_frames[0].get("scene"))
+
+    @classmethod
+    def record_transaction(cls, tx_hash: str):
+        """
+        Record the hash of the transaction sent by the current step
+
+        :param tx_hash: hash of the transaction
+        :type tx_hash: str
+        """
+        if not cls.is_tracking() or len(cls._frames) == 0:
+            return
+        cls._save(tx_hash)
+
+    @classmethod
+    def exit(cls):
+        """
+        Pop the frame of the scene or the loop that was completed
+        """
+        if not cls.is_tracking() or len(cls._frames) == 0:
+            return
+        frame = cls._frames.pop()
+        resume_frame = cls._get_resume_frame()
+        if resume_frame is not None and resume_frame.get("scene") == frame.get("scene"):
+            LOGGER.warning("The position of the cursor was not found")
+            cls.stop_resuming()
+
+    @classmethod
+    def clear(cls):
+        """
+        Delete the cursor once the execution is completed
+        """
+        cls._frames = []
+        cls._held = {}
+        cls._resume_pending = {}
+        ScenarioData.get().set_execution_cursor(None)
+
+    @classmethod
+    def _save(cls, tx_hash: Optional[str] = None):
+        """
+        Save the current position in the scenario data, or the position of the
+        oldest unresolved pipelined step along with the transactions of the other
+        unresolved ones
+
+        :param tx_hash: hash of the last transaction sent, defaults to None
+        :type tx_hash: Optional[str]
+        """
+        frames, pending = cls._frames, []
+        if len(cls._held) > 0:
+            held = list(cls._held.values())
+            frames, tx_hash = held[0]
+            pending = [list(entry) for entry in held[1:] if entry[1] is not None]
+        cursor = {"frames": deepcopy(frames), "tx_hash": tx_hash}
+        if len(pending) > 0:
+            cursor["pending"] = deepcopy(pending)
+        ScenarioData.get().set_execution_cursor(cursor)
@@ -0,0 +1,197 @@
+"""
+author: Etienne Wallet
+
+This module contains the tracker that monitors the finality of the transactions
+sent to the network
+"""
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from mxops.config.config import Config
+from mxops import errors
+from mxops.execution.polling import get_polling_policy
+from mxops.execution.proxy import ProxyRegistry
+from mxops.utils.logger import get_logger
+
+
+LOGGER = get_logger("finality")
+
+
+@dataclass
+class TrackedTransaction:
+    """
+    Holds the polling state of a transaction monitored by the tracker
+    """
+
+    tx_hash: str
+    future: Future
+    delays: Iterator[float]
+    start_time: float
+    next_check_time: float
+    is_checking: bool = field(default=False)
+
+
+class FinalityTracker:
+    """
+    Central tracker that monitors any number of transactions at once. The statuses
+    of the transactions are checked in a bounded pool of concurrent requests and
+    the completed transactions are handed back through futures.
+    """
+
+    _instance: Optional[FinalityTracker] = None
+
+    def __init__(self, max_workers: int):
+        """
+        Initialise the tracker
+
+        :param max_workers: maximum number of concurrent requests to the proxy
+        :type max_workers: int
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mxops-finality"
+        )
+        self._tracked: Dict[str, TrackedTransaction] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get(cls) -> FinalityTracker:
+        """
+        Return the tracker of the process, create it if needed
+
+        :return: finality tracker
+        :rtype: FinalityTracker
+        """
+        if cls._instance is None:
+            max_workers = int(Config.get_config().get("TX_TRACKER_MAX_WORKERS"))
+            cls._instance = FinalityTracker(max_workers)
+        return cls._instance
+
+    def track(
+        self,
+        tx_hash: str,
+        callback: Optional[Callable[[Future], None]] = None,
+    ) -> Future:
+        """
+        Start monitoring a transaction. The returned future will hold the
+        completed on-chain transaction or the error encountered.
+
+        :param tx_hash: hash of the transaction to monitor
+        :type tx_hash: str
+        :param callback: function to call with the future once it is done,
+            defaults to None
+        :type callback: Optional[Callable[[Future], None]]
+        :return: future of the completed on-chain transaction
+        :rtype: Future
+        """
+        with self._condition:
+            try:
+                tracked = self._tracked[tx_hash]
+            except KeyError:
+                delays = get_polling_policy().get_delays()
+                start_time = time.time()
+                tracked = TrackedTransaction(
+                    tx_hash=tx_hash,
+                    future=Future(),
+                    delays=delays,
+                    start_time=start_time,
+                    next_check_time=start_time + next(delays),
+                )
+                self._tracked[tx_hash] = tracked
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="mxops-finality-loop", daemon=True
+                    )
+                    self._thread.start()
+                self._condition.notify_all()
+        if callback is not None:
+            tracked.future.add_done_callback(callback)
+        return tracked.future
+
+    def track_many(self, tx_hashes: List[str]) -> List[Future]:
+        """
+        Start monitoring several transactions
+
+        :param tx_hashes: hashes of the transactions to monitor
+        :type tx_hashes: List[str]
+        :return: futures of the completed on-chain transactions, in the same order
+        :rtype: List[Future]
+        """
+        return [self.track(tx_hash) for tx_hash in tx_hashes]
+
+    def get_n_tracked(self) -> int:
+        """
+        Return the number of transactions currently monitored
+
+        :return: number of monitored transactions
+        :rtype: int
+        """
+        with self._condition:
+            return len(self._tracked)
+
+    def _run(self):
+        """
+        Loop that dispatches the status checks of the transactions when they are due.
+        It stops once there are no more transactions to monitor.
+        """
+        while True:
+            with self._condition:
+                if len(self._tracked) == 0:
+                    self._thread = None
+                    return
+                now = time.time()
+                waiting = [t for t in self._tracked.values() if not t.is_checking]
+                due = [t for t in waiting if t.next_check_time <= now]
+                if len(due) == 0:
+                    timeout = None
+                    if len(waiting) > 0:
+                        timeout = min(t.next_check_time for t in waiting) - now
+                    self._condition.wait(timeout)
+                    continue
+                for tracked in due:
+                    tracked.is_checking = True
+            for tracked in due:
+                self._executor.submit(self._check, tracked)
+
+    def _check(self, tracked: TrackedTransaction):
+        """
+        Check the status of a transaction and resolve its future if it is completed
+        or if it timed out.
+
+        :param tracked: transaction to check
+        :type tracked: TrackedTransaction
+        """
+        proxy = ProxyRegistry.get_proxy()
+        timeout = float(Config.get_config().get("TX_TIMEOUT"))
+        is_done = True
+        try:
+            status = proxy.get_transaction_status(tracked.tx_hash)
+            elapsed_time = time.time() - tracked.start_time
+            if status.is_successful() or status.is_failed():
+                on_chain_tx = proxy.get_transaction(tracked.tx_hash, True)
+                get_polling_policy().record_completion(elapsed_time)
+                LOGGER.debug(
+                    f"Transaction {tracked.tx_hash} completed in {elapsed_time:.2f}s"
+                )
+                tracked.future.set_result(on_chain_tx)
+            elif elapsed_time >= timeout:
+                on_chain_tx = proxy.get_transaction(tracked.tx_hash, True)
+                tracked.future.set_exception(
+                    errors.UnfinalizedTransactionException(on_chain_tx)
+                )
+            else:
+                is_done = False
+        except Exception as err:  # pylint: disable=broad-except
+            tracked.future.set_exception(err)
+
+        with self._condition:
+            if is_done:
+                self._tracked.pop(tracked.tx_hash, None)
+            else:
+                tracked.next_check_time = time.time() + next(tracked.delays)
+                tracked.is_checking = False
+            self._condition.notify_all()
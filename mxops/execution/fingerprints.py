@@ -0,0 +1,77 @@
+"""
+author: Etienne Wallet
+
+This module contains the tracking of the steps fingerprints, used by the incremental
+execution to skip the steps already executed successfully in the scenario
+"""
+import threading
+from typing import Dict
+
+from mxops.config.config import Config
+from mxops.data.execution_data import ScenarioData
+from mxops.execution.steps import TransactionStep
+from mxops.utils.logger import get_logger
+
+
+LOGGER = get_logger("fingerprints")
+
+
+class StepsFingerprints:
+    """
+    This class counts the occurrences of the steps fingerprints during an
+    execution. A step whose fingerprint was met n times is considered already
+    executed if the scenario records a successful execution for the n-th
+    occurrence of this fingerprint, so that identical steps are not mistaken for
+    each other.
+    """
+
+    _occurrences: Dict[str, int] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def is_incremental() -> bool:
+        """
+        Indicate if the incremental execution was enabled in the config
+
+        :return: if the steps already executed should be skipped
+        :rtype: bool
+        """
+        config = Config.get_config()
+        return config.get("INCREMENTAL_EXECUTION").lower() in ("true", "yes", "1")
+
+    @classmethod
+    def reset(cls):
+        """
+        Forget the occurrences counted so far, to start a new execution
+        """
+        with cls._lock:
+            cls._occurrences = {}
+
+    @classmethod
+    def register(cls, step: TransactionStep) -> bool:
+        """
+        Compute the fingerprint of a step about to be executed and count its
+        occurrence. Return True if the step was already executed successfully
+        and can be skipped. Nothing is computed nor recorded outside of the
+        incremental execution.
+
+        :param step: step to register
+        :type step: TransactionStep
+        :return: if the step should be skipped
+        :rtype: bool
+        """
+        step.fingerprint = None
+        if not cls.is_incremental():
+            return False
+        fingerprint = step.compute_fingerprint()
+        with cls._lock:
+            occurrence = cls._occurrences.get(fingerprint, 0) + 1
+            cls._occurrences[fingerprint] = occurrence
+        step.fingerprint = (fingerprint, occurrence)
+        if not ScenarioData.get().is_fingerprint_executed(fingerprint, occurrence):
+            return False
+        LOGGER.info(
+            f"Skipping the {type(step).__name__} already executed "
+            f"(fingerprint {fingerprint[:16]})"
+        )
+        return True
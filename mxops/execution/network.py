@@ -3,17 +3,17 @@ author: Etienne Wallet
 
 This module contains the functions to pass transactions to the proxy and to monitor them
 """
-import time
-from typing import List, Union
+from typing import List, Optional, Sequence, Union
 
 from multiversx_sdk_cli.transactions import Transaction as CliTransaction
 from multiversx_sdk_core import Address, Transaction
-from multiversx_sdk_network_providers import ProxyNetworkProvider
 from multiversx_sdk_network_providers.transactions import TransactionOnNetwork
 
 from mxops.config.config import Config
 from mxops import errors
+from mxops.execution.finality import FinalityTracker
 from mxops.execution.msc import OnChainTransfer
+from mxops.execution.proxy import ProxyRegistry
 
 
 def send(tx: Union[CliTransaction, Transaction]) -> str:
@@ -25,11 +25,46 @@ def send(tx: Union[CliTransaction, Transaction]) -> str:
     :return: hash of the transaction
     :rtype: str
     """
-    config = Config.get_config()
-    proxy = ProxyNetworkProvider(config.get("PROXY"))
+    proxy = ProxyRegistry.get_proxy()
     return proxy.send_transaction(tx)
 
 
+def send_many(txs: Sequence[Union[CliTransaction, Transaction]]) -> List[Optional[str]]:
+    """
+    Send several transactions through the proxy without waiting for a return.
+    The transactions are sent by chunks of TX_SEND_CHUNK_SIZE transactions,
+    one request per chunk.
+
+    :param txs: transactions to send, in their sending order
+    :type txs: Sequence[Union[CliTransaction, Transaction]]
+    :return: hash of each transaction, None if it was not accepted by the network
+    :rtype: List[Optional[str]]
+    """
+    proxy = ProxyRegistry.get_proxy()
+    chunk_size = int(Config.get_config().get("TX_SEND_CHUNK_SIZE"))
+    tx_hashes = []
+    for start in range(0, len(txs), chunk_size):
+        chunk = txs[start : start + chunk_size]
+        _, chunk_hashes = proxy.send_transactions(chunk)
+        # the hashes are keyed by the index of the accepted transactions
+        chunk_hashes = chunk_hashes or {}
+        tx_hashes.extend(chunk_hashes.get(str(i)) for i in range(len(chunk)))
+    return tx_hashes
+
+
+def wait_for_result(tx_hash: str) -> TransactionOnNetwork:
+    """
+    Wait for a transaction already sent to be completed and return the on-chain
+    finalised transaction. The transaction is monitored by the finality tracker.
+
+    :param tx_hash: hash of the transaction to wait for
+    :type tx_hash: str
+    :return: on chain finalised transaction
+    :rtype: TransactionOnNetwork
+    """
+    return FinalityTracker.get().track(tx_hash).result()
+
+
 def send_and_wait_for_result(
     tx: Union[CliTransaction, Transaction]
 ) -> TransactionOnNetwork:
@@ -42,23 +77,8 @@ def send_and_wait_for_result(
     :return: on chain finalised transaction
     :rtype: TransactionOnNetwork
     """
-    config = Config.get_config()
-    proxy = ProxyNetworkProvider(config.get("PROXY"))
-
-    timeout = int(config.get("TX_TIMEOUT"))
-    refresh_period = int(config.get("TX_REFRESH_PERIOD"))
-
-    tx_hash = proxy.send_transaction(tx)
-    num_periods_to_wait = int(timeout / refresh_period)
-
-    for _ in range(0, num_periods_to_wait):
-        time.sleep(refresh_period)
-
-        on_chain_tx = proxy.get_transaction(tx_hash, True)
-        if on_chain_tx.is_completed:
-            return on_chain_tx
-
-    raise errors.UnfinalizedTransactionException(on_chain_tx)
+    tx_hash = send(tx)
+    return wait_for_result(tx_hash)
 
 
 def raise_on_errors(on_chain_tx: TransactionOnNetwork):
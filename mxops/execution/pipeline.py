@@ -0,0 +1,393 @@
+"""
+author: Etienne Wallet
+
+This module contains the pipeline used to send transactions back-to-back without
+waiting for the results of the previous ones
+"""
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import ExitStack
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from multiversx_sdk_core import TokenComputer, Transaction
+from multiversx_sdk_core.transaction_factories import (
+    TransactionsFactoryConfig,
+    TransferTransactionsFactory,
+)
+
+from mxops.config.config import Config
+from mxops.data.execution_data import ScenarioData
+from mxops.execution import utils
+from mxops.execution.account import AccountsManager
+from mxops.execution.bundle import TransactionBundle
+from mxops.execution.checks import SuccessCheck
+from mxops.execution.cursor import ExecutionCursor, Position
+from mxops.execution.finality import FinalityTracker
+from mxops.execution.network import send_many
+from mxops.execution.signing import TransactionSigner
+from mxops.execution.steps import Step, TransactionStep
+from mxops.utils.logger import get_logger
+from mxops import errors
+from mxops.utils.msc import get_tx_link
+
+
+LOGGER = get_logger("pipeline")
+
+# the pipeline is not shared between threads: the steps executed concurrently
+# bypass it within their own context
+_BYPASSED: ContextVar[bool] = ContextVar("pipeline_bypassed", default=False)
+
+
+@dataclass
+class UnsentTransaction:
+    """
+    Transaction built for a step and waiting to be signed and broadcasted, along
+    with the position and the fingerprint of the step when it was submitted
+    """
+
+    step: TransactionStep
+    tx: Transaction
+    position: Optional[Position]
+    fingerprint: Optional[Tuple[str, int]]
+
+
+@dataclass
+class PendingTransaction:
+    """
+    Transaction sent by a step and whose result has not been processed yet
+    """
+
+    step: TransactionStep
+    tx_hash: str
+    nonce: int
+    position: Optional[Position]
+    fingerprint: Optional[Tuple[str, int]]
+    future: Future
+
+
+class TransactionPipeline:
+    """
+    This class holds the transactions sent in pipelined mode. The transactions are
+    signed with consecutive nonces and broadcasted by chunks without waiting for
+    each other.
+    Their finality is monitored by the finality tracker and their results are
+    processed as they arrive, when the pipeline is flushed or when a sender reaches
+    its limit of in-flight transactions.
+    """
+
+    _pending: List[PendingTransaction] = []
+    _unsent: List[UnsentTransaction] = []
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """
+        Indicate if the pipelined mode was enabled in the config
+
+        :return: if the transactions should be pipelined
+        :rtype: bool
+        """
+        if _BYPASSED.get() or TransactionBundle.is_recording():
+            return False
+        config = Config.get_config()
+        return config.get("PIPELINE_TRANSACTIONS").lower() in ("true", "yes", "1")
+
+    @staticmethod
+    def bypass():
+        """
+        Disable the pipeline for the remaining of the current context
+        """
+        _BYPASSED.set(True)
+
+    @classmethod
+    def accepts(cls, step: Step) -> bool:
+        """
+        Indicate if a step can be sent through the pipeline. This is the case for
+        the transaction steps whose results are not needed by the next steps and
+        whose checks can be evaluated at any later time.
+
+        :param step: step to inspect
+        :type step: Step
+        :return: if the step can be pipelined
+        :rtype: bool
+        """
+        if not cls.is_enabled() or not isinstance(step, TransactionStep):
+            return False
+        if not step.PIPELINABLE:
+            return False
+        return all(isinstance(check, SuccessCheck) for check in step.checks)
+
+    @classmethod
+    def get_n_in_flight(cls, sender: str) -> int:
+        """
+        Return the number of transactions of a sender that are awaiting their
+        broadcast or their results
+
+        :param sender: sender of the transactions
+        :type sender: str
+        :return: number of pending transactions for this sender
+        :rtype: int
+        """
+        n_unsent = sum(unsent.step.sender == sender for unsent in cls._unsent)
+        return n_unsent + sum(pending.step.sender == sender for pending in cls._pending)
+
+    @classmethod
+    def submit(cls, step: TransactionStep):
+        """
+        Build the transaction of a step without waiting for its result.
+        The transactions are signed and broadcasted together once TX_SEND_CHUNK_SIZE
+        of them are waiting, or when the pipeline is flushed. If the sender already has
+        the maximum number of transactions in flight, its first completed
+        transaction is resolved first.
+
+        :param step: step to submit
+        :type step: TransactionStep
+        """
+        config = Config.get_config()
+        max_in_flight = int(config.get("MAX_IN_FLIGHT_TXS_PER_SENDER"))
+        while cls.get_n_in_flight(step.sender) >= max_in_flight:
+            cls._broadcast()
+            cls._resolve_first_completed(step.sender)
+
+        # the cursor does not move past the step until its result is processed
+        position = ExecutionCursor.get_position()
+        ExecutionCursor.hold(position)
+        # the same step instance is submitted again by the next loop iterations
+        cls._unsent.append(
+            UnsentTransaction(
+                step, step.build_transaction(), position, step.fingerprint
+            )
+        )
+        if len(cls._unsent) >= int(config.get("TX_SEND_CHUNK_SIZE")):
+            cls._broadcast()
+
+    @classmethod
+    def _sign_and_send(
+        cls, built_steps: List[Tuple[TransactionStep, Transaction]]
+    ) -> Tuple[
+        List[Tuple[TransactionStep, Transaction, str]],
+        List[errors.TransactionNotAccepted],
+    ]:
+        """
+        Sign transactions by batch, broadcast them in bulk and map the hashes of
+        the accepted ones back to their steps
+
+        :param built_steps: steps with their transactions, nonces already assigned
+        :type built_steps: List[Tuple[TransactionStep, Transaction]]
+        :return: accepted steps with their transactions and hashes and the
+            errors of the rejected transactions
+        :rtype: Tuple[List[Tuple[TransactionStep, Transaction, str]],
+            List[errors.TransactionNotAccepted]]
+        """
+        try:
+            TransactionSigner.sign_many([(step.sender, tx) for step, tx in built_steps])
+            tx_hashes = send_many([tx for _, tx in built_steps])
+        except Exception:
+            for step, tx in reversed(built_steps):
+                step.release_transaction(tx)
+            raise
+        accepted, rejected = [], []
+        # the nonces are released from the last one, so that the nonce of a sender
+        # rolls back over all its trailing rejected transactions
+        for (step, tx), tx_hash in reversed(list(zip(built_steps, tx_hashes))):
+            if tx_hash is None:
+                step.release_transaction(tx)
+                rejected.append(errors.TransactionNotAccepted(step.sender, tx.nonce))
+            else:
+                AccountsManager.get_lane(step.sender).register_sent(tx)
+                accepted.append((step, tx, tx_hash))
+        accepted.reverse()
+        rejected.reverse()
+        LOGGER.info(f"{len(accepted)}/{len(built_steps)} transactions accepted")
+        if len(rejected) > 0:
+            cls._fill_nonce_gaps(built_steps, tx_hashes)
+        return accepted, rejected
+
+    @staticmethod
+    def _fill_nonce_gaps(
+        built_steps: List[Tuple[TransactionStep, Transaction]],
+        tx_hashes: List[Optional[str]],
+    ):
+        """
+        Send an empty transfer for each rejected nonce followed by an accepted one
+        of the same sender, as the accepted transactions would otherwise wait
+        forever behind the gap
+
+        :param built_steps: steps with their signed transactions
+        :type built_steps: List[Tuple[TransactionStep, Transaction]]
+        :param tx_hashes: hashes returned by the network, None for the rejected
+            transactions
+        :type tx_hashes: List[Optional[str]]
+        """
+        last_accepted_nonces = {}
+        for (step, tx), tx_hash in zip(built_steps, tx_hashes):
+            if tx_hash is not None:
+                last_nonce = last_accepted_nonces.get(step.sender, tx.nonce)
+                last_accepted_nonces[step.sender] = max(last_nonce, tx.nonce)
+        fillers = []
+        factory_config = TransactionsFactoryConfig(Config.get_config().get("CHAIN"))
+        tr_factory = TransferTransactionsFactory(factory_config, TokenComputer())
+        for (step, tx), tx_hash in zip(built_steps, tx_hashes):
+            if tx_hash is None and tx.nonce < last_accepted_nonces.get(step.sender, -1):
+                sender = utils.get_address_instance(step.sender)
+                filler = tr_factory.create_transaction_for_native_token_transfer(
+                    sender=sender, receiver=sender, native_amount=0
+                )
+                filler.nonce = tx.nonce
+                fillers.append((step.sender, filler))
+        if len(fillers) == 0:
+            return
+        LOGGER.warning(f"Filling {len(fillers)} nonces left by rejected transactions")
+        TransactionSigner.sign_many(fillers)
+        filler_hashes = send_many([filler for _, filler in fillers])
+        for (sender, filler), filler_hash in zip(fillers, filler_hashes):
+            if filler_hash is None:
+                LOGGER.error(
+                    f"The nonce {filler.nonce} of {sender} could not be filled, "
+                    "its next transactions will not be executed"
+                )
+            else:
+                AccountsManager.get_lane(sender).register_sent(filler)
+
+    @classmethod
+    def _broadcast(cls):
+        """
+        Sign and broadcast the transactions built by the pipeline and start
+        monitoring them
+        """
+        if len(cls._unsent) == 0:
+            return
+        unsent, cls._unsent = cls._unsent, []
+        unsent_by_tx = {id(entry.tx): entry for entry in unsent}
+        accepted, rejected = cls._sign_and_send(
+            [(entry.step, entry.tx) for entry in unsent]
+        )
+        ExecutionCursor.record_pending_transactions(
+            [(unsent_by_tx[id(tx)].position, tx_hash) for _, tx, tx_hash in accepted]
+        )
+        for step, tx, tx_hash in accepted:
+            entry = unsent_by_tx[id(tx)]
+            if len(step.checks) == 0:
+                AccountsManager.get_lane(step.sender).confirm(tx.nonce)
+                step.process_on_chain_transaction(None)
+                ExecutionCursor.release(entry.position)
+                continue
+            LOGGER.info(f"Transaction sent in the pipeline: {get_tx_link(tx_hash)}")
+            future = FinalityTracker.get().track(tx_hash)
+            cls._pending.append(
+                PendingTransaction(
+                    step, tx_hash, tx.nonce, entry.position, entry.fingerprint, future
+                )
+            )
+        if len(rejected) > 0:
+            raise rejected[0]
+
+    @classmethod
+    def send_burst(cls, steps: List[TransactionStep]):
+        """
+        Build, sign and send the transactions of several steps back-to-back and
+        then process their results, whether the pipelined mode is enabled or not.
+        The transactions are processed by chunks of at most
+        MAX_IN_FLIGHT_TXS_PER_SENDER transactions. All the results of a chunk are
+        processed before the error of the first failed step, if any, is raised.
+        In sign-only mode, the transactions are written to the bundle instead.
+
+        :param steps: steps to send
+        :type steps: List[TransactionStep]
+        """
+        cls.flush()
+        if TransactionBundle.is_recording():
+            for step in steps:
+                step.execute_sign_only()
+            return
+        max_in_flight = int(Config.get_config().get("MAX_IN_FLIGHT_TXS_PER_SENDER"))
+        for start in range(0, len(steps), max_in_flight):
+            chunk = steps[start : start + max_in_flight]
+            # the nonces are held from the signature to the broadcast
+            with ExitStack() as stack:
+                for sender in sorted({step.sender for step in chunk}):
+                    stack.enter_context(AccountsManager.get_nonce_lock(sender))
+                built_steps = [(step, step.build_transaction()) for step in chunk]
+                accepted, rejected = cls._sign_and_send(built_steps)
+            fingerprints = {id(tx): step.fingerprint for step, tx in built_steps}
+            futures = FinalityTracker.get().track_many(
+                [tx_hash for step, _, tx_hash in accepted if len(step.checks) > 0]
+            )
+            first_error = rejected[0] if len(rejected) > 0 else None
+            for step, tx, _ in accepted:
+                try:
+                    on_chain_tx = None
+                    if len(step.checks) > 0:
+                        on_chain_tx = futures.pop(0).result()
+                    AccountsManager.get_lane(step.sender).confirm(tx.nonce)
+                    step.process_on_chain_transaction(on_chain_tx, fingerprints[id(tx)])
+                except Exception as err:  # pylint: disable=broad-except
+                    first_error = first_error or err
+            ScenarioData.get().save_if_needed()
+            if first_error is not None:
+                raise first_error
+
+    @classmethod
+    def _resolve_first_completed(cls, sender: Optional[str] = None):
+        """
+        Wait for at least one pending transaction to be completed and process
+        the results of all the completed ones, in their submission order.
+        If none is completed within NONCE_GAP_CHECK_PERIOD seconds, the nonce gaps
+        of their senders are looked for.
+
+        :param sender: if provided, only the transactions of this sender
+            are considered, defaults to None
+        :type sender: Optional[str]
+        """
+        candidates = [
+            pending
+            for pending in cls._pending
+            if sender is None or pending.step.sender == sender
+        ]
+        if len(candidates) == 0:
+            return
+        check_period = float(Config.get_config().get("NONCE_GAP_CHECK_PERIOD"))
+        futures = [pending.future for pending in candidates]
+        while len(wait(futures, check_period, FIRST_COMPLETED).done) == 0:
+            for stalled_sender in {pending.step.sender for pending in candidates}:
+                AccountsManager.get_lane(stalled_sender).recover_gaps()
+        for pending in candidates:
+            if pending.future.done():
+                cls._pending.remove(pending)
+                AccountsManager.get_lane(pending.step.sender).confirm(pending.nonce)
+                on_chain_tx = pending.future.result()
+                pending.step.process_on_chain_transaction(
+                    on_chain_tx, pending.fingerprint
+                )
+                ExecutionCursor.release(pending.position)
+        ScenarioData.get().save_if_needed()
+
+    @classmethod
+    def flush(cls):
+        """
+        Sign and broadcast the waiting transactions and resolve all the pending
+        transactions
+        """
+        cls._broadcast()
+        if len(cls._pending) > 0:
+            LOGGER.info(f"Resolving {len(cls._pending)} pipelined transactions")
+        while len(cls._pending) > 0:
+            cls._resolve_first_completed()
+
+    @classmethod
+    def is_empty(cls) -> bool:
+        """
+        Indicate if no transaction is waiting to be broadcasted or resolved
+
+        :return: if the pipeline is empty
+        :rtype: bool
+        """
+        return len(cls._unsent) == 0 and len(cls._pending) == 0
+
+    @classmethod
+    def clear(cls):
+        """
+        Drop all the pending transactions without resolving them
+        """
+        cls._pending = []
+        cls._unsent = []
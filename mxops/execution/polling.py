@@ -0,0 +1,152 @@
+"""
+author: Etienne Wallet
+
+This module contains the policies used to poll the status of the transactions
+"""
+from typing import Dict, Iterator, Optional
+
+from mxops.config.config import Config
+
+
+class PollingPolicy:
+    """
+    Represents a policy that decides the delays to wait between two status checks
+    of a transaction
+    """
+
+    def get_delays(self) -> Iterator[float]:
+        """
+        Interface for the method that yields the successive delays, in seconds,
+        to wait before each status check of a transaction.
+        Each child class must override this method
+
+        :raises NotImplementedError: if this method was not overriden
+        by a child class or directly executed.
+        :yield: delay before the next check
+        :rtype: Iterator[float]
+        """
+        raise NotImplementedError
+
+    def record_completion(self, elapsed_time: float):
+        """
+        Register the time a transaction took to be completed. Does nothing
+        by default
+
+        :param elapsed_time: time between the sending and the completion, in seconds
+        :type elapsed_time: float
+        """
+
+
+class FixedPollingPolicy(PollingPolicy):
+    """
+    Check the transaction status at a flat rate
+    """
+
+    def __init__(self, refresh_period: float):
+        """
+        Initialise the policy
+
+        :param refresh_period: time to wait between two checks, in seconds
+        :type refresh_period: float
+        """
+        self.refresh_period = refresh_period
+
+    def get_delays(self) -> Iterator[float]:
+        """
+        Yield indefinitely the refresh period
+
+        :yield: delay before the next check
+        :rtype: Iterator[float]
+        """
+        while True:
+            yield self.refresh_period
+
+
+class AdaptivePollingPolicy(PollingPolicy):
+    """
+    Check the transaction status a first time after a short delay and then back off
+    geometrically, without ever waiting more than the round duration of the network.
+    The first delay follows the completion times measured on the previous
+    transactions.
+    """
+
+    def __init__(self, first_delay: float, backoff_factor: float, max_delay: float):
+        """
+        Initialise the policy
+
+        :param first_delay: minimum delay before the first check, in seconds
+        :type first_delay: float
+        :param backoff_factor: factor applied to the delay after each check
+        :type backoff_factor: float
+        :param max_delay: maximum delay between two checks, in seconds
+        :type max_delay: float
+        """
+        self.first_delay = first_delay
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.average_completion_time: Optional[float] = None
+
+    def get_delays(self) -> Iterator[float]:
+        """
+        Yield the delays of the policy
+
+        :yield: delay before the next check
+        :rtype: Iterator[float]
+        """
+        delay = self.first_delay
+        if self.average_completion_time is not None:
+            # first check slightly before the expected completion time
+            delay = max(delay, 0.8 * self.average_completion_time)
+        delay = min(delay, self.max_delay)
+        while True:
+            yield delay
+            delay = min(delay * self.backoff_factor, self.max_delay)
+
+    def record_completion(self, elapsed_time: float):
+        """
+        Update the exponential moving average of the completion times
+
+        :param elapsed_time: time between the sending and the completion, in seconds
+        :type elapsed_time: float
+        """
+        if self.average_completion_time is None:
+            self.average_completion_time = elapsed_time
+        else:
+            self.average_completion_time = (
+                0.8 * self.average_completion_time + 0.2 * elapsed_time
+            )
+
+
+_POLICIES: Dict[str, PollingPolicy] = {}
+
+
+def get_polling_policy() -> PollingPolicy:
+    """
+    Return the polling policy designated by the config option TX_POLLING_POLICY.
+    The instance is shared so that the adaptive policy can learn from all the
+    transactions.
+
+    :return: polling policy to use
+    :rtype: PollingPolicy
+    """
+    config = Config.get_config()
+    policy_name = config.get("TX_POLLING_POLICY").lower()
+    try:
+        return _POLICIES[policy_name]
+    except KeyError:
+        pass
+
+    refresh_period = float(config.get("TX_REFRESH_PERIOD"))
+    if policy_name == "fixed":
+        policy = FixedPollingPolicy(refresh_period)
+    elif policy_name == "adaptive":
+        round_duration = config.get_network_config().round_duration / 1000
+        policy = AdaptivePollingPolicy(
+            first_delay=float(config.get("TX_FIRST_POLL_DELAY")),
+            backoff_factor=float(config.get("TX_POLL_BACKOFF_FACTOR")),
+            max_delay=round_duration if round_duration > 0 else refresh_period,
+        )
+    else:
+        raise ValueError(f"Unknown transaction polling policy: {policy_name}")
+    _POLICIES[policy_name] = policy
+    return policy
@@ -0,0 +1,191 @@
+"""
+author: Etienne Wallet
+
+This module contains the shared proxy clients used to communicate with the network
+"""
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from multiversx_sdk_network_providers import ProxyNetworkProvider
+from multiversx_sdk_network_providers.errors import GenericError
+from multiversx_sdk_network_providers.proxy_network_provider import GenericResponse
+
+from mxops.config.config import Config
+from mxops.utils.logger import get_logger
+
+
+LOGGER = get_logger("proxy")
+
+
+class PooledProxyNetworkProvider(ProxyNetworkProvider):
+    """
+    Proxy network provider that keeps its HTTP connections alive in a pool
+    instead of opening a new connection for each request
+    """
+
+    def __init__(self, url: str, pool_size: int, timeout: Tuple[float, float]):
+        """
+        Initialise the provider with its own HTTP session
+
+        :param url: url of the proxy
+        :type url: str
+        :param pool_size: maximum number of connections kept alive
+        :type pool_size: int
+        :param timeout: connection and read timeouts in seconds
+        :type timeout: Tuple[float, float]
+        """
+        super().__init__(url)
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _do_request(
+        self, method: str, url: str, payload: Any = None
+    ) -> GenericResponse:
+        """
+        Send a request through the session of this provider and return its data
+
+        :param method: HTTP method to use
+        :type method: str
+        :param url: url to request
+        :type url: str
+        :param payload: json payload of the request, defaults to None
+        :type payload: Any
+        :return: data of the response
+        :rtype: GenericResponse
+        """
+        try:
+            response = self.session.request(
+                method, url, json=payload, auth=self.auth, timeout=self.timeout
+            )
+            response.raise_for_status()
+            parsed = response.json()
+            return self.get_data(parsed, url)
+        except requests.HTTPError as err:
+            error_data = self._extract_error_from_response(err.response)
+            raise GenericError(url, error_data) from err
+        except Exception as err:
+            raise GenericError(url, err) from err
+
+    def do_get(self, url: str) -> GenericResponse:
+        """
+        Send a GET request using the pooled connections
+
+        :param url: url to request
+        :type url: str
+        :return: data of the response
+        :rtype: GenericResponse
+        """
+        return self._do_request("GET", url)
+
+    def do_post(self, url: str, payload: Any) -> GenericResponse:
+        """
+        Send a POST request using the pooled connections
+
+        :param url: url to request
+        :type url: str
+        :param payload: json payload of the request
+        :type payload: Any
+        :return: data of the response
+        :rtype: GenericResponse
+        """
+        return self._do_request("POST", url, payload)
+
+    def get_connections_stats(self) -> Dict[str, int]:
+        """
+        Count the connections opened by this provider and the number of times
+        they were reused
+
+        :return: number of requests, opened connections and reused connections
+        :rtype: Dict[str, int]
+        """
+        n_requests = 0
+        n_opened = 0
+        adapters = {id(a): a for a in self.session.adapters.values()}.values()
+        for adapter in adapters:
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                n_requests += pool.num_requests
+                n_opened += pool.num_connections
+        return {
+            "requests": n_requests,
+            "opened": n_opened,
+            "reused": n_requests - n_opened,
+        }
+
+
+class ProxyRegistry:
+    """
+    Process-wide registry of the proxy clients, keyed by url.
+    This allows to reuse the same HTTP connections across all the executed steps.
+    """
+
+    _proxies: Dict[str, PooledProxyNetworkProvider] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_proxy(cls, url: Optional[str] = None) -> PooledProxyNetworkProvider:
+        """
+        Return the proxy client for the given url, create it if needed.
+
+        :param url: url of the proxy, defaults to the proxy of the config
+        :type url: Optional[str]
+        :return: shared proxy client
+        :rtype: PooledProxyNetworkProvider
+        """
+        config = Config.get_config()
+        if url is None:
+            url = config.get("PROXY")
+        with cls._lock:
+            try:
+                return cls._proxies[url]
+            except KeyError:
+                pass
+            proxy = PooledProxyNetworkProvider(
+                url,
+                pool_size=int(config.get("PROXY_POOL_SIZE")),
+                timeout=(
+                    float(config.get("PROXY_CONNECT_TIMEOUT")),
+                    float(config.get("PROXY_READ_TIMEOUT")),
+                ),
+            )
+            cls._proxies[url] = proxy
+            return proxy
+
+    @classmethod
+    def get_connections_stats(cls) -> Dict[str, Dict[str, int]]:
+        """
+        Return the connections statistics of each registered proxy client
+
+        :return: statistics per proxy url
+        :rtype: Dict[str, Dict[str, int]]
+        """
+        with cls._lock:
+            proxies = dict(cls._proxies)
+        return {url: p.get_connections_stats() for url, p in proxies.items()}
+
+    @classmethod
+    def log_connections_stats(cls):
+        """
+        Log the connections statistics of each registered proxy client
+        """
+        for url, stats in cls.get_connections_stats().items():
+            LOGGER.debug(
+                f"Proxy {url}: {stats['requests']} requests, {stats['opened']} "
+                f"connections opened, {stats['reused']} connections reused"
+            )
+
+    @classmethod
+    def clear(cls):
+        """
+        Close and forget all the registered proxy clients
+        """
+        with cls._lock:
+            for proxy in cls._proxies.values():
+                proxy.session.close()
+            cls._proxies = {}
@@ -3,21 +3,47 @@ author: Etienne Wallet
 
 This module contains the functions to execute a scene in a scenario
 """
+from copy import copy, deepcopy
 from dataclasses import dataclass, field
+from functools import partial
 import os
 from pathlib import Path
 import re
-from typing import Dict, List, Union
+from typing import Dict, List, Tuple, Union
 
-from mxpyserializer.abi_serializer import AbiSerializer
+from multiversx_sdk_network_providers.errors import GenericError
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml is not available
+    from yaml import SafeLoader
+
 from mxops.config.config import Config
 from mxops.data.execution_data import _ScenarioData, ExternalContractData, ScenarioData
-from mxops.execution.steps import LoopStep, SceneStep, Step, instanciate_steps
+from mxops.data.serializers import load_serializer_from_abi
+from mxops.execution.steps import (
+    ContractDeployFromSourceBatchStep,
+    LoopStep,
+    SceneStep,
+    Step,
+    TransactionStep,
+    instanciate_steps,
+)
 from mxops.execution.account import AccountsManager
+from mxops.execution.cursor import ExecutionCursor
+from mxops.execution.fingerprints import StepsFingerprints
+from mxops.execution.network import raise_on_errors, wait_for_result
+from mxops.execution.pipeline import TransactionPipeline
+from mxops.execution.proxy import ProxyRegistry
+from mxops.execution.scheduler import (
+    execute_iterations_in_parallel,
+    execute_steps_in_parallel,
+)
+from mxops.execution import utils
 from mxops import errors
 from mxops.utils.logger import get_logger
+from mxops.utils.msc import get_tx_link
 
 
 LOGGER = get_logger("scene")
@@ -33,6 +59,7 @@ class Scene:
     allowed_networks: List[str]
     allowed_scenario: List[str]
     accounts: List[Dict] = field(default_factory=list)
+    wallet_pools: Dict[str, Dict] = field(default_factory=dict)
     steps: List[Step] = field(default_factory=list)
     external_contracts: Dict[str, Union[str, Dict[str, str]]] = field(
         default_factory=dict
@@ -48,19 +75,37 @@ class Scene:
             self.steps = instanciate_steps(self.steps)
 
 
+# loaded scenes with the modification time and the size of their file
+_SCENES_CACHE: Dict[Path, Tuple[Tuple[int, int], Scene]] = {}
+
+
 def load_scene(path: Path) -> Scene:
     """
-    Load a scene file and convert its content into a list
+    Load a scene file and convert its content into a Scene.
+    The instantiated scenes are cached as long as their file is not modified and
+    a fresh copy is returned at each call.
 
-    :param path: _description_
+    :param path: path of the scene file
     :type path: Path
-    :return: _description_
-    :rtype: List[Step]
+    :return: loaded scene
+    :rtype: Scene
     """
+    file_stat = os.stat(path)
+    file_version = (file_stat.st_mtime_ns, file_stat.st_size)
+    cache_key = path.resolve()
+    try:
+        cached_version, scene = _SCENES_CACHE[cache_key]
+        if cached_version == file_version:
+            return deepcopy(scene)
+    except KeyError:
+        pass
+
     with open(path.as_posix(), "r", encoding="utf-8") as file:
-        raw_scene = yaml.safe_load(file)
+        raw_scene = yaml.load(file, Loader=SafeLoader)
 
-    return Scene(**raw_scene)
+    scene = Scene(**raw_scene)
+    _SCENES_CACHE[cache_key] = (file_version, scene)
+    return deepcopy(scene)
 
 
 def execute_scene(scene_path: Path):
@@ -97,23 +142,31 @@ def execute_scene(scene_path: Path):
             scene_path, scenario_data.name, scene.allowed_scenario
         )
 
+    # pending transactions must be resolved before any nonce synchronisation
+    if len(scene.accounts) > 0 or len(scene.wallet_pools) > 0:
+        TransactionPipeline.flush()
+
     # load accounts
     for account in scene.accounts:
         AccountsManager.load_account(**account)
         AccountsManager.sync_account(account["account_name"])
 
+    # load wallet pools
+    for pool_name, pool_data in scene.wallet_pools.items():
+        AccountsManager.load_wallet_pool(pool_name, **pool_data)
+
     # load external contracts addresses
     for contract_id, contract_data in scene.external_contracts.items():
         if isinstance(contract_data, str):
             contract_data = {"address": contract_data}
         address = contract_data["address"]
         try:
-            serializer = AbiSerializer.from_abi(Path(contract_data["abi_path"]))
+            serializer = load_serializer_from_abi(Path(contract_data["abi_path"]))
         except KeyError:
             serializer = None
         try:
             scenario_data.set_contract_value(contract_id, "address", address)
-            scenario_data.contracts_data[contract_id].serializer = serializer
+            scenario_data.set_contract_value(contract_id, "serializer", serializer)
         except errors.UnknownContract:
             # otherwise create the contract data
             scenario_data.add_contract_data(
@@ -126,14 +179,67 @@ def execute_scene(scene_path: Path):
             )
 
     # execute steps
-    for step in scene.steps:
-        execute_step(step, scenario_data)
+    start = ExecutionCursor.enter_scene(scene_path, len(scene.steps))
+    steps = scene.steps[start:]
+    max_parallel = int(config.get("MAX_PARALLEL_STEPS"))
+    if max_parallel > 1 and len(steps) > 1:
+        # the positions of concurrent steps can not be resumed precisely
+        ExecutionCursor.stop_resuming()
+        # the pipeline is not shared between the threads of the scheduler
+        TransactionPipeline.flush()
+        execute_steps_in_parallel(
+            steps,
+            partial(execute_scheduled_step, scenario_data=scenario_data),
+            max_parallel,
+        )
+    else:
+        for i, step in enumerate(steps, start):
+            ExecutionCursor.move_to(i)
+            execute_tracked_step(step, scenario_data)
+    ExecutionCursor.exit()
+    scenario_data.flush()
+
+
+def assign_pool_sender(step: Step) -> Step:
+    """
+    If the sender of a transaction step is a wallet pool, return a copy of the step
+    whose sender is an account chosen in the pool. Otherwise, return the step
+    itself.
+
+    :param step: step to execute
+    :type step: Step
+    :return: step with an account as sender
+    :rtype: Step
+    """
+    if not isinstance(step, TransactionStep):
+        return step
+    wallet_pool = AccountsManager.get_wallet_pool(step.sender)
+    if wallet_pool is None:
+        return step
+    pool_step = copy(step)
+    pool_step.sender = wallet_pool.choose_sender(step.estimate_cost())
+    return pool_step
 
 
 def execute_step(step: Step, scenario_data: _ScenarioData):
     """
     Execute a step
 
+    :param step: step to execute
+    :type step: Step
+    :param scenario_data: data of the current Scenario
+    :type scenario_data: _ScenarioData
+    """
+    if isinstance(step, TransactionStep) and StepsFingerprints.register(step):
+        return
+    step = assign_pool_sender(step)
+    dispatch_step(step, scenario_data)
+
+
+def dispatch_step(step: Step, scenario_data: _ScenarioData):
+    """
+    Execute a step whose fingerprint, if any, was already registered
+
     :param step: step to execute
     :type step: Step
     :param scenario_data: data of the current Scenario
@@ -141,12 +247,216 @@ def execute_step(step: Step, scenario_data: _ScenarioData):
     """
     if isinstance(step, SceneStep):
         execute_scene(Path(step.scene_path))
+    elif isinstance(step, LoopStep) and step.parallelism > 1:
+        execute_loop_in_parallel(step, scenario_data)
     elif isinstance(step, LoopStep):
-        for sub_step in step.generate_steps():
-            execute_step(sub_step, scenario_data)
+        execute_loop(step, scenario_data)
+    elif isinstance(step, ContractDeployFromSourceBatchStep):
+        execute_deploy_batch(step)
+    elif TransactionPipeline.accepts(step):
+        TransactionPipeline.submit(step)
     else:
+        TransactionPipeline.flush()
+        step.execute()
+        scenario_data.save_if_needed()
+
+
+def execute_deploy_batch(batch_step: ContractDeployFromSourceBatchStep):
+    """
+    Send the deployments of a batch in a single burst, skipping the deployments
+    already executed in incremental mode
+
+    :param batch_step: batch of deployments to execute
+    :type batch_step: ContractDeployFromSourceBatchStep
+    """
+    steps = [
+        assign_pool_sender(deploy_step)
+        for deploy_step in batch_step.generate_steps()
+        if not StepsFingerprints.register(deploy_step)
+    ]
+    LOGGER.info(
+        f"Deploying {len(steps)} contracts from the source {batch_step.source_contract}"
+    )
+    TransactionPipeline.send_burst(steps)
+
+
+def execute_tracked_step(step: Step, scenario_data: _ScenarioData):
+    """
+    Execute a step whose position is tracked by the cursor. If the step is the one
+    that was being executed when a previous execution was interrupted, its
+    transaction is reconciled instead of sending a new one.
+
+    :param step: step to execute
+    :type step: Step
+    :param scenario_data: data of the current Scenario
+    :type scenario_data: _ScenarioData
+    """
+    tx_hash = None
+    if ExecutionCursor.is_resuming() and not isinstance(step, (LoopStep, SceneStep)):
+        is_at_position = ExecutionCursor.is_at_resume_position()
+        tx_hash = ExecutionCursor.stop_resuming()
+        if not is_at_position:
+            tx_hash = None
+    elif isinstance(step, TransactionStep):
+        # pipelined step left unresolved by the previous execution
+        tx_hash = ExecutionCursor.pop_pending_transaction()
+    if isinstance(step, TransactionStep):
+        # the occurrence of the step is counted once, whether it is reconciled
+        # or executed
+        if StepsFingerprints.register(step):
+            return
+        step = assign_pool_sender(step)
+        if tx_hash is not None and reconcile_transaction(step, tx_hash):
+            return
+    dispatch_step(step, scenario_data)
+
+
+def reconcile_transaction(step: TransactionStep, tx_hash: str) -> bool:
+    """
+    Process the result of a transaction sent by a step during a previous execution.
+    The transaction is reconciled only if it was found on chain and executed
+    successfully, otherwise the step must be executed again.
+
+    :param step: step that sent the transaction
+    :type step: TransactionStep
+    :param tx_hash: hash of the transaction
+    :type tx_hash: str
+    :return: if the transaction was reconciled
+    :rtype: bool
+    """
+    TransactionPipeline.flush()
+    try:
+        ProxyRegistry.get_proxy().get_transaction(tx_hash)
+    except GenericError:
+        LOGGER.info(f"Transaction {tx_hash} not found, the step is executed again")
+        return False
+    on_chain_tx = wait_for_result(tx_hash)
+    AccountsManager.sync_account(step.sender)
+    try:
+        raise_on_errors(on_chain_tx)
+    except errors.TransactionError:
+        LOGGER.warning(
+            f"Transaction {get_tx_link(tx_hash)} failed, the step is executed again"
+        )
+        return False
+    LOGGER.info(f"Step reconciled with its transaction {get_tx_link(tx_hash)}")
+    step.process_on_chain_transaction(on_chain_tx, step.fingerprint)
+    ScenarioData.get().save_if_needed()
+    return True
+
+
+def save_loop_progress(loop_step: LoopStep, offset: int, is_chunk_end: bool):
+    """
+    Save the number of completed iterations of a loop under its resume key.
+    The iterations whose pipelined transactions are not resolved are not
+    completed: while some are pending, the progress is only saved at the end
+    of a chunk of iterations, after the pipeline is flushed.
+
+    :param loop_step: loop being executed
+    :type loop_step: LoopStep
+    :param offset: number of iterations executed
+    :type offset: int
+    :param is_chunk_end: if the iteration ends a chunk of chunk_size iterations
+    :type is_chunk_end: bool
+    """
+    if loop_step.resume_key is None:
+        return
+    if not TransactionPipeline.is_empty():
+        if not is_chunk_end:
+            return
+        TransactionPipeline.flush()
+    loop_step.save_resume_offset(offset)
+
+
+def execute_loop(loop_step: LoopStep, scenario_data: _ScenarioData):
+    """
+    Execute the iterations of a loop one after the other
+
+    :param loop_step: loop to execute
+    :type loop_step: LoopStep
+    :param scenario_data: data of the current Scenario
+    :type scenario_data: _ScenarioData
+    """
+    start_iteration, start_step = ExecutionCursor.enter_loop()
+    first_iteration, current_iteration = None, None
+    for iteration, i, sub_step in loop_step.generate_indexed_steps(start_iteration):
+        if first_iteration is None:
+            first_iteration = iteration
+        elif iteration != current_iteration:
+            is_chunk_end = (iteration - first_iteration) % loop_step.chunk_size == 0
+            save_loop_progress(loop_step, iteration, is_chunk_end)
+        current_iteration = iteration
+        if iteration == start_iteration and i < start_step:
+            continue
+        ExecutionCursor.move_to(i, iteration)
+        execute_tracked_step(sub_step, scenario_data)
+    if loop_step.resume_key is not None:
+        # the loop starts from the beginning at its next execution
+        TransactionPipeline.flush()
+        loop_step.save_resume_offset(0)
+    ExecutionCursor.exit()
+
+
+def execute_loop_in_parallel(loop_step: LoopStep, scenario_data: _ScenarioData):
+    """
+    Execute the iterations of a loop concurrently. Each iteration executes the steps
+    of the loop in order, on its own copies of the steps and with its own variables
+    scope instead of the environment. The iterations do not use the transactions
+    pipeline. They are dispatched by chunks and the progress of the loop is saved
+    at the end of each chunk.
+
+    :param loop_step: loop to execute
+    :type loop_step: LoopStep
+    :param scenario_data: data of the current Scenario
+    :type scenario_data: _ScenarioData
+    """
+    TransactionPipeline.flush()
+    start_iteration, _ = ExecutionCursor.enter_loop()
+    # the positions within concurrent iterations can not be resumed precisely
+    ExecutionCursor.stop_resuming()
+    parent_variables = utils.get_variables_scope() or {}
+    LOGGER.info(
+        f"Executing the loop on {loop_step.var_name} with up to "
+        f"{loop_step.parallelism} iterations in parallel"
+    )
+
+    def execute_iteration(variables: Dict):
+        iteration_variables = {name: str(value) for name, value in variables.items()}
+        utils.set_variables_scope({**parent_variables, **iteration_variables})
+        TransactionPipeline.bypass()
+        ExecutionCursor.disable_tracking()
+        for sub_step in loop_step.steps:
+            execute_step(copy(sub_step), scenario_data)
+
+    for offset, chunk in loop_step.generate_chunks(start_iteration):
+        ExecutionCursor.move_to(0, offset - len(chunk))
+        execute_iterations_in_parallel(chunk, execute_iteration, loop_step.parallelism)
+        loop_step.save_resume_offset(offset)
+    ExecutionCursor.exit()
+
+
+def execute_scheduled_step(step: Step, scenario_data: _ScenarioData):
+    """
+    Execute a step dispatched by the parallel scheduler. Independent steps are
+    executed directly while the barrier steps (loops, scenes, python functions),
+    which are always executed alone, go through the usual execution
+    and have their pipelined transactions resolved before the next steps start.
+
+    :param step: step to execute
+    :type step: Step
+    :param scenario_data: data of the current Scenario
+    :type scenario_data: _ScenarioData
+    """
+    ExecutionCursor.disable_tracking()
+    if isinstance(step, TransactionStep) and StepsFingerprints.register(step):
+        return
+    step = assign_pool_sender(step)
+    if step.PARALLELIZABLE:
         step.execute()
-        scenario_data.save()
+        scenario_data.save_if_needed()
+    else:
+        dispatch_step(step, scenario_data)
+        TransactionPipeline.flush()
 
 
 def execute_directory(directory_path: Path):
@@ -0,0 +1,248 @@
+"""
+author: Etienne Wallet
+
+This module contains the scheduler that executes the independent steps of a scene
+concurrently
+"""
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Callable, Dict, Iterable, List, Set
+
+from mxops.data.execution_data import parse_value_key
+from mxops.execution.steps import Step
+from mxops.utils.logger import get_logger
+
+
+LOGGER = get_logger("scheduler")
+
+
+@dataclass
+class StepDependencies:
+    """
+    Holds the entities (accounts, contracts, tokens, scenario values) that a step
+    reads or modifies
+    """
+
+    reads: Set[str]
+    writes: Set[str]
+    is_barrier: bool
+
+    def conflicts_with(self, other: "StepDependencies") -> bool:
+        """
+        Indicate if two steps can not be executed in any order
+
+        :param other: dependencies of the other step
+        :type other: StepDependencies
+        :return: if the steps must keep their relative order
+        :rtype: bool
+        """
+        if self.is_barrier or other.is_barrier:
+            return True
+        if len(self.writes & (other.reads | other.writes)) > 0:
+            return True
+        return len(other.writes & self.reads) > 0
+
+
+def get_entity_key(value: str) -> str:
+    """
+    Return the name of the entity designated by a string of a step.
+    Scenario data references are reduced to their root (contract id, token name
+    or scenario value key), environment variables references to the variable
+    and account references to the account name.
+
+    :param value: string value of a step
+    :type value: str
+    :return: name of the designated entity
+    :rtype: str
+    """
+    if value.startswith("%"):
+        parsed_value_key = parse_value_key(value[1:].split(":")[0])
+        if len(parsed_value_key) > 0:
+            return str(parsed_value_key[0])
+    if value.startswith("$"):
+        return value.split(":")[0]
+    if value.startswith("[") and value.endswith("]"):
+        return value[1:-1]
+    return value
+
+
+def _collect_strings(value: Any) -> Set[str]:
+    """
+    Recursively collect all the strings contained in a value
+
+    :param value: value to inspect
+    :type value: Any
+    :return: strings found
+    :rtype: Set[str]
+    """
+    if isinstance(value, str):
+        return {value}
+    strings = set()
+    if is_dataclass(value):
+        for data_field in fields(value):
+            strings |= _collect_strings(getattr(value, data_field.name))
+    elif isinstance(value, dict):
+        for key, sub_value in value.items():
+            strings |= _collect_strings(key) | _collect_strings(sub_value)
+    elif isinstance(value, (list, tuple, set)):
+        for sub_value in value:
+            strings |= _collect_strings(sub_value)
+    return strings
+
+
+def get_step_dependencies(step: Step) -> StepDependencies:
+    """
+    Compute the entities read and written by a step. Every string of the step
+    is considered as read and the fields listed in WRITTEN_FIELDS, as well as
+    the sender of the step, are considered as written.
+
+    :param step: step to inspect
+    :type step: Step
+    :return: dependencies of the step
+    :rtype: StepDependencies
+    """
+    if not step.PARALLELIZABLE:
+        return StepDependencies(reads=set(), writes=set(), is_barrier=True)
+    reads = {get_entity_key(value) for value in _collect_strings(step)}
+    writes = set()
+    written_fields = list(step.WRITTEN_FIELDS)
+    if hasattr(step, "sender"):
+        written_fields.append("sender")
+    for field_name in written_fields:
+        values = _collect_strings(getattr(step, field_name))
+        writes |= {get_entity_key(value) for value in values}
+    return StepDependencies(reads=reads, writes=writes, is_barrier=False)
+
+
+def build_dependency_graph(steps: List[Step]) -> List[Set[int]]:
+    """
+    Compute for each step the indices of the previous steps that must be completed
+    before it can start
+
+    :param steps: steps in their sequential order
+    :type steps: List[Step]
+    :return: indices of the predecessors of each step
+    :rtype: List[Set[int]]
+    """
+    dependencies = [get_step_dependencies(step) for step in steps]
+    predecessors = []
+    for i, step_dependencies in enumerate(dependencies):
+        predecessors.append(
+            {
+                j
+                for j in range(i)
+                if step_dependencies.conflicts_with(dependencies[j])
+            }
+        )
+    return predecessors
+
+
+def execute_steps_in_parallel(
+    steps: List[Step], execute_function: Callable[[Step], None], max_parallel: int
+):
+    """
+    Execute steps concurrently while respecting their dependencies: a step only
+    starts when all the previous steps it conflicts with are completed, so that
+    the results are the same as with a sequential execution.
+    If a step fails, no new step is started and the error of the first failed step
+    (in the sequential order) is raised once the running steps are completed.
+
+    :param steps: steps in their sequential order
+    :type steps: List[Step]
+    :param execute_function: function that executes one step
+    :type execute_function: Callable[[Step], None]
+    :param max_parallel: maximum number of steps executed at the same time
+    :type max_parallel: int
+    """
+    predecessors = build_dependency_graph(steps)
+    LOGGER.info(
+        f"Executing {len(steps)} steps with up to {max_parallel} steps in parallel"
+    )
+    successors: List[Set[int]] = [set() for _ in steps]
+    for i, step_predecessors in enumerate(predecessors):
+        for j in step_predecessors:
+            successors[j].add(i)
+    n_remaining = [len(step_predecessors) for step_predecessors in predecessors]
+    ready = [i for i, n in enumerate(n_remaining) if n == 0]
+    running: Dict[Future, int] = {}
+    errors_found: Dict[int, BaseException] = {}
+
+    with ThreadPoolExecutor(
+        max_workers=max_parallel, thread_name_prefix="mxops-step"
+    ) as executor:
+        while len(ready) > 0 or len(running) > 0:
+            can_start = len(errors_found) == 0
+            while can_start and len(ready) > 0 and len(running) < max_parallel:
+                i = ready.pop(0)
+                running[
+                    executor.submit(copy_context().run, execute_function, steps[i])
+                ] = i
+            if len(running) == 0:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    errors_found[i] = error
+                    continue
+                for successor in sorted(successors[i]):
+                    n_remaining[successor] -= 1
+                    if n_remaining[successor] == 0:
+                        ready.append(successor)
+            ready.sort()
+
+    if len(errors_found) > 0:
+        raise errors_found[min(errors_found)]
+
+
+def execute_iterations_in_parallel(
+    iterations: Iterable[Any],
+    execute_function: Callable[[Any], None],
+    max_parallel: int,
+):
+    """
+    Execute independent iterations concurrently. The iterations are consumed
+    lazily, so that no more than max_parallel of them are held at the same time.
+    Each iteration is executed in a copy of the context of the caller.
+    If an iteration fails, no new iteration is started and the error of the first
+    failed iteration is raised once the running iterations are completed.
+
+    :param iterations: values to pass to the execute function
+    :type iterations: Iterable[Any]
+    :param execute_function: function that executes one iteration
+    :type execute_function: Callable[[Any], None]
+    :param max_parallel: maximum number of iterations executed at the same time
+    :type max_parallel: int
+    """
+    iterator = enumerate(iterations)
+    running: Dict[Future, int] = {}
+    errors_found: Dict[int, BaseException] = {}
+    is_exhausted = False
+
+    with ThreadPoolExecutor(
+        max_workers=max_parallel, thread_name_prefix="mxops-iteration"
+    ) as executor:
+        while True:
+            while not is_exhausted and len(errors_found) == 0:
+                if len(running) >= max_parallel:
+                    break
+                try:
+                    i, iteration = next(iterator)
+                except StopIteration:
+                    is_exhausted = True
+                    break
+                context = copy_context()
+                running[executor.submit(context.run, execute_function, iteration)] = i
+            if len(running) == 0:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    errors_found[i] = error
+
+    if len(errors_found) > 0:
+        raise errors_found[min(errors_found)]
@@ -0,0 +1,158 @@
+"""
+author: Etienne Wallet
+
+This module contains the service that signs the transactions, either in the main
+process or by batches in a pool of worker processes
+"""
+import multiprocessing
+from multiprocessing.pool import Pool
+from pathlib import Path
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from multiversx_sdk_core import Transaction, TransactionComputer
+from multiversx_sdk_wallet import UserSigner
+
+from mxops.config.config import Config
+from mxops.execution.account import AccountsManager
+from mxops.utils.logger import get_logger
+
+
+LOGGER = get_logger("signing")
+
+# signers loaded by a worker process, keyed by the path of their PEM file
+_WORKER_SIGNERS: Dict[str, UserSigner] = {}
+
+
+def sign_with_pem(pem_path: str, tx: Transaction) -> bytes:
+    """
+    Sign a transaction with the key of a PEM file. This function is the entry point
+    of the worker processes, which keep the keys they loaded.
+
+    :param pem_path: path of the PEM file of the sender
+    :type pem_path: str
+    :param tx: transaction to sign, with its nonce already assigned
+    :type tx: Transaction
+    :return: signature of the transaction
+    :rtype: bytes
+    """
+    signer = _WORKER_SIGNERS.get(pem_path)
+    if signer is None:
+        signer = UserSigner.from_pem_file(Path(pem_path))
+        _WORKER_SIGNERS[pem_path] = signer
+    return signer.sign(TransactionComputer().compute_bytes_for_signing(tx))
+
+
+class TransactionSigner:
+    """
+    This class signs the transactions of the steps. The batches of transactions
+    are signed by a pool of SIGNING_WORKERS processes, started on first use,
+    except for the accounts whose keys are not in a PEM file, such as the ledger
+    accounts, which are always signed in the main process.
+    """
+
+    _pool: Optional[Pool] = None
+    _lock = threading.Lock()
+    _n_signatures: int = 0
+    _signing_time: float = 0
+
+    @classmethod
+    def _get_pool(cls) -> Optional[Pool]:
+        """
+        Return the pool of workers, starting it if needed
+
+        :return: pool of workers, None if the signatures are made in the main process
+        :rtype: Optional[Pool]
+        """
+        n_workers = int(Config.get_config().get("SIGNING_WORKERS"))
+        if n_workers < 1:
+            return None
+        with cls._lock:
+            if cls._pool is None:
+                LOGGER.info(f"Starting {n_workers} signing workers")
+                context = multiprocessing.get_context("spawn")
+                cls._pool = context.Pool(processes=n_workers)
+            return cls._pool
+
+    @staticmethod
+    def sign(account_name: str, tx: Transaction):
+        """
+        Sign a transaction in the main process
+
+        :param account_name: name of the sender account
+        :type account_name: str
+        :param tx: transaction to sign, with its nonce already assigned
+        :type tx: Transaction
+        """
+        account = AccountsManager.get_account(account_name)
+        tx.signature = bytes.fromhex(account.sign_transaction(tx))
+
+    @classmethod
+    def sign_many(cls, transactions: List[Tuple[str, Transaction]]):
+        """
+        Sign a batch of transactions, in the workers if they are enabled
+
+        :param transactions: name of the sender account and transaction to sign,
+            with its nonce already assigned
+        :type transactions: List[Tuple[str, Transaction]]
+        """
+        if len(transactions) == 0:
+            return
+        start = time.perf_counter()
+        pool = cls._get_pool() if len(transactions) > 1 else None
+        remote_txs = []
+        for account_name, tx in transactions:
+            pem_path = AccountsManager.get_pem_path(account_name)
+            if pool is None or pem_path is None:
+                cls.sign(account_name, tx)
+            else:
+                remote_txs.append((pem_path, tx))
+        if len(remote_txs) > 0:
+            signatures = pool.starmap(sign_with_pem, remote_txs)
+            for (_, tx), signature in zip(remote_txs, signatures):
+                tx.signature = signature
+        elapsed = time.perf_counter() - start
+        with cls._lock:
+            cls._n_signatures += len(transactions)
+            cls._signing_time += elapsed
+        LOGGER.debug(
+            f"{len(transactions)} transactions signed "
+            f"({len(transactions) / max(elapsed, 1e-9):.0f} signatures/s)"
+        )
+
+    @classmethod
+    def get_signing_rate(cls) -> float:
+        """
+        Return the average number of signatures per second of the batches signed
+        so far
+
+        :return: signatures per second
+        :rtype: float
+        """
+        with cls._lock:
+            if cls._signing_time == 0:
+                return 0
+            return cls._n_signatures / cls._signing_time
+
+    @classmethod
+    def log_signing_stats(cls):
+        """
+        Log the number of transactions signed by batches and the signing rate
+        """
+        if cls._n_signatures > 0:
+            LOGGER.info(
+                f"{cls._n_signatures} transactions signed by batches "
+                f"({cls.get_signing_rate():.0f} signatures/s)"
+            )
+
+    @classmethod
+    def terminate(cls):
+        """
+        Stop the workers
+        """
+        with cls._lock:
+            if cls._pool is not None:
+                cls._pool.terminate()
+                cls._pool.join()
+                cls._pool = None
@@ -6,31 +6,34 @@ This module contains the classes used to execute scenes in a scenario
 
 from __future__ import annotations
 import base64
-from dataclasses import dataclass, field
-from importlib.util import spec_from_file_location, module_from_spec
-import os
+import csv
+from dataclasses import dataclass, field, fields, is_dataclass
+import hashlib
+from itertools import islice
+import json
 from pathlib import Path
 import sys
 import time
-from typing import Any, ClassVar, Dict, Iterator, List, Optional, Set, Union
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from multiversx_sdk_cli.contracts import QueryResult
 from multiversx_sdk_cli.constants import DEFAULT_HRP
 from multiversx_sdk_core import (
     Address,
+    AddressComputer,
     TokenComputer,
     Token,
     TokenTransfer,
     ContractQueryBuilder,
     Transaction,
 )
+from multiversx_sdk_core.constants import TRANSACTION_MIN_GAS_PRICE
 from multiversx_sdk_core.serializer import arg_to_string
 from multiversx_sdk_core.transaction_factories import (
     TransactionsFactoryConfig,
     SmartContractTransactionsFactory,
     TransferTransactionsFactory,
 )
-from multiversx_sdk_network_providers import ProxyNetworkProvider
 from multiversx_sdk_network_providers.transactions import TransactionOnNetwork
 from multiversx_sdk_network_providers.contract_query_response import (
     ContractQueryResponse,
@@ -38,7 +41,13 @@ from multiversx_sdk_network_providers.contract_query_response import (
 from mxpyserializer.abi_serializer import AbiSerializer
 
 from mxops.config.config import Config
-from mxops.data.execution_data import InternalContractData, ScenarioData, TokenData
+from mxops.data.execution_data import (
+    ContractData,
+    InternalContractData,
+    ScenarioData,
+    TokenData,
+)
+from mxops.data.serializers import load_serializer_from_abi
 from mxops.data.utils import json_dumps
 from mxops.enums import TokenTypeEnum
 from mxops.execution import utils
@@ -46,17 +55,29 @@ from mxops.execution.token_management_factory import (
     MyTokenManagementTransactionsFactory,
 )
 from mxops.execution.account import AccountsManager
+from mxops.execution.bundle import TransactionBundle
 from mxops.execution import token_management as tkm
 from mxops.execution.checks import Check, SuccessCheck, instanciate_checks
+from mxops.execution.cursor import ExecutionCursor
 from mxops.execution.msc import EsdtTransfer
-from mxops.execution.network import send, send_and_wait_for_result
+from mxops.execution.network import send, wait_for_result
+from mxops.execution.proxy import ProxyRegistry
+from mxops.execution.signing import TransactionSigner
 from mxops.execution.utils import parse_query_result
+from mxops.execution.user_modules import UserFunctionWorkers, call_user_function
 from mxops.utils.logger import get_logger
-from mxops.utils.msc import get_file_hash, get_tx_link
+from mxops.utils.artifacts import load_artifact
+from mxops.utils.msc import get_tx_link
 from mxops import errors
 
 LOGGER = get_logger("steps")
 
+# upper bounds of the transactions built by the factories, used to estimate the
+# cost of a step without building its transaction
+EGLD_TRANSFER_GAS_LIMIT = 50_000
+ESDT_TRANSFER_GAS_LIMIT = 1_000_000
+ISSUE_COST = 50_000_000_000_000_000
+
 
 @dataclass
 class Step:
@@ -64,6 +85,9 @@ class Step:
     Represents an instruction to execute within a scene
     """
 
+    PARALLELIZABLE: ClassVar[bool] = True
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ()
+
     def execute(self):
         """
         Interface for the method to execute the action described by a Step instance.
@@ -85,6 +109,32 @@ class Step:
         return cls(**data)
 
 
+def _resolve_fingerprint_value(value: Any) -> Any:
+    """
+    Resolve a parameter of a step for its fingerprint, including the fields of
+    the dataclasses it contains, such as the transfers
+
+    :param value: parameter of the step
+    :type value: Any
+    :return: resolved parameter
+    :rtype: Any
+    """
+    if is_dataclass(value) and not isinstance(value, type):
+        return {
+            data_field.name: _resolve_fingerprint_value(getattr(value, data_field.name))
+            for data_field in fields(value)
+            if data_field.init
+        }
+    if isinstance(value, (list, tuple)):
+        return [_resolve_fingerprint_value(element) for element in value]
+    if isinstance(value, dict):
+        return {
+            utils.retrieve_value_from_any(key): _resolve_fingerprint_value(element)
+            for key, element in value.items()
+        }
+    return utils.retrieve_value_from_any(value)
+
+
 @dataclass(kw_only=True)
 class TransactionStep(Step):
     """
@@ -93,6 +143,14 @@ class TransactionStep(Step):
 
     sender: str
     checks: List[Check] = field(default_factory=lambda: [SuccessCheck()])
+    fingerprint: Optional[Tuple[str, int]] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    PIPELINABLE: ClassVar[bool] = True
+    FILE_FIELDS: ClassVar[Tuple[str, ...]] = ()
+    # largest gas limit of the token management transactions
+    ESTIMATED_GAS_LIMIT: ClassVar[int] = 60_000_000
+    ESTIMATED_VALUE: ClassVar[int] = 0
 
     def __post_init__(self):
         """
@@ -107,24 +165,31 @@ class TransactionStep(Step):
         """
         Interface for the method that will build transaction to send. This transaction
         is meant to contain all the data specific to this Step.
-        The signature will be done at a later stage in the method sign_transaction
+        The nonce and the signature will be set at a later stage
 
         :return: transaction created by the Step
         :rtype: Transaction
         """
         raise NotImplementedError
 
+    def assign_nonce(self, tx: Transaction):
+        """
+        Reserve the next nonce of the sender for the transaction created by this
+        step. This waits if the sender has too many transactions in flight.
+
+        :param tx: transaction to send
+        :type tx: Transaction
+        """
+        tx.nonce = AccountsManager.get_lane(self.sender).reserve()
+
     def sign_transaction(self, tx: Transaction):
         """
-        Sign the transaction created by this step and update the account nonce
+        Sign the transaction created by this step, once its nonce is assigned
 
-        :param tx: tra
+        :param tx: transaction to sign
         :type tx: Transaction
         """
-        sender_account = AccountsManager.get_account(self.sender)
-        tx.nonce = sender_account.nonce
-        tx.signature = bytes.fromhex(sender_account.sign_transaction(tx))
-        sender_account.nonce += 1
+        TransactionSigner.sign(self.sender, tx)
 
     def _post_transaction_execution(self, on_chain_tx: TransactionOnNetwork | None):
         """
@@ -135,25 +200,153 @@ class TransactionStep(Step):
         :type on_chain_tx: TransactionOnNetwork | None
         """
 
-    def execute(self):
+    def estimate_cost(self) -> int:
         """
-        Execute the workflow for a transaction Step: build, send, check
-        and post execute
+        Estimate from the fields of this step the maximum amount of eGLD its
+        transaction can take from the sender, without building the transaction
+
+        :return: maximum cost of the transaction in eGLD atomic units
+        :rtype: int
+        """
+        gas_cost = self.ESTIMATED_GAS_LIMIT * TRANSACTION_MIN_GAS_PRICE
+        return gas_cost + self.ESTIMATED_VALUE
+
+    def build_transaction(self) -> Transaction:
+        """
+        Build the transaction of this step with the next nonce of the sender,
+        ready to be signed
+
+        :return: transaction to sign
+        :rtype: Transaction
         """
         tx = self._build_unsigned_transaction()
-        self.sign_transaction(tx)
+        self.assign_nonce(tx)
+        AccountsManager.record_transaction_cost(self.sender, tx)
+        return tx
 
-        if len(self.checks) > 0:
-            on_chain_tx = send_and_wait_for_result(tx)
+    def build_signed_transaction(self) -> Transaction:
+        """
+        Build the transaction of this step and sign it with the next nonce
+        of the sender
+
+        :return: signed transaction
+        :rtype: Transaction
+        """
+        tx = self.build_transaction()
+        try:
+            self.sign_transaction(tx)
+        except Exception:
+            self.release_transaction(tx)
+            raise
+        return tx
+
+    def release_transaction(self, tx: Transaction):
+        """
+        Free the nonce of a transaction built by this step that will not reach
+        the network and give back its cost to the wallet pools of the sender
+
+        :param tx: transaction that will not be sent
+        :type tx: Transaction
+        """
+        AccountsManager.get_lane(self.sender).release(tx.nonce)
+        AccountsManager.refund_transaction_cost(self.sender, tx)
+
+    def process_on_chain_transaction(
+        self,
+        on_chain_tx: TransactionOnNetwork | None,
+        fingerprint: Optional[Tuple[str, int]] = None,
+    ):
+        """
+        Run the checks on the on-chain transaction of this step, if any,
+        and then the post execution
+
+        :param on_chain_tx: on chain transaction that was sent by the Step
+        :type on_chain_tx: TransactionOnNetwork | None
+        :param fingerprint: fingerprint and occurrence registered for the execution
+            that sent the transaction, to record in incremental mode, defaults to None
+        :type fingerprint: Optional[Tuple[str, int]]
+        """
+        if on_chain_tx is not None:
             for check in self.checks:
                 check.raise_on_failure(on_chain_tx)
             LOGGER.info(f"Transaction successful: {get_tx_link(on_chain_tx.hash)}")
+        self._post_transaction_execution(on_chain_tx)
+        if on_chain_tx is not None and fingerprint is not None:
+            fingerprint, occurrence = fingerprint
+            ScenarioData.get().record_step_fingerprint(
+                fingerprint, occurrence, on_chain_tx.hash
+            )
+
+    def compute_fingerprint(self) -> str:
+        """
+        Compute a hash identifying the action of this step: its type, the
+        address of its sender, its resolved parameters and the content of
+        the files it uses. A wallet pool sender is identified by its name, as
+        the account sending the transaction changes between executions.
+
+        :return: fingerprint of the step
+        :rtype: str
+        """
+        if AccountsManager.get_wallet_pool(self.sender) is None:
+            sender = utils.retrieve_bech32_from_account(f"[{self.sender}]")
         else:
+            sender = self.sender
+        content = {"type": type(self).__name__, "sender": sender}
+        for data_field in fields(self):
+            if not data_field.init or data_field.name in ("sender", "checks"):
+                continue
+            value = getattr(self, data_field.name)
+            content[data_field.name] = _resolve_fingerprint_value(value)
+            if data_field.name in self.FILE_FIELDS and value is not None:
+                file_path = Path(utils.retrieve_value_from_any(value))
+                content[f"{data_field.name}_hash"] = load_artifact(file_path).sha256
+        serialized_content = json.dumps(content, sort_keys=True, default=str)
+        return hashlib.sha256(serialized_content.encode("utf-8")).hexdigest()
+
+    def execute(self):
+        """
+        Execute the workflow for a transaction Step: build, send, check
+        and post execute
+        """
+        if TransactionBundle.is_recording():
+            self.execute_sign_only()
+            return
+        lane = AccountsManager.get_lane(self.sender)
+        # the nonce lock keeps the nonces of concurrent steps ordered on the network
+        with AccountsManager.get_nonce_lock(self.sender):
+            tx = self.build_signed_transaction()
+            try:
+                tx_hash = send(tx)
+            except Exception:
+                self.release_transaction(tx)
+                raise
+            lane.register_sent(tx)
+        ExecutionCursor.record_transaction(tx_hash)
+
+        if len(self.checks) > 0:
+            on_chain_tx = wait_for_result(tx_hash)
+            lane.confirm(tx.nonce)
+        else:
+            # the transactions without checks are not followed once sent
+            lane.confirm(tx.nonce)
             on_chain_tx = None
-            send(tx)
             LOGGER.info("Transaction sent")
 
-        self._post_transaction_execution(on_chain_tx)
+        self.process_on_chain_transaction(on_chain_tx, self.fingerprint)
+
+    def execute_sign_only(self):
+        """
+        Build and sign the transaction of this step and write it to the bundle
+        instead of sending it. The checks are not evaluated, which is why only the
+        steps whose results are not needed by the next steps are supported.
+        """
+        if not self.PIPELINABLE:
+            raise errors.SignOnlyNotSupported(type(self).__name__)
+        with AccountsManager.get_nonce_lock(self.sender):
+            tx = self.build_signed_transaction()
+            TransactionBundle.add(tx)
+            AccountsManager.get_lane(self.sender).confirm(tx.nonce)
+        self.process_on_chain_transaction(None)
 
 
 @dataclass
@@ -167,6 +360,129 @@ class LoopStep(Step):
     var_start: int = None
     var_end: int = None
     var_list: List[int] = None
+    var_file: Optional[str] = None
+    parallelism: int = 1
+    chunk_size: int = 100
+    resume_key: Optional[str] = None
+    PARALLELIZABLE: ClassVar[bool] = False
+
+    def _generate_file_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read lazily the rows of the loop file, which is either a CSV file with
+        a header or a JSON Lines file with an object per line
+
+        :yield: columns values of each row
+        :rtype: Iterator[Dict[str, Any]]
+        """
+        file_path = Path(self.var_file)
+        suffix = file_path.suffix.lower()
+        if suffix not in (".csv", ".jsonl", ".ndjson"):
+            raise ValueError(f"Unsupported loop file format: {self.var_file}")
+        with open(file_path, "r", encoding="utf-8", newline="") as file:
+            if suffix == ".csv":
+                reader = csv.DictReader(file)
+                for row in reader:
+                    if None in row:
+                        raise ValueError(
+                            f"Line {reader.line_num} of {self.var_file} has more "
+                            "columns than its header"
+                        )
+                    yield row
+                return
+            for line in file:
+                if len(line.strip()) > 0:
+                    yield json.loads(line)
+
+    def generate_variables(self, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Generate the variables of each iteration, starting from a given iteration.
+        For a loop on a file, the loop variable holds the index of the row and each
+        column of the row is a variable.
+
+        :param start: index of the first iteration to generate, defaults to 0
+        :type start: int
+        :yield: variables of each iteration
+        :rtype: Iterator[Dict[str, Any]]
+        """
+        if self.var_file is not None:
+            rows = islice(self._generate_file_rows(), start, None)
+            for i, row in enumerate(rows, start):
+                yield {self.var_name: i, **row}
+            return
+        if self.var_start is not None and self.var_end is not None:
+            values = range(self.var_start, self.var_end)
+        elif self.var_list is not None:
+            values = self.var_list
+        else:
+            raise ValueError("Loop iteration is not correctly defined")
+        for var in islice(values, start, None):
+            yield {self.var_name: var}
+
+    def generate_chunks(
+        self, start: int = 0
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Generate the variables of the remaining iterations by chunks
+
+        :param start: index of the first iteration to generate if no later
+            iteration was saved under the resume key, defaults to 0
+        :type start: int
+        :yield: number of iterations completed at the end of the chunk
+            and variables of the iterations of the chunk
+        :rtype: Iterator[Tuple[int, List[Dict[str, Any]]]]
+        """
+        offset = max(self.get_resume_offset(), start)
+        iterations = self.generate_variables(offset)
+        while True:
+            chunk = list(islice(iterations, self.chunk_size))
+            if len(chunk) == 0:
+                self.save_resume_offset(0)
+                return
+            offset += len(chunk)
+            yield offset, chunk
+
+    def get_resume_offset(self) -> int:
+        """
+        Return the number of iterations completed by a previous execution,
+        as saved under the resume key
+
+        :return: number of iterations to skip
+        :rtype: int
+        """
+        if self.resume_key is None:
+            return 0
+        try:
+            return int(ScenarioData.get().get_value(self.resume_key))
+        except errors.WrongDataKeyPath:
+            return 0
+
+    def save_resume_offset(self, offset: int):
+        """
+        Save the number of completed iterations under the resume key, if any.
+        The offset is set back to 0 once the loop is completed.
+
+        :param offset: number of completed iterations
+        :type offset: int
+        """
+        if self.resume_key is not None:
+            ScenarioData.get().set_value(self.resume_key, offset)
+
+    def generate_indexed_steps(self, start: int = 0) -> Iterator[Tuple[int, int, Step]]:
+        """
+        Generate the steps that should be executed along with their position
+
+        :param start: index of the first iteration to generate if no later
+            iteration was saved under the resume key, defaults to 0
+        :type start: int
+        :yield: index of the iteration, index of the step in the loop and step
+        :rtype: Iterator[Tuple[int, int, Step]]
+        """
+        offset = max(self.get_resume_offset(), start)
+        for iteration, variables in enumerate(self.generate_variables(offset), offset):
+            for var_name, value in variables.items():
+                utils.set_variable(var_name, str(value))
+            for i, step in enumerate(self.steps):
+                yield iteration, i, step
 
     def generate_steps(self) -> Iterator[Step]:
         """
@@ -175,16 +491,8 @@ class LoopStep(Step):
         :yield: steps to be executed
         :rtype: Iterator[Step]
         """
-        if self.var_start is not None and self.var_end is not None:
-            iterator = range(self.var_start, self.var_end)
-        elif self.var_list is not None:
-            iterator = self.var_list
-        else:
-            raise ValueError("Loop iteration is not correctly defined")
-        for var in iterator:
-            os.environ[self.var_name] = str(var)
-            for step in self.steps:
-                yield step
+        for _, _, step in self.generate_indexed_steps():
+            yield step
 
     def execute(self):
         """
@@ -218,6 +526,78 @@ class ContractDeployStep(TransactionStep):
     payable: bool = False
     payable_by_sc: bool = False
     arguments: List = field(default_factory=list)
+    compiled_arguments: Optional[utils.ArgumentTemplate] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("contract_id",)
+    FILE_FIELDS: ClassVar[Tuple[str, ...]] = ("wasm_path", "abi_path")
+
+    def __post_init__(self):
+        """
+        After the initialisation of an instance, compile the arguments so that
+        only their dynamic parts are evaluated at each execution
+        """
+        super().__post_init__()
+        self.compiled_arguments = utils.compile_argument(self.arguments)
+
+    def get_bytecode(self) -> bytes:
+        """
+        Return the code of the contract to deploy
+
+        :return: bytecode of the contract
+        :rtype: bytes
+        """
+        return load_artifact(Path(self.wasm_path)).content
+
+    def get_wasm_hash(self) -> str:
+        """
+        Return the hash of the code of the contract to deploy, as saved in the
+        Scenario
+
+        :return: sha256 hash of the bytecode
+        :rtype: str
+        """
+        return load_artifact(Path(self.wasm_path)).sha256
+
+    def get_serializer(self) -> Optional[AbiSerializer]:
+        """
+        Return the serializer of the contract to deploy, if an ABI was provided
+
+        :return: serializer of the contract
+        :rtype: Optional[AbiSerializer]
+        """
+        if self.abi_path is None:
+            return None
+        return load_serializer_from_abi(Path(self.abi_path))
+
+    def estimate_cost(self) -> int:
+        """
+        Estimate the maximum cost of the transaction from the gas limit of the step
+
+        :return: maximum cost of the transaction in eGLD atomic units
+        :rtype: int
+        """
+        return self.gas_limit * TRANSACTION_MIN_GAS_PRICE
+
+    def _is_abandoned_deployment(self, contract_data: ContractData) -> bool:
+        """
+        Tell if a contract registered under the id of this step comes from a
+        deployment that was signed but never executed, for example because the
+        process stopped before sending it. This is the case when the contract would
+        be deployed by the next nonce of the sender.
+
+        :param contract_data: contract registered under the id of this step
+        :type contract_data: ContractData
+        :return: if the registered contract can be discarded
+        :rtype: bool
+        """
+        if not isinstance(contract_data, InternalContractData):
+            return False
+        next_nonce = AccountsManager.get_account(self.sender).nonce
+        next_address = AddressComputer().compute_contract_address(
+            utils.get_address_instance(self.sender), next_nonce
+        )
+        return contract_data.address == next_address.bech32()
 
     def _build_unsigned_transaction(self) -> Transaction:
         """
@@ -230,18 +610,18 @@ class ContractDeployStep(TransactionStep):
         scenario_data = ScenarioData.get()
 
         # check that the id of the contract is free
-        try:
-            scenario_data.get_contract_value(self.contract_id, "address")
-            raise errors.ContractIdAlreadyExists(self.contract_id)
-        except errors.UnknownContract:
-            pass
-
-        if self.abi_path is not None:
-            serializer = AbiSerializer.from_abi(Path(self.abi_path))
-        else:
-            serializer = None
+        contract_data = scenario_data.contracts_data.get(self.contract_id)
+        if contract_data is not None:
+            if not self._is_abandoned_deployment(contract_data):
+                raise errors.ContractIdAlreadyExists(self.contract_id)
+            LOGGER.warning(
+                f"The previous deployment of {self.contract_id} never reached the "
+                "network, its registration is discarded"
+            )
+            scenario_data.remove_contract_data(self.contract_id)
 
-        retrieved_arguments = utils.retrieve_value_from_any(self.arguments)
+        serializer = self.get_serializer()
+        retrieved_arguments = self.compiled_arguments.resolve()
         if serializer is None:
             deploy_args = utils.format_tx_arguments(retrieved_arguments)
         else:
@@ -249,7 +629,7 @@ class ContractDeployStep(TransactionStep):
 
         factory_config = TransactionsFactoryConfig(Config.get_config().get("CHAIN"))
         sc_factory = SmartContractTransactionsFactory(factory_config, TokenComputer())
-        bytecode = Path(self.wasm_path).read_bytes()
+        bytecode = self.get_bytecode()
 
         return sc_factory.create_transaction_for_deploy(
             sender=utils.get_address_instance(self.sender),
@@ -262,15 +642,95 @@ class ContractDeployStep(TransactionStep):
             is_payable_by_sc=self.payable_by_sc,
         )
 
+    def build_transaction(self) -> Transaction:
+        """
+        Build the deploy transaction, then register the contract in the
+        Scenario with its address, computed from the sender and the nonce of the
+        transaction. This allows the next steps to use the contract without
+        waiting for the deployment to be completed.
+
+        :return: transaction to sign
+        :rtype: Transaction
+        """
+        tx = super().build_transaction()
+        contract_address = AddressComputer().compute_contract_address(
+            utils.get_address_instance(self.sender), tx.nonce
+        )
+        LOGGER.info(
+            f"Contract {self.contract_id} will be deployed at "
+            f"{contract_address.bech32()}"
+        )
+        current_time = int(time.time())
+        contract_data = InternalContractData(
+            contract_id=self.contract_id,
+            address=contract_address.bech32(),
+            saved_values={},
+            wasm_hash=self.get_wasm_hash(),
+            deploy_time=current_time,
+            last_upgrade_time=current_time,
+            serializer=self.get_serializer(),
+        )
+        try:
+            ScenarioData.get().add_contract_data(contract_data)
+        except Exception:
+            super().release_transaction(tx)
+            raise
+        return tx
+
+    def release_transaction(self, tx: Transaction):
+        """
+        Free the nonce of the deploy transaction and remove the contract
+        registered for it, as the deployment will not happen
+
+        :param tx: transaction that will not be sent
+        :type tx: Transaction
+        """
+        super().release_transaction(tx)
+        scenario_data = ScenarioData.get()
+        contract_data = scenario_data.contracts_data.get(self.contract_id)
+        contract_address = AddressComputer().compute_contract_address(
+            utils.get_address_instance(self.sender), tx.nonce
+        )
+        if (
+            isinstance(contract_data, InternalContractData)
+            and contract_data.address == contract_address.bech32()
+        ):
+            scenario_data.remove_contract_data(self.contract_id)
+
+    def process_on_chain_transaction(
+        self,
+        on_chain_tx: TransactionOnNetwork | None,
+        fingerprint: Optional[Tuple[str, int]] = None,
+    ):
+        """
+        Process the deploy transaction and remove the contract registered at
+        signing time if the deployment failed
+
+        :param on_chain_tx: on chain transaction that was sent by the Step
+        :type on_chain_tx: TransactionOnNetwork | None
+        :param fingerprint: fingerprint and occurrence registered for the execution
+            that sent the transaction, to record in incremental mode, defaults to None
+        :type fingerprint: Optional[Tuple[str, int]]
+        """
+        try:
+            super().process_on_chain_transaction(on_chain_tx, fingerprint)
+        except Exception:
+            scenario_data = ScenarioData.get()
+            if self.contract_id in scenario_data.contracts_data:
+                scenario_data.remove_contract_data(self.contract_id)
+            raise
+
     def _post_transaction_execution(self, on_chain_tx: TransactionOnNetwork | None):
         """
-        Save the new contract data in the Scenario
+        Check the address of the new contract and save its deployment time.
+        If the result of the transaction was not awaited, the data registered
+        at signing time is kept as is.
 
         :param on_chain_tx: successful deployment transaction
         :type on_chain_tx: TransactionOnNetwork | None
         """
-        if not isinstance(on_chain_tx, TransactionOnNetwork):
-            raise ValueError("On chain transaction is None")
+        if on_chain_tx is None:
+            return
 
         scenario_data = ScenarioData.get()
         contract_address = None
@@ -282,21 +742,137 @@ class ContractDeployStep(TransactionStep):
         if not isinstance(contract_address, Address):
             raise errors.ParsingError(on_chain_tx, "contract deployment address")
 
+        expected_address = scenario_data.get_contract_value(self.contract_id, "address")
+        if contract_address.bech32() != expected_address:
+            raise errors.ContractAddressMismatch(
+                self.contract_id, expected_address, contract_address.bech32()
+            )
+        for value_key in ("deploy_time", "last_upgrade_time"):
+            scenario_data.set_contract_value(
+                self.contract_id, value_key, on_chain_tx.timestamp
+            )
+
+
+@dataclass(kw_only=True)
+class ContractDeployFromSourceStep(ContractDeployStep):
+    """
+    Represents the deployment of a new contract with the code of a contract
+    already deployed on the network
+    """
+
+    source_contract: str
+    wasm_path: Optional[str] = None
+    source_code: Optional[bytes] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    FILE_FIELDS: ClassVar[Tuple[str, ...]] = ("abi_path",)
+
+    def get_bytecode(self) -> bytes:
+        """
+        Return the code of the source contract, fetched from the network
+        on first use
+
+        :return: bytecode of the contract
+        :rtype: bytes
+        """
+        if self.source_code is None:
+            address = utils.get_address_instance(self.source_contract)
+            account = ProxyRegistry.get_proxy().get_account(address)
+            if len(account.code) == 0:
+                raise errors.MissingSourceCode(self.source_contract)
+            self.source_code = account.code
+        return self.source_code
+
+    def get_wasm_hash(self) -> str:
+        """
+        Return the hash of the code of the source contract
+
+        :return: sha256 hash of the bytecode
+        :rtype: str
+        """
+        return hashlib.sha256(self.get_bytecode()).hexdigest()
+
+    def get_serializer(self) -> Optional[AbiSerializer]:
+        """
+        Return the serializer of the contract to deploy: the one of the provided
+        ABI or else the one of the source contract, if it is known by the Scenario
+
+        :return: serializer of the contract
+        :rtype: Optional[AbiSerializer]
+        """
         if self.abi_path is not None:
-            serializer = AbiSerializer.from_abi(Path(self.abi_path))
-        else:
-            serializer = None
+            return super().get_serializer()
+        source_data = ScenarioData.get().contracts_data.get(self.source_contract)
+        if source_data is None:
+            return None
+        return source_data.serializer
 
-        contract_data = InternalContractData(
-            contract_id=self.contract_id,
-            address=contract_address.bech32(),
-            saved_values={},
-            wasm_hash=get_file_hash(Path(self.wasm_path)),
-            deploy_time=on_chain_tx.timestamp,
-            last_upgrade_time=on_chain_tx.timestamp,
-            serializer=serializer,
+
+@dataclass
+class ContractDeployFromSourceBatchStep(Step):
+    """
+    Represents the deployment of several contracts with the code of a contract
+    already deployed on the network. The transactions are sent in a single burst.
+    """
+
+    sender: str
+    source_contract: str
+    contract_ids: List[str]
+    gas_limit: int
+    abi_path: Optional[str] = None
+    upgradeable: bool = True
+    readable: bool = True
+    payable: bool = False
+    payable_by_sc: bool = False
+    arguments: List = field(default_factory=list)
+    checks: List[Check] = field(default_factory=lambda: [SuccessCheck()])
+    PARALLELIZABLE: ClassVar[bool] = False
+
+    def generate_steps(self) -> Iterator[ContractDeployFromSourceStep]:
+        """
+        Generate the deployment step of each contract. The code of the source
+        contract is fetched once and shared by all the steps.
+
+        :yield: deployment steps
+        :rtype: Iterator[ContractDeployFromSourceStep]
+        """
+        source_code = None
+        for contract_id in self.contract_ids:
+            step = ContractDeployFromSourceStep(
+                sender=self.sender,
+                checks=self.checks,
+                source_contract=self.source_contract,
+                contract_id=contract_id,
+                gas_limit=self.gas_limit,
+                abi_path=self.abi_path,
+                upgradeable=self.upgradeable,
+                readable=self.readable,
+                payable=self.payable,
+                payable_by_sc=self.payable_by_sc,
+                arguments=self.arguments,
+            )
+            if source_code is None:
+                source_code = step.get_bytecode()
+            step.source_code = source_code
+            yield step
+
+    def execute(self):
+        """
+        Does nothing and should not be called. It is still implemented to avoid the
+        warning W0622.
+        """
+        LOGGER.warning(
+            "The execute function of a ContractDeployFromSourceBatchStep was called"
         )
-        scenario_data.add_contract_data(contract_data)
+
+    def __post_init__(self):
+        """
+        After the initialisation of an instance, if the checks are
+        found to be Dict, will try to convert them to Checks instances.
+        Usefull for easy loading from yaml files
+        """
+        if len(self.checks) > 0 and isinstance(self.checks[0], Dict):
+            self.checks = instanciate_checks(self.checks)
 
 
 @dataclass
@@ -315,6 +891,67 @@ class ContractUpgradeStep(TransactionStep):
     payable_by_sc: bool = False
     arguments: List = field(default_factory=lambda: [])
     abi_path: Optional[str] = None
+    skip_if_unchanged: bool = False
+    compiled_arguments: Optional[utils.ArgumentTemplate] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    PIPELINABLE: ClassVar[bool] = False
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("contract",)
+    FILE_FIELDS: ClassVar[Tuple[str, ...]] = ("wasm_path", "abi_path")
+
+    def __post_init__(self):
+        """
+        After the initialisation of an instance, compile the arguments so that
+        only their dynamic parts are evaluated at each execution
+        """
+        super().__post_init__()
+        self.compiled_arguments = utils.compile_argument(self.arguments)
+
+    def estimate_cost(self) -> int:
+        """
+        Estimate the maximum cost of the transaction from the gas limit of the step
+
+        :return: maximum cost of the transaction in eGLD atomic units
+        :rtype: int
+        """
+        return self.gas_limit * TRANSACTION_MIN_GAS_PRICE
+
+    def is_code_unchanged(self) -> bool:
+        """
+        Indicate if the contract already runs the local wasm file. The hash of the
+        wasm file is first compared to the one saved in the scenario, which avoids
+        a request when they differ, and then to the code hash of the contract
+        on chain.
+
+        :return: if the upgrade would not change the code of the contract
+        :rtype: bool
+        """
+        artifact = load_artifact(Path(self.wasm_path))
+        contract_data = ScenarioData.get().contracts_data.get(self.contract)
+        if isinstance(contract_data, InternalContractData):
+            if contract_data.wasm_hash != artifact.sha256:
+                LOGGER.info(f"The wasm of {self.contract} differs from the saved one")
+                return False
+        proxy = ProxyRegistry.get_proxy()
+        account = proxy.get_account(utils.get_address_instance(self.contract))
+        on_chain_code_hash = base64.b64decode(account.code_hash).hex()
+        if on_chain_code_hash != artifact.code_hash:
+            LOGGER.info(f"The code of {self.contract} on chain differs from the wasm")
+            return False
+        return True
+
+    def execute(self):
+        """
+        Execute the upgrade, unless it would not change the code of the contract
+        and the step allows to skip it
+        """
+        if self.skip_if_unchanged and self.is_code_unchanged():
+            LOGGER.info(
+                f"Upgrade of {self.contract} skipped: the contract already runs "
+                f"{self.wasm_path}"
+            )
+            return
+        super().execute()
 
     def _build_unsigned_transaction(self) -> Transaction:
         """
@@ -326,11 +963,11 @@ class ContractUpgradeStep(TransactionStep):
         LOGGER.info(f"Upgrading contract {self.contract}")
 
         if self.abi_path is not None:
-            serializer = AbiSerializer.from_abi(Path(self.abi_path))
+            serializer = load_serializer_from_abi(Path(self.abi_path))
         else:
             serializer = None
 
-        retrieved_arguments = utils.retrieve_value_from_any(self.arguments)
+        retrieved_arguments = self.compiled_arguments.resolve()
         if serializer is None:
             upgrade_args = utils.format_tx_arguments(retrieved_arguments)
         else:
@@ -340,7 +977,7 @@ class ContractUpgradeStep(TransactionStep):
 
         factory_config = TransactionsFactoryConfig(Config.get_config().get("CHAIN"))
         sc_factory = SmartContractTransactionsFactory(factory_config, TokenComputer())
-        bytecode = Path(self.wasm_path).read_bytes()
+        bytecode = load_artifact(Path(self.wasm_path)).content
 
         return sc_factory.create_transaction_for_upgrade(
             sender=utils.get_address_instance(self.sender),
@@ -365,7 +1002,7 @@ class ContractUpgradeStep(TransactionStep):
             raise ValueError("On chain transaction is None")
 
         if self.abi_path is not None:
-            serializer = AbiSerializer.from_abi(Path(self.abi_path))
+            serializer = load_serializer_from_abi(Path(self.abi_path))
         else:
             serializer = None
 
@@ -374,6 +1011,14 @@ class ContractUpgradeStep(TransactionStep):
             scenario_data.set_contract_value(
                 self.contract, "last_upgrade_time", on_chain_tx.timestamp
             )
+            if isinstance(
+                scenario_data.contracts_data[self.contract], InternalContractData
+            ):
+                scenario_data.set_contract_value(
+                    self.contract,
+                    "wasm_hash",
+                    load_artifact(Path(self.wasm_path)).sha256,
+                )
             if serializer is not None:
                 scenario_data.set_contract_value(
                     self.contract, "serializer", serializer
@@ -394,6 +1039,27 @@ class ContractCallStep(TransactionStep):
     arguments: List = field(default_factory=lambda: [])
     value: int | str = 0
     esdt_transfers: List[EsdtTransfer] = field(default_factory=lambda: [])
+    compiled_arguments: Optional[utils.ArgumentTemplate] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    compiled_value: Optional[utils.ArgumentTemplate] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    compiled_transfers: Optional[List[Tuple[utils.ArgumentTemplate, ...]]] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("contract",)
+
+    def estimate_cost(self) -> int:
+        """
+        Estimate the maximum cost of the transaction from the gas limit and the
+        value of the step
+
+        :return: maximum cost of the transaction in eGLD atomic units
+        :rtype: int
+        """
+        value = int(self.compiled_value.resolve())
+        return self.gas_limit * TRANSACTION_MIN_GAS_PRICE + value
 
     def _build_unsigned_transaction(self) -> Transaction:
         """
@@ -405,7 +1071,7 @@ class ContractCallStep(TransactionStep):
         LOGGER.info(f"Calling {self.endpoint} for {self.contract}")
         scenario_data = ScenarioData.get()
 
-        retrieved_arguments = utils.retrieve_value_from_any(self.arguments)
+        retrieved_arguments = self.compiled_arguments.resolve()
         try:
             serializer = scenario_data.get_contract_value(self.contract, "serializer")
         except errors.UnknownContract:
@@ -420,15 +1086,11 @@ class ContractCallStep(TransactionStep):
 
         esdt_transfers = [
             TokenTransfer(
-                Token(
-                    utils.retrieve_value_from_string(trf.token_identifier),
-                    utils.retrieve_value_from_any(trf.nonce),
-                ),
-                utils.retrieve_value_from_any(trf.amount),
+                Token(token_identifier.resolve(), nonce.resolve()), amount.resolve()
             )
-            for trf in self.esdt_transfers
+            for token_identifier, nonce, amount in self.compiled_transfers
         ]
-        value = utils.retrieve_value_from_any(self.value)
+        value = self.compiled_value.resolve()
 
         factory_config = TransactionsFactoryConfig(Config.get_config().get("CHAIN"))
         sc_factory = SmartContractTransactionsFactory(factory_config, TokenComputer())
@@ -448,7 +1110,8 @@ class ContractCallStep(TransactionStep):
         After the initialisation of an instance, if the esdt transfers are
         found to be Dict,
         will try to convert them to EsdtTransfers instances.
-        Usefull for easy loading from yaml files
+        Usefull for easy loading from yaml files.
+        The arguments, the value and the transfers are then compiled.
         """
         super().__post_init__()
         checked_transfers = []
@@ -460,6 +1123,16 @@ class ContractCallStep(TransactionStep):
             else:
                 raise ValueError(f"Unexpected type: {type(trf)}")
         self.esdt_transfers = checked_transfers
+        self.compiled_arguments = utils.compile_argument(self.arguments)
+        self.compiled_value = utils.compile_argument(self.value)
+        self.compiled_transfers = [
+            (
+                utils.compile_argument(trf.token_identifier),
+                utils.compile_argument(trf.nonce),
+                utils.compile_argument(trf.amount),
+            )
+            for trf in self.esdt_transfers
+        ]
 
 
 @dataclass
@@ -518,13 +1191,18 @@ class ContractQueryStep(Step):
     saved_results: List[Any] | None = field(init=False, default=None)
     results_save_keys: Optional[ResultsSaveKeys] = field(default=None)
     results_types: Union[None, List[Dict]] = field(default=None)
+    compiled_arguments: Optional[utils.ArgumentTemplate] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("contract",)
 
     def __post_init__(self):
         """
         After the initialisation of an instance, if the esdt transfers are
         found to be Dict,
         will try to convert them to EsdtTransfers instances.
-        Usefull for easy loading from yaml files
+        Usefull for easy loading from yaml files.
+        The arguments are then compiled.
         """
         if self.results_save_keys is not None and not isinstance(
             self.results_save_keys, ResultsSaveKeys
@@ -538,6 +1216,7 @@ class ContractQueryStep(Step):
                     raise errors.InvalidQueryResultsDefinition
                 if "type" not in result_type:
                     raise errors.InvalidQueryResultsDefinition
+        self.compiled_arguments = utils.compile_argument(self.arguments)
 
     def _interpret_return_data(self, data: str) -> QueryResult:
         """
@@ -602,9 +1281,8 @@ class ContractQueryStep(Step):
         Execute a query and optionally save the result
         """
         LOGGER.info(f"Query on {self.endpoint} for {self.contract}")
-        config = Config.get_config()
         scenario_data = ScenarioData.get()
-        retrieved_arguments = utils.retrieve_value_from_any(self.arguments)
+        retrieved_arguments = self.compiled_arguments.resolve()
         try:
             serializer = scenario_data.get_contract_value(self.contract, "serializer")
         except errors.UnknownContract:
@@ -623,7 +1301,7 @@ class ContractQueryStep(Step):
             call_arguments=query_args,
         )
         query = builder.build()
-        proxy = ProxyNetworkProvider(config.get("PROXY"))
+        proxy = ProxyRegistry.get_proxy()
 
         query_failed = True
         n_attempts = 0
@@ -703,6 +1381,9 @@ class FungibleIssueStep(TransactionStep):
     can_change_owner: bool = False
     can_upgrade: bool = False
     can_add_special_roles: bool = False
+    PIPELINABLE: ClassVar[bool] = False
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("token_name",)
+    ESTIMATED_VALUE: ClassVar[int] = ISSUE_COST
 
     def _build_unsigned_transaction(self) -> Transaction:
         """
@@ -776,6 +1457,9 @@ class NonFungibleIssueStep(TransactionStep):
     can_upgrade: bool = False
     can_add_special_roles: bool = False
     can_transfer_nft_create_role: bool = False
+    PIPELINABLE: ClassVar[bool] = False
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("token_name",)
+    ESTIMATED_VALUE: ClassVar[int] = ISSUE_COST
 
     def _build_unsigned_transaction(self) -> Transaction:
         """
@@ -842,6 +1526,9 @@ class SemiFungibleIssueStep(TransactionStep):
     can_upgrade: bool = False
     can_add_special_roles: bool = False
     can_transfer_nft_create_role: bool = False
+    PIPELINABLE: ClassVar[bool] = False
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("token_name",)
+    ESTIMATED_VALUE: ClassVar[int] = ISSUE_COST
 
     def _build_unsigned_transaction(self) -> Transaction:
         """
@@ -909,6 +1596,9 @@ class MetaIssueStep(TransactionStep):
     can_upgrade: bool = False
     can_add_special_roles: bool = False
     can_transfer_nft_create_role: bool = False
+    PIPELINABLE: ClassVar[bool] = False
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("token_name",)
+    ESTIMATED_VALUE: ClassVar[int] = ISSUE_COST
 
     def _build_unsigned_transaction(self) -> Transaction:
         """
@@ -973,6 +1663,7 @@ class ManageTokenRolesStep(TransactionStep):
     target: str
     roles: List[str]
     ALLOWED_ROLES: ClassVar[Set] = set()
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("token_identifier", "target")
 
     def __post_init__(self):
         super().__post_init__()
@@ -1157,6 +1848,8 @@ class FungibleMintStep(TransactionStep):
 
     token_identifier: str
     amount: Union[str, int]
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("token_identifier",)
+    ESTIMATED_GAS_LIMIT: ClassVar[int] = ESDT_TRANSFER_GAS_LIMIT
 
     def _build_unsigned_transaction(self) -> Transaction:
         """
@@ -1193,6 +1886,7 @@ class NonFungibleMintStep(TransactionStep):
     hash: str = ""
     attributes: str = ""
     uris: List[str] = field(default_factory=lambda: [])
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("token_identifier",)
 
     def _build_unsigned_transaction(self) -> Transaction:
         """
@@ -1245,6 +1939,17 @@ class EgldTransferStep(TransactionStep):
 
     receiver: str
     amount: Union[str, int]
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("receiver",)
+
+    def estimate_cost(self) -> int:
+        """
+        Estimate the maximum cost of the transaction from the amount to send
+
+        :return: maximum cost of the transaction in eGLD atomic units
+        :rtype: int
+        """
+        amount = int(utils.retrieve_value_from_any(self.amount))
+        return EGLD_TRANSFER_GAS_LIMIT * TRANSACTION_MIN_GAS_PRICE + amount
 
     def _build_unsigned_transaction(self) -> Transaction:
         """
@@ -1279,6 +1984,8 @@ class FungibleTransferStep(TransactionStep):
     receiver: str
     token_identifier: str
     amount: Union[str, int]
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("receiver",)
+    ESTIMATED_GAS_LIMIT: ClassVar[int] = ESDT_TRANSFER_GAS_LIMIT
 
     def _build_unsigned_transaction(self) -> Transaction:
         """
@@ -1317,6 +2024,8 @@ class NonFungibleTransferStep(TransactionStep):
     token_identifier: str
     nonce: Union[str, int]
     amount: Union[str, int]
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("receiver",)
+    ESTIMATED_GAS_LIMIT: ClassVar[int] = ESDT_TRANSFER_GAS_LIMIT
 
     def _build_unsigned_transaction(self) -> Transaction:
         """
@@ -1355,6 +2064,7 @@ class MultiTransfersStep(TransactionStep):
 
     receiver: str
     transfers: List[EsdtTransfer]
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("receiver",)
 
     def __post_init__(self):
         """
@@ -1374,6 +2084,16 @@ class MultiTransfersStep(TransactionStep):
                 raise ValueError(f"Unexpected type: {type(trf)}")
         self.transfers = checked_transfers
 
+    def estimate_cost(self) -> int:
+        """
+        Estimate the maximum cost of the transaction from the number of transfers
+
+        :return: maximum cost of the transaction in eGLD atomic units
+        :rtype: int
+        """
+        gas_limit = ESDT_TRANSFER_GAS_LIMIT * max(len(self.transfers), 1)
+        return gas_limit * TRANSACTION_MIN_GAS_PRICE
+
     def _build_unsigned_transaction(self) -> Transaction:
         """
         Build the transaction for multiple transfers
@@ -1418,34 +2138,69 @@ class PythonStep(Step):
     function: str
     arguments: list = field(default_factory=list)
     keyword_arguments: dict = field(default_factory=dict)
+    in_worker: bool = False
+    WRITTEN_FIELDS: ClassVar[Tuple[str, ...]] = ("result_variable",)
+
+    @property
+    def PARALLELIZABLE(self) -> bool:  # pylint: disable=invalid-name
+        """
+        Functions executed in a worker process can not modify the state of MxOps
+        and can therefore run alongside the other steps
+
+        :return: if the step can be executed concurrently with other steps
+        :rtype: bool
+        """
+        return self.in_worker
+
+    @property
+    def result_variable(self) -> str:
+        """
+        Return the environment variable under which the result is saved
+
+        :return: name of the variable, prefixed with the $ sign
+        :rtype: str
+        """
+        return f"$MXOPS_{self.function.upper()}_RESULT"
 
     def execute(self):
         """
         Execute the specified function
         """
-        module_path = Path(self.module_path)
-        module_name = module_path.stem
+        module_name = Path(self.module_path).stem
         LOGGER.info(
             f"Executing python function {self.function} from user module {module_name}"
         )
-
-        # load module and function
-        spec = spec_from_file_location(module_name, module_path.as_posix())
-        user_module = module_from_spec(spec)
-        spec.loader.exec_module(user_module)
-        user_function = getattr(user_module, self.function)
+        hot_reload = Config.get_config().get("PYTHON_STEP_HOT_RELOAD").lower() in (
+            "true",
+            "yes",
+            "1",
+        )
 
         # transform args and kwargs and execute
         retrieved_arguments = utils.retrieve_value_from_any(self.arguments)
         retrieved_keyword_arguments = utils.retrieve_value_from_any(
             self.keyword_arguments
         )
-        result = user_function(*retrieved_arguments, **retrieved_keyword_arguments)
+        if self.in_worker:
+            result = UserFunctionWorkers.run(
+                self.module_path,
+                self.function,
+                retrieved_arguments,
+                retrieved_keyword_arguments,
+                hot_reload,
+            )
+        else:
+            result = call_user_function(
+                self.module_path,
+                self.function,
+                retrieved_arguments,
+                retrieved_keyword_arguments,
+                hot_reload,
+            )
 
         if result:
             if isinstance(result, str):
-                var_name = f"MXOPS_{self.function.upper()}_RESULT"
-                os.environ[var_name] = result
+                utils.set_variable(self.result_variable[1:], result)
             else:
                 LOGGER.warning(
                     f"The result of the function {self.function} is not a "
@@ -1463,6 +2218,7 @@ class SceneStep(Step):
     """
 
     scene_path: str
+    PARALLELIZABLE: ClassVar[bool] = False
 
     def execute(self):
         """
@@ -0,0 +1,182 @@
+"""
+author: Etienne Wallet
+
+This module contains the cache of the user python modules and the worker processes
+used to execute the user functions outside of the main process
+"""
+from importlib.util import module_from_spec, spec_from_file_location
+import multiprocessing
+from multiprocessing.pool import Pool
+import os
+from pathlib import Path
+import threading
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+
+from mxops.config.config import Config
+from mxops import errors
+from mxops.utils.logger import get_logger
+
+
+LOGGER = get_logger("user modules")
+
+# loaded modules and the modification time of their file, keyed by resolved path
+_MODULES: Dict[Path, Tuple[int, ModuleType]] = {}
+_MODULES_LOCK = threading.Lock()
+_LOADING_LOCK = threading.RLock()
+
+
+def load_user_module(module_path: Path, hot_reload: bool = True) -> ModuleType:
+    """
+    Return the module of a python file. A module is executed only once per process
+    and is then reused, so that the state it builds at import time is kept.
+    If hot_reload is True, the module is executed again when its file was modified.
+
+    :param module_path: path of the python file
+    :type module_path: Path
+    :param hot_reload: if the modifications of the file should be reloaded,
+        defaults to True
+    :type hot_reload: bool
+    :return: module of the file
+    :rtype: ModuleType
+    """
+    module_path = Path(module_path)
+    cache_key = module_path.resolve()
+    with _MODULES_LOCK:
+        cached = _MODULES.get(cache_key)
+    if cached is not None and not hot_reload:
+        return cached[1]
+    mtime_ns = os.stat(cache_key).st_mtime_ns
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    # concurrent steps must not execute the same module twice
+    with _LOADING_LOCK:
+        with _MODULES_LOCK:
+            cached = _MODULES.get(cache_key)
+        if cached is not None and (not hot_reload or cached[0] == mtime_ns):
+            return cached[1]
+        if cached is not None:
+            LOGGER.info(f"Reloading the modified user module {module_path.stem}")
+
+        spec = spec_from_file_location(module_path.stem, module_path.as_posix())
+        user_module = module_from_spec(spec)
+        spec.loader.exec_module(user_module)
+        with _MODULES_LOCK:
+            _MODULES[cache_key] = (mtime_ns, user_module)
+    return user_module
+
+
+def clear_user_modules_cache():
+    """
+    Forget all the loaded user modules
+    """
+    with _MODULES_LOCK:
+        _MODULES.clear()
+
+
+def call_user_function(
+    module_path: str,
+    function: str,
+    arguments: List,
+    keyword_arguments: Dict,
+    hot_reload: bool = True,
+) -> Any:
+    """
+    Execute a function of a user module. This function is also the entry point
+    of the worker processes.
+
+    :param module_path: path of the python file of the user module
+    :type module_path: str
+    :param function: name of the function to execute
+    :type function: str
+    :param arguments: positional arguments of the function
+    :type arguments: List
+    :param keyword_arguments: keyword arguments of the function
+    :type keyword_arguments: Dict
+    :param hot_reload: if the modifications of the module should be reloaded,
+        defaults to True
+    :type hot_reload: bool
+    :return: result of the function
+    :rtype: Any
+    """
+    user_module = load_user_module(Path(module_path), hot_reload)
+    user_function = getattr(user_module, function)
+    return user_function(*arguments, **keyword_arguments)
+
+
+class UserFunctionWorkers:
+    """
+    This class holds the pool of processes that execute the user functions of the
+    python steps in worker mode. The processes are started on first use and kept
+    for the whole execution, so that the user modules are imported once per worker.
+    """
+
+    _pool: Optional[Pool] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_pool(cls) -> Pool:
+        """
+        Return the pool of workers, starting it if needed
+
+        :return: pool of workers
+        :rtype: Pool
+        """
+        with cls._lock:
+            if cls._pool is None:
+                n_workers = int(Config.get_config().get("PYTHON_STEP_WORKERS"))
+                LOGGER.info(f"Starting {n_workers} python step workers")
+                context = multiprocessing.get_context("spawn")
+                cls._pool = context.Pool(processes=n_workers)
+            return cls._pool
+
+    @classmethod
+    def run(
+        cls,
+        module_path: str,
+        function: str,
+        arguments: List,
+        keyword_arguments: Dict,
+        hot_reload: bool = True,
+    ) -> Any:
+        """
+        Execute a user function in a worker process and wait for its result.
+        If the function exceeds the timeout set in the config, the workers are
+        terminated and will be restarted on next use.
+
+        :param module_path: path of the python file of the user module
+        :type module_path: str
+        :param function: name of the function to execute
+        :type function: str
+        :param arguments: positional arguments of the function
+        :type arguments: List
+        :param keyword_arguments: keyword arguments of the function
+        :type keyword_arguments: Dict
+        :param hot_reload: if the modifications of the module should be reloaded,
+            defaults to True
+        :type hot_reload: bool
+        :return: result of the function
+        :rtype: Any
+        """
+        timeout = float(Config.get_config().get("PYTHON_STEP_TIMEOUT"))
+        async_result = cls._get_pool().apply_async(
+            call_user_function,
+            (module_path, function, arguments, keyword_arguments, hot_reload),
+        )
+        try:
+            return async_result.get(timeout=timeout)
+        except multiprocessing.TimeoutError as err:
+            cls.terminate()
+            raise errors.PythonFunctionTimeout(function, timeout) from err
+
+    @classmethod
+    def terminate(cls):
+        """
+        Stop the workers, interrupting the functions being executed
+        """
+        with cls._lock:
+            if cls._pool is not None:
+                cls._pool.terminate()
+                cls._pool.join()
+                cls._pool = None
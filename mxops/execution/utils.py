@@ -3,8 +3,9 @@ author: Etienne Wallet
 
 This module contains some utilities functions for the execution sub package
 """
+from contextvars import ContextVar
 import os
-from typing import Any, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from multiversx_sdk_cli.contracts import QueryResult, SmartContract
 from multiversx_sdk_core.address import Address
@@ -16,6 +17,50 @@ from mxops import errors
 from mxops.execution.account import AccountsManager
 
 
+# variables of the loop iterations executed concurrently, which can not share the
+# environment of the process
+_VARIABLES_SCOPE: ContextVar[Optional[Dict[str, str]]] = ContextVar(
+    "variables_scope", default=None
+)
+
+
+def get_variables_scope() -> Optional[Dict[str, str]]:
+    """
+    Return the variables of the current scope, if any
+
+    :return: variables of the scope or None if the environment is used
+    :rtype: Optional[Dict[str, str]]
+    """
+    return _VARIABLES_SCOPE.get()
+
+
+def set_variables_scope(variables: Optional[Dict[str, str]]):
+    """
+    Set the variables of the current context. Within a scope, the variables are
+    read from the scope first and written to the scope instead of the environment.
+
+    :param variables: variables of the scope, None to use the environment
+    :type variables: Optional[Dict[str, str]]
+    """
+    _VARIABLES_SCOPE.set(variables)
+
+
+def set_variable(name: str, value: str):
+    """
+    Set a variable in the current scope or in the environment if there is no scope
+
+    :param name: name of the variable
+    :type name: str
+    :param value: value of the variable
+    :type value: str
+    """
+    variables = _VARIABLES_SCOPE.get()
+    if variables is None:
+        os.environ[name] = value
+    else:
+        variables[name] = value
+
+
 def retrieve_specified_type(arg: str) -> Tuple[str, Optional[str]]:
     """
     Retrieve the type specified with the argument.
@@ -55,7 +100,8 @@ def convert_arg(arg: Any, desired_type: Optional[str]) -> Any:
 
 def retrieve_value_from_env(arg: str) -> str:
     """
-    Retrieve the value of an argument from the environment variables
+    Retrieve the value of an argument from the variables of the current scope or
+    from the environment variables
 
     :param arg: name of the variable prefixed with the $ sign
     :type arg: str
@@ -65,8 +111,12 @@ def retrieve_value_from_env(arg: str) -> str:
     if not arg.startswith("$"):
         raise ValueError(f"the argument as no $ sign: {arg}")
     inner_arg, desired_type = retrieve_specified_type(arg)
+    variables = _VARIABLES_SCOPE.get()
     try:
-        retrieved_value = os.environ[inner_arg[1:]]
+        if variables is not None and inner_arg[1:] in variables:
+            retrieved_value = variables[inner_arg[1:]]
+        else:
+            retrieved_value = os.environ[inner_arg[1:]]
     except KeyError as err:
         raise errors.UnkownVariable(inner_arg[1:]) from err
     return convert_arg(retrieved_value, desired_type)
@@ -130,6 +180,41 @@ def retrieve_address_from_account(arg: str) -> Address:
     return account.address
 
 
+def retrieve_bech32_from_account(arg: str) -> str:
+    """
+    Retrieve the bech32 address of an account from the accounts manager.
+    the argument must formated like this: [user]
+
+    :param arg: name of the account formated as above
+    :type arg: str
+    :return: bech32 address of the account
+    :rtype: str
+    """
+    return retrieve_address_from_account(arg).bech32()
+
+
+def get_string_retriever(arg: str) -> Optional[Callable[[str], Any]]:
+    """
+    Return the function that evaluates a string argument intended to be an account,
+    an env var, a config var or a data var. Return None if the string argument is
+    not dynamic.
+
+    :param arg: argument to check
+    :type arg: str
+    :return: function to call with the argument to evaluate it
+    :rtype: Optional[Callable[[str], Any]]
+    """
+    if arg.startswith("["):
+        return retrieve_bech32_from_account
+    if arg.startswith("$"):
+        return retrieve_value_from_env
+    if arg.startswith("&"):
+        return retrieve_value_from_config
+    if arg.startswith("%"):
+        return retrieve_value_from_scenario_data
+    return None
+
+
 def retrieve_value_from_string(arg: str) -> Any:
     """
     Check if a string argument is intended to be an env var, a config var or a data var.
@@ -142,15 +227,10 @@ def retrieve_value_from_string(arg: str) -> Any:
     """
     if arg.startswith("0x"):
         return bytes.fromhex(arg[2:])
-    if arg.startswith("["):
-        return retrieve_address_from_account(arg).bech32()
-    if arg.startswith("$"):
-        return retrieve_value_from_env(arg)
-    if arg.startswith("&"):
-        return retrieve_value_from_config(arg)
-    if arg.startswith("%"):
-        return retrieve_value_from_scenario_data(arg)
-    return arg
+    retriever = get_string_retriever(arg)
+    if retriever is None:
+        return arg
+    return retriever(arg)
 
 
 def retrieve_values_from_strings(args: List[str]) -> List[Any]:
@@ -187,6 +267,167 @@ def retrieve_value_from_any(arg: Any) -> Any:
     return arg
 
 
+class ArgumentTemplate:
+    """
+    Compiled form of a step argument: the literal parts of the argument are
+    evaluated once, at the compilation, and only its dynamic leaves are evaluated
+    each time the template is resolved.
+    The values returned for the literal parts are shared between the resolutions
+    and must not be modified.
+    """
+
+    def resolve(self) -> Any:
+        """
+        Interface for the method that evaluates the argument.
+        Each child class must override this method
+
+        :raises NotImplementedError: if this method was not overriden
+        by a child class or directly executed.
+        :return: evaluated argument
+        :rtype: Any
+        """
+        raise NotImplementedError
+
+
+class LiteralArgument(ArgumentTemplate):
+    """
+    Argument with no dynamic part
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        """
+        Initialise the template
+
+        :param value: evaluated value of the argument
+        :type value: Any
+        """
+        self.value = value
+
+    def resolve(self) -> Any:
+        """
+        Return the value evaluated at the compilation
+
+        :return: evaluated argument
+        :rtype: Any
+        """
+        return self.value
+
+
+class DynamicArgument(ArgumentTemplate):
+    """
+    String argument evaluated from an account, the environment,
+    the config or the scenario data
+    """
+
+    __slots__ = ("retriever", "arg")
+
+    def __init__(self, retriever: Callable[[str], Any], arg: str):
+        """
+        Initialise the template
+
+        :param retriever: function that evaluates the argument
+        :type retriever: Callable[[str], Any]
+        :param arg: raw argument
+        :type arg: str
+        """
+        self.retriever = retriever
+        self.arg = arg
+
+    def resolve(self) -> Any:
+        """
+        Evaluate the argument with its retriever
+
+        :return: evaluated argument
+        :rtype: Any
+        """
+        return self.retriever(self.arg)
+
+
+class ListArgument(ArgumentTemplate):
+    """
+    List argument with at least one dynamic element
+    """
+
+    __slots__ = ("templates",)
+
+    def __init__(self, templates: List[ArgumentTemplate]):
+        """
+        Initialise the template
+
+        :param templates: compiled elements of the list
+        :type templates: List[ArgumentTemplate]
+        """
+        self.templates = templates
+
+    def resolve(self) -> List[Any]:
+        """
+        Evaluate each element of the list
+
+        :return: evaluated argument
+        :rtype: List[Any]
+        """
+        return [template.resolve() for template in self.templates]
+
+
+class DictArgument(ArgumentTemplate):
+    """
+    Dict argument with at least one dynamic key or value
+    """
+
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[Tuple[ArgumentTemplate, ArgumentTemplate]]):
+        """
+        Initialise the template
+
+        :param items: compiled keys and values of the dict
+        :type items: List[Tuple[ArgumentTemplate, ArgumentTemplate]]
+        """
+        self.items = items
+
+    def resolve(self) -> Dict[Any, Any]:
+        """
+        Evaluate each key and value of the dict
+
+        :return: evaluated argument
+        :rtype: Dict[Any, Any]
+        """
+        return {key.resolve(): value.resolve() for key, value in self.items}
+
+
+def compile_argument(arg: Any) -> ArgumentTemplate:
+    """
+    Compile an argument into a template that gives the same result as
+    retrieve_value_from_any when resolved
+
+    :param arg: argument to compile
+    :type arg: Any
+    :return: compiled argument
+    :rtype: ArgumentTemplate
+    """
+    if isinstance(arg, str):
+        retriever = get_string_retriever(arg)
+        if retriever is None:
+            return LiteralArgument(retrieve_value_from_string(arg))
+        return DynamicArgument(retriever, arg)
+    if isinstance(arg, list):
+        templates = [compile_argument(e) for e in arg]
+        if all(isinstance(t, LiteralArgument) for t in templates):
+            return LiteralArgument([t.value for t in templates])
+        return ListArgument(templates)
+    if isinstance(arg, dict):
+        items = [(compile_argument(k), compile_argument(v)) for k, v in arg.items()]
+        if all(
+            isinstance(k, LiteralArgument) and isinstance(v, LiteralArgument)
+            for k, v in items
+        ):
+            return LiteralArgument({k.value: v.value for k, v in items})
+        return DictArgument(items)
+    return LiteralArgument(arg)
+
+
 def format_tx_arguments(arguments: List[Any]) -> List[Any]:
     """
     Transform the arguments so they can be recognised by multiversx sdk core
@@ -0,0 +1,100 @@
+"""
+author: Etienne Wallet
+
+This module contains the process-wide cache of the files used by the steps,
+such as the wasm files of the contracts
+"""
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+import threading
+from typing import Dict, Tuple
+
+from mxops.utils.msc import get_code_hash
+
+
+@dataclass(frozen=True)
+class Artifact:
+    """
+    Content of a file along with its hashes
+    """
+
+    content: bytes
+    sha256: str
+    code_hash: str
+
+    @property
+    def size(self) -> int:
+        """
+        Return the size of the file in bytes
+
+        :return: size of the file
+        :rtype: int
+        """
+        return len(self.content)
+
+
+# artifacts keyed by resolved path, with the modification time and the size
+# of their file
+_ARTIFACTS: Dict[Path, Tuple[Tuple[int, int], Artifact]] = {}
+_LOCK = threading.Lock()
+
+
+def _read_artifact(file_path: Path) -> Artifact:
+    """
+    Read a file and compute its hashes
+
+    :param file_path: path of the file
+    :type file_path: Path
+    :return: content and hashes of the file
+    :rtype: Artifact
+    """
+    content = file_path.read_bytes()
+    return Artifact(
+        content=content,
+        sha256=hashlib.sha256(content).hexdigest(),
+        code_hash=get_code_hash(content),
+    )
+
+
+def load_artifact(file_path: Path) -> Artifact:
+    """
+    Return the content and the hashes of a file. A file is read and hashed only
+    once per process as long as it is not modified.
+
+    :param file_path: path of the file
+    :type file_path: Path
+    :return: content and hashes of the file
+    :rtype: Artifact
+    """
+    file_stat = os.stat(file_path)
+    file_version = (file_stat.st_mtime_ns, file_stat.st_size)
+    cache_key = Path(file_path).resolve()
+    with _LOCK:
+        cached = _ARTIFACTS.get(cache_key)
+    if cached is not None and cached[0] == file_version:
+        return cached[1]
+    artifact = _read_artifact(cache_key)
+    with _LOCK:
+        _ARTIFACTS[cache_key] = (file_version, artifact)
+    return artifact
+
+
+def get_n_cached_artifacts() -> int:
+    """
+    Return the number of files currently cached
+
+    :return: number of cached files
+    :rtype: int
+    """
+    with _LOCK:
+        return len(_ARTIFACTS)
+
+
+def clear_artifacts_cache():
+    """
+    Forget all the cached files
+    """
+    with _LOCK:
+        _ARTIFACTS.clear()
@@ -74,6 +74,18 @@ def get_file_hash(file_path: Path) -> str:
     return file_hash.hexdigest()
 
 
+def get_code_hash(bytecode: bytes) -> str:
+    """
+    Compute the hash of a contract bytecode as done on chain (blake2b-256)
+
+    :param bytecode: bytecode of the contract
+    :type bytecode: bytes
+    :return: hex representation of the code hash
+    :rtype: str
+    """
+    return hashlib.blake2b(bytecode, digest_size=32).hexdigest()
+
+
 def int_to_pair_hex(number: int) -> str:
     """
     Transform an integer into its hex representation (without the 0x) and
@@ -82,3 +82,17 @@ def accounts_manager():
     accounts_manager.load_account(
         "test_user_B", pem_path="./tests/data/test_user_B.pem"
     )
+
+
+@pytest.fixture(autouse=True)
+def accounts_nonces(accounts_manager):
+    """
+    Restore the nonces of the test accounts and empty their lanes after each test,
+    so that the nonces reserved by a test do not leak into the next ones
+    """
+    account_names = ("test_user_A", "test_user_B")
+    nonces = {name: AccountsManager.get_account(name).nonce for name in account_names}
+    yield
+    for name, nonce in nonces.items():
+        AccountsManager.get_account(name).nonce = nonce
+        AccountsManager.get_lane(name).reset()
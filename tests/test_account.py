@@ -0,0 +1,282 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+from multiversx_sdk_core import Transaction
+import pytest
+
+from mxops.config.config import Config
+from mxops import errors
+from mxops.execution.account import AccountsManager, NonceLane, get_max_cost
+from mxops.execution.steps import ContractDeployStep, EgldTransferStep
+
+
+def test_nonce_lane_cap():
+    # Given
+    config = Config.get_config()
+    account = AccountsManager.get_account("test_user_A")
+    start_nonce = account.nonce
+    lane = NonceLane("test_user_A")
+    reserved = []
+
+    # When
+    config.set_option("MAX_IN_FLIGHT_TXS_PER_SENDER", "2")
+    config.set_option("NONCE_GAP_CHECK_PERIOD", "0.01")
+    try:
+        with patch("mxops.execution.account.ProxyRegistry.get_proxy") as mock_proxy:
+            mock_proxy.return_value.get_account.return_value.nonce = start_nonce
+            first_nonce = lane.reserve()
+            lane.reserve()
+            thread = threading.Thread(target=lambda: reserved.append(lane.reserve()))
+            thread.start()
+            thread.join(0.1)
+            n_reserved_while_full = len(reserved)
+            lane.confirm(first_nonce)
+            thread.join(1)
+    finally:
+        config.set_option("MAX_IN_FLIGHT_TXS_PER_SENDER", "50")
+        config.set_option("NONCE_GAP_CHECK_PERIOD", "10")
+
+    # Then
+    assert first_nonce == start_nonce
+    assert n_reserved_while_full == 0
+    assert reserved == [start_nonce + 2]
+    assert account.nonce == start_nonce + 3
+
+
+def test_nonce_lane_unlocked_requests():
+    # Given
+    config = Config.get_config()
+    account = AccountsManager.get_account("test_user_A")
+    lane = NonceLane("test_user_A")
+    first_nonce = lane.reserve()
+    lock_available_during_request = []
+
+    def mock_get_account(address):
+        # another thread, such as a finality thread, must be able to update the lane
+        thread = threading.Thread(target=lambda: lane.confirm(first_nonce))
+        thread.start()
+        thread.join(1)
+        lock_available_during_request.append(not thread.is_alive())
+        return MagicMock(nonce=account.nonce)
+
+    # When
+    config.set_option("MAX_IN_FLIGHT_TXS_PER_SENDER", "1")
+    try:
+        with patch("mxops.execution.account.ProxyRegistry.get_proxy") as mock_proxy:
+            mock_proxy.return_value.get_account.side_effect = mock_get_account
+            second_nonce = lane.reserve()
+    finally:
+        config.set_option("MAX_IN_FLIGHT_TXS_PER_SENDER", "50")
+
+    # Then
+    assert lock_available_during_request == [True]
+    assert second_nonce == first_nonce + 1
+
+
+def test_nonce_lane_unchecked_transactions():
+    # Given
+    config = Config.get_config()
+    steps = [
+        EgldTransferStep(
+            sender="test_user_A", receiver="test_user_B", amount=i, checks=[]
+        )
+        for i in range(5)
+    ]
+
+    # When
+    config.set_option("MAX_IN_FLIGHT_TXS_PER_SENDER", "2")
+    try:
+        with patch(
+            "mxops.execution.account.ProxyRegistry.get_proxy"
+        ) as mock_proxy, patch(
+            "mxops.execution.steps.send", side_effect=lambda tx: f"hash_{tx.nonce}"
+        ) as mock_send:
+            for step in steps:
+                step.execute()
+    finally:
+        config.set_option("MAX_IN_FLIGHT_TXS_PER_SENDER", "50")
+
+    # Then
+    assert mock_send.call_count == 5
+    assert mock_proxy.call_count == 0
+    assert AccountsManager.get_lane("test_user_A").get_n_in_flight() == 0
+
+
+def test_nonce_gap_recovery():
+    # Given
+    config = Config.get_config()
+    account = AccountsManager.get_account("test_user_A")
+    lane = NonceLane("test_user_A")
+    txs = []
+    for _ in range(3):
+        tx = Transaction(
+            sender=account.address.to_bech32(),
+            receiver=account.address.to_bech32(),
+            gas_limit=50000,
+            chain_id="D",
+        )
+        tx.nonce = lane.reserve()
+        lane.register_sent(tx)
+        txs.append(tx)
+
+    # When
+    config.set_option("NONCE_GAP_CHECK_PERIOD", "0")
+    try:
+        with patch("mxops.execution.account.ProxyRegistry.get_proxy") as mock_proxy:
+            mock_proxy.return_value.get_account.return_value.nonce = txs[1].nonce
+            n_first_check = lane.recover_gaps()
+            n_second_check = lane.recover_gaps()
+    finally:
+        config.set_option("NONCE_GAP_CHECK_PERIOD", "10")
+
+    # Then
+    assert n_first_check == 0
+    assert n_second_check == 2
+    mock_proxy.return_value.send_transactions.assert_called_once_with(txs[1:])
+    assert lane.get_n_in_flight() == 2
+
+
+def test_wallet_pool_strategies():
+    # Given
+    accounts = ["test_user_A", "test_user_B"]
+    with patch("mxops.execution.account.ProxyRegistry.get_proxy") as mock_proxy:
+        mock_proxy.return_value.get_account.return_value.balance = 10**18
+        AccountsManager.load_wallet_pool("round_robin_pool", accounts)
+        AccountsManager.load_wallet_pool(
+            "least_loaded_pool", accounts, strategy="least_loaded"
+        )
+    round_robin_pool = AccountsManager.get_wallet_pool("round_robin_pool")
+    least_loaded_pool = AccountsManager.get_wallet_pool("least_loaded_pool")
+    lane = AccountsManager.get_lane("test_user_A")
+    cost = 50000 * 10**9
+
+    # When
+    round_robin_senders = [round_robin_pool.choose_sender(cost) for _ in range(3)]
+    nonce = lane.reserve()
+    least_loaded_senders = [least_loaded_pool.choose_sender(cost) for _ in range(2)]
+    lane.release(nonce)
+
+    # Then
+    assert round_robin_senders == ["test_user_A", "test_user_B", "test_user_A"]
+    assert least_loaded_senders == ["test_user_B", "test_user_B"]
+
+
+def test_wallet_pool_balances():
+    # Given
+    accounts = ["test_user_A", "test_user_B"]
+    tx = Transaction(
+        sender="erd1",
+        receiver="erd1",
+        gas_limit=50000,
+        chain_id="D",
+        amount=6 * 10**17,
+        gas_price=10**9,
+    )
+    cost = get_max_cost(tx)
+    with patch("mxops.execution.account.ProxyRegistry.get_proxy") as mock_proxy:
+        mock_proxy.return_value.get_account.return_value.balance = 10**18
+
+        # When
+        AccountsManager.load_wallet_pool(
+            "balance_pool", accounts, min_balance=3 * 10**17
+        )
+        wallet_pool = AccountsManager.get_wallet_pool("balance_pool")
+        senders = []
+        for _ in range(2):
+            senders.append(wallet_pool.choose_sender(cost))
+            AccountsManager.record_transaction_cost(senders[-1], tx)
+        mock_proxy.return_value.get_account.return_value.balance = 0
+        with pytest.raises(errors.WalletPoolExhausted):
+            wallet_pool.choose_sender(cost)
+
+    # Then
+    assert senders == ["test_user_A", "test_user_B"]
+    assert wallet_pool.get_balance("test_user_A") == 0
+
+
+def test_wallet_pool_empty_account():
+    # Given
+    accounts = ["test_user_A", "test_user_B"]
+    balances = {
+        AccountsManager.get_account("test_user_A").address.to_bech32(): 0,
+        AccountsManager.get_account("test_user_B").address.to_bech32(): 10**18,
+    }
+    with patch("mxops.execution.account.ProxyRegistry.get_proxy") as mock_proxy:
+        mock_proxy.return_value.get_account.side_effect = lambda address: MagicMock(
+            balance=balances[address.to_bech32()]
+        )
+        AccountsManager.load_wallet_pool("empty_account_pool", accounts)
+    wallet_pool = AccountsManager.get_wallet_pool("empty_account_pool")
+
+    # When
+    senders = [wallet_pool.choose_sender(50000 * 10**9) for _ in range(2)]
+
+    # Then
+    assert senders == ["test_user_B", "test_user_B"]
+
+
+def test_wallet_pool_reload():
+    # Given
+    accounts = ["test_user_A", "test_user_B"]
+    tx = Transaction(
+        sender="erd1",
+        receiver="erd1",
+        gas_limit=50000,
+        chain_id="D",
+        amount=10**17,
+        gas_price=10**9,
+    )
+    with patch("mxops.execution.account.ProxyRegistry.get_proxy") as mock_proxy:
+        mock_proxy.return_value.get_account.return_value.balance = 10**18
+        AccountsManager.load_wallet_pool("reload_pool", accounts)
+        replaced_pool = AccountsManager.get_wallet_pool("reload_pool")
+        AccountsManager.load_wallet_pool("reload_pool", accounts)
+    wallet_pool = AccountsManager.get_wallet_pool("reload_pool")
+
+    # When
+    AccountsManager.record_transaction_cost("test_user_A", tx)
+
+    # Then
+    assert wallet_pool.get_balance("test_user_A") == 10**18 - get_max_cost(tx)
+    assert replaced_pool.get_balance("test_user_A") == 10**18
+
+
+def test_wallet_pool_refund():
+    # Given
+    with patch("mxops.execution.account.ProxyRegistry.get_proxy") as mock_proxy:
+        mock_proxy.return_value.get_account.return_value.balance = 10**18
+        AccountsManager.load_wallet_pool("refund_pool", ["test_user_A"])
+    wallet_pool = AccountsManager.get_wallet_pool("refund_pool")
+    step = EgldTransferStep(sender="test_user_A", receiver="test_user_B", amount=10**17)
+
+    # When
+    tx = step.build_transaction()
+    charged_balance = wallet_pool.get_balance("test_user_A")
+    step.release_transaction(tx)
+
+    # Then
+    assert charged_balance == 10**18 - get_max_cost(tx)
+    assert wallet_pool.get_balance("test_user_A") == 10**18
+
+
+def test_cost_estimate_without_build():
+    # Given
+    deploy_step = ContractDeployStep(
+        sender="test_user_A",
+        wasm_path="missing_contract.wasm",
+        contract_id="estimated_contract",
+        gas_limit=10000000,
+    )
+    transfer_step = EgldTransferStep(
+        sender="test_user_A", receiver="test_user_B", amount=10**17
+    )
+
+    # When
+    with patch.object(ContractDeployStep, "_build_unsigned_transaction") as mock_build:
+        deploy_cost = deploy_step.estimate_cost()
+    transfer_cost = transfer_step.estimate_cost()
+
+    # Then
+    mock_build.assert_not_called()
+    assert deploy_cost == 10000000 * 10**9
+    assert transfer_cost == get_max_cost(transfer_step._build_unsigned_transaction())
@@ -0,0 +1,116 @@
+from concurrent.futures import Future
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from multiversx_sdk_network_providers.transactions import TransactionOnNetwork
+import pytest
+
+from mxops import errors
+from mxops.execution.bundle import TransactionBundle, broadcast_bundle, read_bundle
+from mxops.execution.steps import EgldTransferStep, FungibleIssueStep
+
+
+def test_sign_only_bundle(tmp_path: Path):
+    # Given
+    bundle_path = tmp_path / "bundle.jsonl"
+    steps = [
+        EgldTransferStep(sender="test_user_A", receiver="test_user_B", amount=i)
+        for i in range(3)
+    ]
+    issue_step = FungibleIssueStep(
+        sender="test_user_A",
+        token_name="MyToken",
+        token_ticker="MTK",
+        initial_supply=1,
+        num_decimals=0,
+    )
+
+    # When
+    TransactionBundle.start(bundle_path)
+    try:
+        with patch("mxops.execution.steps.send") as mock_send:
+            for step in steps:
+                step.execute()
+            with pytest.raises(errors.SignOnlyNotSupported):
+                issue_step.execute()
+    finally:
+        TransactionBundle.close()
+    bundled_txs = list(read_bundle(bundle_path))
+
+    # Then
+    assert mock_send.call_count == 0
+    assert [tx.amount for tx in bundled_txs] == [0, 1, 2]
+    assert bundled_txs[1].nonce == bundled_txs[0].nonce + 1
+    assert all(len(tx.signature) == 64 for tx in bundled_txs)
+
+
+def test_broadcast_bundle(test_data_folder_path: Path, tmp_path: Path):
+    # Given
+    with open(test_data_folder_path / "api_responses" / "swap.json") as file:
+        on_chain_tx = TransactionOnNetwork.from_proxy_http_response(**json.load(file))
+    bundle_path = tmp_path / "bundle.jsonl"
+    TransactionBundle.start(bundle_path)
+    try:
+        for i in range(2):
+            EgldTransferStep(
+                sender="test_user_A", receiver="test_user_B", amount=i
+            ).execute()
+    finally:
+        TransactionBundle.close()
+
+    def mock_track(tx_hash):
+        future = Future()
+        future.set_result(on_chain_tx)
+        return future
+
+    # When
+    with patch(
+        "mxops.execution.bundle.send_many", return_value=["hash_0", None]
+    ) as mock_send_many, patch(
+        "mxops.execution.bundle.FinalityTracker.get"
+    ) as mock_get_tracker:
+        mock_get_tracker.return_value.track.side_effect = mock_track
+        with pytest.raises(errors.FailedBundleTransactions) as error:
+            broadcast_bundle(bundle_path)
+
+    # Then
+    assert len(mock_send_many.call_args.args[0]) == 2
+    assert mock_get_tracker.return_value.track.call_count == 1
+    assert "1 transactions of the bundle out of 2 failed" in str(error.value)
+
+
+def test_broadcast_bundle_timeout(test_data_folder_path: Path, tmp_path: Path):
+    # Given
+    with open(test_data_folder_path / "api_responses" / "swap.json") as file:
+        on_chain_tx = TransactionOnNetwork.from_proxy_http_response(**json.load(file))
+    bundle_path = tmp_path / "bundle.jsonl"
+    TransactionBundle.start(bundle_path)
+    try:
+        for i in range(3):
+            EgldTransferStep(
+                sender="test_user_A", receiver="test_user_B", amount=i
+            ).execute()
+    finally:
+        TransactionBundle.close()
+
+    def mock_track(tx_hash):
+        future = Future()
+        if tx_hash == "hash_1":
+            future.set_exception(errors.UnfinalizedTransactionException(on_chain_tx))
+        else:
+            future.set_result(on_chain_tx)
+        return future
+
+    # When
+    with patch(
+        "mxops.execution.bundle.send_many",
+        return_value=["hash_0", "hash_1", "hash_2"],
+    ), patch("mxops.execution.bundle.FinalityTracker.get") as mock_get_tracker:
+        mock_get_tracker.return_value.track.side_effect = mock_track
+        with pytest.raises(errors.FailedBundleTransactions) as error:
+            broadcast_bundle(bundle_path)
+
+    # Then
+    assert mock_get_tracker.return_value.track.call_count == 3
+    assert "1 transactions of the bundle out of 3 failed" in str(error.value)
@@ -0,0 +1,284 @@
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from multiversx_sdk_network_providers.errors import GenericError
+from multiversx_sdk_network_providers.transactions import TransactionOnNetwork
+import pytest
+import yaml
+
+from mxops.config.config import Config
+from mxops.data.execution_data import ScenarioData
+from mxops import errors
+from mxops.execution.account import AccountsManager
+from mxops.execution.cursor import ExecutionCursor
+from mxops.execution.fingerprints import StepsFingerprints
+from mxops.execution.pipeline import TransactionPipeline
+from mxops.execution.scene import execute_scene
+from mxops.execution.steps import EgldTransferStep
+from mxops.execution.user_modules import load_user_module
+
+
+def write_scene(scene_path: Path, steps: list):
+    scene = {
+        "allowed_networks": ["localnet"],
+        "allowed_scenario": [".*"],
+        "steps": steps,
+    }
+    scene_path.write_text(yaml.dump(scene))
+
+
+def test_resume_loop_iteration(tmp_path: Path):
+    # Given
+    module_path = tmp_path / "resume_module.py"
+    module_path.write_text(
+        "CALLS = []\nFAILURES = []\n\n\n"
+        "def record(value):\n"
+        "    if value == '2' and len(FAILURES) == 0:\n"
+        "        FAILURES.append(value)\n"
+        "        raise RuntimeError('interrupted')\n"
+        "    CALLS.append(value)\n"
+    )
+    python_step = {
+        "type": "Python",
+        "module_path": module_path.as_posix(),
+        "function": "record",
+    }
+    scene_path = tmp_path / "scene.yaml"
+    write_scene(
+        scene_path,
+        [
+            {**python_step, "arguments": ["start"]},
+            {
+                "type": "Loop",
+                "var_name": "CURSOR_VAR",
+                "var_start": 0,
+                "var_end": 4,
+                "steps": [{**python_step, "arguments": ["$CURSOR_VAR"]}],
+            },
+            {**python_step, "arguments": ["end"]},
+        ],
+    )
+    scenario_data = ScenarioData.get()
+
+    # When
+    ExecutionCursor.start()
+    with pytest.raises(RuntimeError):
+        execute_scene(scene_path)
+    cursor = scenario_data.execution_cursor
+    ExecutionCursor.start(resume=True)
+    execute_scene(scene_path)
+    ExecutionCursor.clear()
+
+    # Then
+    assert cursor["frames"] == [
+        {"scene": scene_path.resolve().as_posix(), "step": 1},
+        {"iteration": 2, "step": 0},
+    ]
+    assert load_user_module(module_path).CALLS == ["start", "0", "1", "2", "3", "end"]
+    assert scenario_data.execution_cursor is None
+
+
+def test_resume_reconciled_transaction(test_data_folder_path: Path, tmp_path: Path):
+    # Given
+    with open(test_data_folder_path / "api_responses" / "swap.json") as file:
+        on_chain_tx = TransactionOnNetwork.from_proxy_http_response(**json.load(file))
+    scene_path = tmp_path / "transfer_scene.yaml"
+    write_scene(
+        scene_path,
+        [
+            {
+                "type": "EgldTransfer",
+                "sender": "test_user_A",
+                "receiver": "test_user_B",
+                "amount": 1,
+            }
+        ],
+    )
+    scenario_data = ScenarioData.get()
+    scenario_data.set_execution_cursor(
+        {
+            "frames": [{"scene": scene_path.resolve().as_posix(), "step": 0}],
+            "tx_hash": on_chain_tx.hash,
+        }
+    )
+
+    # When
+    ExecutionCursor.start(resume=True)
+    with patch("mxops.execution.scene.ProxyRegistry.get_proxy"), patch(
+        "mxops.execution.scene.wait_for_result", return_value=on_chain_tx
+    ), patch("mxops.execution.scene.AccountsManager.sync_account") as mock_sync, patch(
+        "mxops.execution.steps.send"
+    ) as mock_send:
+        execute_scene(scene_path)
+
+    # Then
+    assert mock_send.call_count == 0
+    mock_sync.assert_called_once_with("test_user_A")
+    assert not ExecutionCursor.is_resuming()
+
+
+def test_resume_unreconciled_fingerprint_occurrences(
+    test_data_folder_path: Path, tmp_path: Path
+):
+    # Given
+    config = Config.get_config()
+    with open(test_data_folder_path / "api_responses" / "swap.json") as file:
+        on_chain_tx = TransactionOnNetwork.from_proxy_http_response(**json.load(file))
+    scene_path = tmp_path / "incremental_scene.yaml"
+    transfer_step_kwargs = {
+        "sender": "test_user_A",
+        "receiver": "test_user_B",
+        "amount": 987654321,
+    }
+    write_scene(
+        scene_path,
+        [{"type": "EgldTransfer", **transfer_step_kwargs} for _ in range(2)],
+    )
+    scenario_data = ScenarioData.get()
+    scenario_data.set_execution_cursor(
+        {
+            "frames": [{"scene": scene_path.resolve().as_posix(), "step": 0}],
+            "tx_hash": "lost_hash",
+        }
+    )
+    StepsFingerprints.reset()
+
+    # When
+    config.set_option("INCREMENTAL_EXECUTION", "True")
+    try:
+        ExecutionCursor.start(resume=True)
+        with patch(
+            "mxops.execution.scene.ProxyRegistry.get_proxy"
+        ) as mock_proxy, patch(
+            "mxops.execution.steps.send", side_effect=["hash_1", "hash_2"]
+        ), patch(
+            "mxops.execution.steps.wait_for_result", return_value=on_chain_tx
+        ):
+            mock_proxy.return_value.get_transaction.side_effect = GenericError(
+                "url", "not found"
+            )
+            execute_scene(scene_path)
+        ExecutionCursor.clear()
+    finally:
+        config.set_option("INCREMENTAL_EXECUTION", "False")
+        StepsFingerprints.reset()
+
+    # Then
+    fingerprint = EgldTransferStep(**transfer_step_kwargs).compute_fingerprint()
+    assert scenario_data.steps_fingerprints[fingerprint] == [
+        on_chain_tx.hash,
+        on_chain_tx.hash,
+    ]
+
+
+def test_resume_scene_not_found(tmp_path: Path):
+    # Given
+    scene_path = tmp_path / "executed_scene.yaml"
+    write_scene(scene_path, [])
+    scenario_data = ScenarioData.get()
+    scenario_data.set_execution_cursor(
+        {
+            "frames": [{"scene": (tmp_path / "missing.yaml").as_posix(), "step": 1}],
+            "tx_hash": None,
+        }
+    )
+
+    # When
+    ExecutionCursor.start(resume=True)
+    execute_scene(scene_path)
+    with pytest.raises(errors.ResumePositionNotFound):
+        ExecutionCursor.raise_if_resuming()
+    ExecutionCursor.clear()
+
+
+def test_cursor_held_by_pipelined_steps(tmp_path: Path):
+    # Given
+    config = Config.get_config()
+    scene_path = tmp_path / "pipelined_scene.yaml"
+    transfer_step = {
+        "type": "EgldTransfer",
+        "sender": "test_user_A",
+        "receiver": "test_user_B",
+        "amount": 1,
+    }
+    write_scene(scene_path, [dict(transfer_step) for _ in range(3)])
+    scenario_data = ScenarioData.get()
+    start_nonce = AccountsManager.get_account("test_user_A").nonce
+
+    def mock_send_many(txs):
+        return [f"hash_{tx.nonce}" for tx in txs]
+
+    # When
+    config.set_option("PIPELINE_TRANSACTIONS", "True")
+    config.set_option("TX_SEND_CHUNK_SIZE", "1")
+    try:
+        ExecutionCursor.start()
+        with patch(
+            "mxops.execution.pipeline.send_many", side_effect=mock_send_many
+        ), patch("mxops.execution.pipeline.FinalityTracker.get"):
+            execute_scene(scene_path)
+        cursor = scenario_data.execution_cursor
+    finally:
+        TransactionPipeline.clear()
+        AccountsManager.get_lane("test_user_A").reset()
+        ExecutionCursor.clear()
+        config.set_option("PIPELINE_TRANSACTIONS", "False")
+        config.set_option("TX_SEND_CHUNK_SIZE", "100")
+
+    # Then
+    scene = scene_path.resolve().as_posix()
+    assert cursor["frames"] == [{"scene": scene, "step": 0}]
+    assert cursor["tx_hash"] == f"hash_{start_nonce}"
+    assert cursor["pending"] == [
+        [[{"scene": scene, "step": 1}], f"hash_{start_nonce + 1}"],
+        [[{"scene": scene, "step": 2}], f"hash_{start_nonce + 2}"],
+    ]
+
+
+def test_cursor_released_by_unchecked_pipelined_step(tmp_path: Path):
+    # Given
+    config = Config.get_config()
+    module_path = tmp_path / "failing_module.py"
+    module_path.write_text("def fail():\n    raise RuntimeError('interrupted')\n")
+    scene_path = tmp_path / "unchecked_scene.yaml"
+    write_scene(
+        scene_path,
+        [
+            {
+                "type": "EgldTransfer",
+                "sender": "test_user_A",
+                "receiver": "test_user_B",
+                "amount": 1,
+                "checks": [],
+            },
+            {
+                "type": "Python",
+                "module_path": module_path.as_posix(),
+                "function": "fail",
+            },
+        ],
+    )
+    scenario_data = ScenarioData.get()
+
+    # When
+    config.set_option("PIPELINE_TRANSACTIONS", "True")
+    try:
+        ExecutionCursor.start()
+        with patch(
+            "mxops.execution.pipeline.send_many",
+            side_effect=lambda txs: [f"hash_{tx.nonce}" for tx in txs],
+        ), pytest.raises(RuntimeError):
+            execute_scene(scene_path)
+        cursor = scenario_data.execution_cursor
+    finally:
+        TransactionPipeline.clear()
+        AccountsManager.get_lane("test_user_A").reset()
+        ExecutionCursor.clear()
+        config.set_option("PIPELINE_TRANSACTIONS", "False")
+
+    # Then
+    assert cursor == {
+        "frames": [{"scene": scene_path.resolve().as_posix(), "step": 1}],
+        "tx_hash": None,
+    }
@@ -1,13 +1,17 @@
+import gc
 import json
 from pathlib import Path
 import time
 from typing import Any, List
+from unittest.mock import patch
 
+from multiversx_sdk_network_providers.transactions import TransactionOnNetwork
 import pytest
 
 from mxpyserializer.abi_serializer import AbiSerializer
 
 from mxops import errors
+from mxops.config.config import Config
 from mxops.data.execution_data import (
     _ScenarioData,
     InternalContractData,
@@ -15,7 +19,17 @@ from mxops.data.execution_data import (
     TokenData,
     parse_value_key,
 )
+from mxops.data.path import get_scenario_file_path, get_scenario_journal_path
+from mxops.data.serializers import (
+    _SERIALIZERS_DICTS,
+    clear_serializers_cache,
+    get_n_cached_serializers,
+    get_serializer_dict,
+    load_serializer_from_abi,
+    load_serializer_from_dict,
+)
 from mxops.enums import NetworkEnum, TokenTypeEnum
+from mxops.execution.steps import ContractUpgradeStep
 
 
 @pytest.mark.parametrize(
@@ -139,6 +153,55 @@ def test_parse_value_key(value_key: str, expected_result: List[str | int]):
     assert result == expected_result
 
 
+def test_scenario_value_routing():
+    """
+    Test that the value keys are routed to the contracts, the tokens or the root
+    saved values of a scenario
+    """
+    # Given
+    current_timestamp = int(time.time())
+    scenario_data = _ScenarioData(
+        "___test_routing",
+        NetworkEnum.LOCAL,
+        current_timestamp,
+        current_timestamp,
+        {},
+    )
+    scenario_data.contracts_data["my_contract"] = InternalContractData(
+        contract_id="my_contract",
+        address="erd1qqqqqqqqqqqqqpgq0048vv3uk6l6cdreezpallvduy4qnfv2plcq74464k",
+        saved_values={"values": [1, 2]},
+        wasm_hash="hash",
+        deploy_time=current_timestamp,
+        last_upgrade_time=current_timestamp,
+        serializer=None,
+    )
+    scenario_data.tokens_data["my_token"] = TokenData(
+        name="my_token",
+        ticker="MTK",
+        identifier="MTK-abcdef",
+        type=TokenTypeEnum.FUNGIBLE,
+        saved_values={},
+    )
+    scenario_data.saved_values["my_values"] = {"data": [3, 4]}
+
+    # When
+    contract_address = scenario_data.get_value("my_contract.address")
+    contract_value = scenario_data.get_value("my_contract.values[1]")
+    token_identifier = scenario_data.get_value("my_token.identifier")
+    root_value = scenario_data.get_value("my_values.data[0]")
+    scenario_name = scenario_data.get_value("name")
+
+    # Then
+    assert contract_address == scenario_data.contracts_data["my_contract"].address
+    assert contract_value == 2
+    assert token_identifier == "MTK-abcdef"
+    assert root_value == 3
+    assert scenario_name == "___test_routing"
+    with pytest.raises(errors.WrongDataKeyPath):
+        scenario_data.get_value("_dirty_contracts")
+
+
 @pytest.mark.parametrize(
     "key_path, value",
     [
@@ -275,3 +338,232 @@ def test_abiserializer_io():
         reloaded_scenario_data.contracts_data[contract_name].to_dict()
         == scenario_data.contracts_data[contract_name].to_dict()
     )
+
+
+def test_serializers_cache(tmp_path: Path):
+    """
+    Test that the serializers are shared between identical ABIs and that their
+    dictionary form is computed once
+    """
+    # Given
+    abi_path = Path("tests/data/abis/adder.abi.json")
+    abi_copy_path = tmp_path / "adder_copy.abi.json"
+    abi_copy_path.write_bytes(abi_path.read_bytes())
+    clear_serializers_cache()
+
+    # When
+    serializer = load_serializer_from_abi(abi_path)
+    copy_serializer = load_serializer_from_abi(abi_copy_path)
+    serializer_dict = get_serializer_dict(serializer)
+    dict_serializer = load_serializer_from_dict(serializer.to_dict())
+
+    # Then
+    assert get_n_cached_serializers() == 1
+    assert copy_serializer is serializer
+    assert get_serializer_dict(serializer) is serializer_dict
+    assert serializer_dict == serializer.to_dict()
+    assert get_serializer_dict(dict_serializer) == serializer_dict
+    n_cached_dicts = len(_SERIALIZERS_DICTS)
+    del dict_serializer
+    gc.collect()
+    assert len(_SERIALIZERS_DICTS) == n_cached_dicts - 1
+
+
+def test_write_behind_saves():
+    """
+    Test that the modifications of a scenario are saved in batches
+    """
+    # Given
+    config = Config.get_config()
+    config.set_option("DATA_SAVE_MAX_PENDING", "3")
+    config.set_option("DATA_SAVE_PERIOD", "1000")
+    current_timestamp = int(time.time())
+    scenario_data = _ScenarioData(
+        "___test_write_behind",
+        NetworkEnum.LOCAL,
+        current_timestamp,
+        current_timestamp,
+        {},
+    )
+    scenario_path = get_scenario_file_path(scenario_data.name)
+
+    # When
+    scenario_data.set_value("key_1", 1)
+    scenario_data.set_value("key_2", 2)
+    saved_before_threshold = scenario_path.exists()
+    scenario_data.set_value("key_3", 3)
+    saved_at_threshold = scenario_path.exists()
+    scenario_data.flush()
+    scenario_data.set_value("key_4", 4)
+    scenario_data.flush()
+    metrics = scenario_data.get_persistence_metrics()
+    saved_content = json.loads(scenario_path.read_text(encoding="utf-8"))
+    scenario_path.unlink()
+    config.set_option("DATA_SAVE_MAX_PENDING", "100")
+    config.set_option("DATA_SAVE_PERIOD", "5")
+
+    # Then
+    assert not saved_before_threshold
+    assert saved_at_threshold
+    assert metrics["saves"] == 2
+    assert metrics["bytes_written"] > 0
+    assert not scenario_data.has_pending_changes()
+    assert saved_content["saved_values"] == {
+        "key_1": 1,
+        "key_2": 2,
+        "key_3": 3,
+        "key_4": 4,
+    }
+    assert not any(key.startswith("_") for key in saved_content)
+
+
+def test_journal_storage():
+    """
+    Test that the modifications are appended to the journal, replayed on loading
+    and compacted into the snapshot
+    """
+    # Given
+    config = Config.get_config()
+    config.set_option("DATA_STORAGE", "journal")
+    config.set_option("DATA_JOURNAL_COMPACTION_THRESHOLD", "4")
+    current_timestamp = int(time.time())
+    scenario_name = "___test_journal"
+    scenario_data = _ScenarioData(
+        scenario_name,
+        NetworkEnum.LOCAL,
+        current_timestamp,
+        current_timestamp,
+        {},
+    )
+    scenario_data.save()
+    journal_path = get_scenario_journal_path(scenario_name)
+
+    # When
+    scenario_data.add_token_data(
+        TokenData(
+            name="my_token",
+            ticker="MTK",
+            identifier="MTK-abcdef",
+            type=TokenTypeEnum.FUNGIBLE,
+            saved_values={},
+        )
+    )
+    scenario_data.set_value("my_token.supply", 1000)
+    scenario_data.set_value("counter", 1)
+    n_journal_lines = len(journal_path.read_text(encoding="utf-8").splitlines())
+    with open(journal_path.as_posix(), "a", encoding="utf-8") as file:
+        file.write('{"op": "set", "key": "cou')  # interrupted write
+    reloaded_scenario = _ScenarioData.load_from_name(scenario_name)
+    n_saves_before_compaction = scenario_data.get_persistence_metrics()["saves"]
+    scenario_data.set_value("counter", 2)
+    journal_exists_after_compaction = journal_path.exists()
+    compacted_scenario = _ScenarioData.load_from_name(scenario_name)
+    get_scenario_file_path(scenario_name).unlink()
+    config.set_option("DATA_STORAGE", "snapshot")
+    config.set_option("DATA_JOURNAL_COMPACTION_THRESHOLD", "1000")
+
+    # Then
+    assert n_journal_lines == 3
+    assert n_saves_before_compaction == 1
+    assert reloaded_scenario.get_value("my_token.identifier") == "MTK-abcdef"
+    assert reloaded_scenario.get_value("my_token.supply") == 1000
+    assert reloaded_scenario.get_value("counter") == 1
+    assert not journal_exists_after_compaction
+    assert compacted_scenario.get_value("counter") == 2
+
+
+def test_journal_fingerprint_records():
+    """
+    Test that each fingerprint execution is journaled on its own and replayed
+    """
+    # Given
+    config = Config.get_config()
+    config.set_option("DATA_STORAGE", "journal")
+    current_timestamp = int(time.time())
+    scenario_name = "___test_journal_fingerprints"
+    scenario_data = _ScenarioData(
+        scenario_name,
+        NetworkEnum.LOCAL,
+        current_timestamp,
+        current_timestamp,
+        {},
+    )
+    scenario_data.save()
+    journal_path = get_scenario_journal_path(scenario_name)
+
+    # When
+    scenario_data.record_step_fingerprint("fingerprint", 2, "hash_2")
+    scenario_data.record_step_fingerprint("fingerprint", 1, "hash_1")
+    records = [
+        json.loads(line)
+        for line in journal_path.read_text(encoding="utf-8").splitlines()
+    ]
+    reloaded_scenario = _ScenarioData.load_from_name(scenario_name)
+    journal_path.unlink()
+    get_scenario_file_path(scenario_name).unlink()
+    config.set_option("DATA_STORAGE", "snapshot")
+
+    # Then
+    assert [record["tx_hash"] for record in records] == ["hash_2", "hash_1"]
+    assert all("tx_hashes" not in record for record in records)
+    assert reloaded_scenario.steps_fingerprints == {"fingerprint": ["hash_1", "hash_2"]}
+
+
+def test_journal_upgrade_with_abi(tmp_path: Path):
+    """
+    Test that the serializer set by an upgrade is journaled and replayed
+    """
+    # Given
+    config = Config.get_config()
+    config.set_option("DATA_STORAGE", "journal")
+    current_timestamp = int(time.time())
+    scenario_name = "___test_journal_upgrade"
+    scenario_data = _ScenarioData(
+        scenario_name,
+        NetworkEnum.LOCAL,
+        current_timestamp,
+        current_timestamp,
+        {},
+    )
+    scenario_data.save()
+    wasm_path = tmp_path / "upgraded.wasm"
+    wasm_path.write_bytes(b"\x00asm_upgraded")
+    scenario_data.add_contract_data(
+        InternalContractData(
+            contract_id="upgraded_contract",
+            address="erd1qqqqqqqqqqqqqpgqdmq43snzxutandvqefxgj89r6fh528v9dwnswvgq9t",
+            serializer=None,
+            wasm_hash="",
+            deploy_time=current_timestamp,
+            last_upgrade_time=current_timestamp,
+            saved_values={},
+        )
+    )
+    step = ContractUpgradeStep(
+        sender="test_user_A",
+        contract="upgraded_contract",
+        wasm_path=wasm_path.as_posix(),
+        gas_limit=10000000,
+        abi_path="tests/data/abis/adder.abi.json",
+    )
+    on_chain_tx = TransactionOnNetwork()
+    on_chain_tx.timestamp = current_timestamp + 1
+
+    # When
+    try:
+        with patch(
+            "mxops.execution.steps.ScenarioData.get", return_value=scenario_data
+        ):
+            step._post_transaction_execution(on_chain_tx)
+        reloaded_scenario = _ScenarioData.load_from_name(scenario_name)
+    finally:
+        get_scenario_journal_path(scenario_name).unlink(missing_ok=True)
+        get_scenario_file_path(scenario_name).unlink()
+        config.set_option("DATA_STORAGE", "snapshot")
+
+    # Then
+    serializer = reloaded_scenario.contracts_data["upgraded_contract"].serializer
+    assert isinstance(serializer, AbiSerializer)
+    assert get_serializer_dict(serializer) == get_serializer_dict(
+        load_serializer_from_abi(Path("tests/data/abis/adder.abi.json"))
+    )
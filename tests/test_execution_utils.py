@@ -134,3 +134,36 @@ def test_retrieve_contract_address():
     # Assert
     assert isinstance(address, str)
     address == "erd1qqqqqqqqqqqqqpgqdmq43snzxutandvqefxgj89r6fh528v9dwnswvgq9t"
+
+
+def test_compiled_argument():
+    """
+    Test that a compiled argument is resolved like retrieve_value_from_any and that
+    its dynamic leaves are evaluated at each resolution
+    """
+    # Given
+    var_name = "PYTEST_MXOPS_COMPILED_VALUE"
+    os.environ[var_name] = "1"
+    argument = [
+        "0x0a0b",
+        {"literal": [1, 2, "text"], "dynamic": f"${var_name}:int"},
+        "%my_test_contract.address",
+        "[test_user_A]",
+        5,
+    ]
+
+    # When
+    template = utils.compile_argument(argument)
+    first_result = template.resolve()
+    first_expected_result = utils.retrieve_value_from_any(argument)
+    os.environ[var_name] = "2"
+    second_result = template.resolve()
+    literal_template = utils.compile_argument({"key": ["a", 1, "0x01"]})
+
+    # Then
+    assert first_result == first_expected_result
+    assert first_result[1]["dynamic"] == 1
+    assert second_result[1]["dynamic"] == 2
+    assert second_result == utils.retrieve_value_from_any(argument)
+    assert isinstance(literal_template, utils.LiteralArgument)
+    assert literal_template.resolve() == {"key": ["a", 1, b"\x01"]}
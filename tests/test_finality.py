@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from multiversx_sdk_network_providers.transaction_status import TransactionStatus
+from multiversx_sdk_network_providers.transactions import TransactionOnNetwork
+
+from mxops.execution.finality import FinalityTracker
+from mxops.execution.polling import FixedPollingPolicy
+
+
+def test_finality_tracker(test_data_folder_path: Path):
+    # Given
+    with open(test_data_folder_path / "api_responses" / "swap.json") as file:
+        on_chain_tx = TransactionOnNetwork.from_proxy_http_response(**json.load(file))
+    n_checks = {"hash_a": 0, "hash_b": 0}
+
+    def mock_get_status(tx_hash):
+        n_checks[tx_hash] += 1
+        if tx_hash == "hash_b" and n_checks[tx_hash] < 3:
+            return TransactionStatus("pending")
+        return TransactionStatus("success")
+
+    proxy = MagicMock()
+    proxy.get_transaction_status.side_effect = mock_get_status
+    proxy.get_transaction.return_value = on_chain_tx
+    tracker = FinalityTracker(max_workers=2)
+    callback_results = []
+
+    # When
+    with patch(
+        "mxops.execution.finality.ProxyRegistry.get_proxy", return_value=proxy
+    ), patch(
+        "mxops.execution.finality.get_polling_policy",
+        return_value=FixedPollingPolicy(0.01),
+    ):
+        future_a = tracker.track("hash_a")
+        future_b = tracker.track(
+            "hash_b", callback=lambda f: callback_results.append(f.result())
+        )
+        results = [future_a.result(timeout=5), future_b.result(timeout=5)]
+
+    # Then
+    assert results == [on_chain_tx, on_chain_tx]
+    assert callback_results == [on_chain_tx]
+    assert n_checks == {"hash_a": 1, "hash_b": 3}
+    assert tracker.get_n_tracked() == 0
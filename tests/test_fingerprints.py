@@ -0,0 +1,200 @@
+from concurrent.futures import Future
+from copy import copy
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from multiversx_sdk_network_providers.transactions import TransactionOnNetwork
+
+from mxops.config.config import Config
+from mxops.data.execution_data import ScenarioData
+from mxops.execution import utils
+from mxops.execution.account import AccountsManager
+from mxops.execution.fingerprints import StepsFingerprints
+from mxops.execution.msc import EsdtTransfer
+from mxops.execution.pipeline import TransactionPipeline
+from mxops.execution.scene import execute_step
+from mxops.execution.steps import (
+    ContractDeployStep,
+    EgldTransferStep,
+    LoopStep,
+    MultiTransfersStep,
+)
+
+
+def test_fingerprint_content(tmp_path: Path):
+    # Given
+    wasm_path = tmp_path / "contract.wasm"
+    wasm_path.write_bytes(b"\x00asm_v1")
+
+    def create_step(argument: int) -> ContractDeployStep:
+        return ContractDeployStep(
+            sender="test_user_A",
+            wasm_path=wasm_path.as_posix(),
+            contract_id="fingerprint_contract",
+            gas_limit=10000000,
+            arguments=[argument],
+        )
+
+    # When
+    fingerprint = create_step(1).compute_fingerprint()
+    same_fingerprint = create_step(1).compute_fingerprint()
+    other_arguments_fingerprint = create_step(2).compute_fingerprint()
+    wasm_path.write_bytes(b"\x00asm_v2")
+    other_wasm_fingerprint = create_step(1).compute_fingerprint()
+
+    # Then
+    assert fingerprint == same_fingerprint
+    assert fingerprint != other_arguments_fingerprint
+    assert fingerprint != other_wasm_fingerprint
+
+
+def test_incremental_occurrences():
+    # Given
+    config = Config.get_config()
+    scenario_data = ScenarioData.get()
+    steps = [
+        EgldTransferStep(sender="test_user_A", receiver="test_user_B", amount=7)
+        for _ in range(2)
+    ]
+    scenario_data.record_step_fingerprint(steps[0].compute_fingerprint(), 1, "hash")
+    StepsFingerprints.reset()
+
+    # When
+    config.set_option("INCREMENTAL_EXECUTION", "True")
+    skipped = [StepsFingerprints.register(step) for step in steps]
+    config.set_option("INCREMENTAL_EXECUTION", "False")
+
+    # Then
+    assert skipped == [True, False]
+    assert steps[1].fingerprint == (steps[0].fingerprint[0], 2)
+
+
+def test_incremental_failed_earlier_occurrence():
+    # Given
+    config = Config.get_config()
+    scenario_data = ScenarioData.get()
+    steps = [
+        EgldTransferStep(sender="test_user_A", receiver="test_user_B", amount=8)
+        for _ in range(3)
+    ]
+    # the second pipelined occurrence succeeded while the first one failed
+    scenario_data.record_step_fingerprint(steps[0].compute_fingerprint(), 2, "hash")
+    StepsFingerprints.reset()
+
+    # When
+    config.set_option("INCREMENTAL_EXECUTION", "True")
+    skipped = [StepsFingerprints.register(step) for step in steps]
+    config.set_option("INCREMENTAL_EXECUTION", "False")
+
+    # Then
+    assert skipped == [False, True, False]
+
+
+def test_fingerprint_disabled():
+    # Given
+    step = EgldTransferStep(sender="test_user_A", receiver="test_user_B", amount=7)
+
+    # When
+    with patch.object(EgldTransferStep, "compute_fingerprint") as mock_compute:
+        skipped = StepsFingerprints.register(step)
+
+    # Then
+    assert not skipped
+    assert step.fingerprint is None
+    assert mock_compute.call_count == 0
+
+
+def test_wallet_pool_fingerprint():
+    # Given
+    config = Config.get_config()
+    scenario_data = ScenarioData.get()
+    with patch("mxops.execution.account.ProxyRegistry.get_proxy") as mock_proxy:
+        mock_proxy.return_value.get_account.return_value.balance = 10**18
+        AccountsManager.load_wallet_pool(
+            "fingerprint_pool", ["test_user_A", "test_user_B"]
+        )
+    steps = [
+        EgldTransferStep(sender="fingerprint_pool", receiver="test_user_B", amount=9)
+        for _ in range(2)
+    ]
+    StepsFingerprints.reset()
+
+    # When
+    config.set_option("INCREMENTAL_EXECUTION", "True")
+    try:
+        with patch("mxops.execution.scene.dispatch_step") as mock_dispatch:
+            for step in steps:
+                execute_step(step, scenario_data)
+    finally:
+        config.set_option("INCREMENTAL_EXECUTION", "False")
+
+    # Then
+    senders = [call.args[0].sender for call in mock_dispatch.call_args_list]
+    assert senders == ["test_user_A", "test_user_B"]
+    assert steps[0].fingerprint == (steps[1].fingerprint[0], 1)
+    assert steps[1].fingerprint == (steps[0].fingerprint[0], 2)
+
+
+def test_fingerprint_transfers_resolved():
+    # Given
+    step = MultiTransfersStep(
+        sender="test_user_A",
+        receiver="test_user_B",
+        transfers=[EsdtTransfer("TKN-abcdef", "$FINGERPRINT_AMOUNT:int")],
+    )
+
+    # When
+    utils.set_variable("FINGERPRINT_AMOUNT", "1")
+    fingerprint = step.compute_fingerprint()
+    utils.set_variable("FINGERPRINT_AMOUNT", "2")
+    other_amount_fingerprint = step.compute_fingerprint()
+
+    # Then
+    assert fingerprint != other_amount_fingerprint
+
+
+def test_pipelined_fingerprint_occurrences(test_data_folder_path: Path):
+    # Given
+    config = Config.get_config()
+    with open(test_data_folder_path / "api_responses" / "swap.json") as file:
+        on_chain_tx = TransactionOnNetwork.from_proxy_http_response(**json.load(file))
+    scenario_data = ScenarioData.get()
+    loop_step = LoopStep(
+        steps=[
+            EgldTransferStep(sender="test_user_A", receiver="test_user_B", amount=3)
+        ],
+        var_name="FINGERPRINT_INDEX",
+        var_list=[0, 1, 2],
+    )
+    StepsFingerprints.reset()
+
+    def mock_track(tx_hash):
+        future = Future()
+        result = copy(on_chain_tx)
+        result.hash = tx_hash
+        future.set_result(result)
+        return future
+
+    # When
+    config.set_option("INCREMENTAL_EXECUTION", "True")
+    config.set_option("PIPELINE_TRANSACTIONS", "True")
+    try:
+        with patch(
+            "mxops.execution.pipeline.send_many",
+            side_effect=lambda txs: [f"hash_{tx.nonce}" for tx in txs],
+        ), patch("mxops.execution.pipeline.FinalityTracker.get") as mock_get_tracker:
+            mock_get_tracker.return_value.track.side_effect = mock_track
+            execute_step(loop_step, scenario_data)
+            fingerprint = loop_step.steps[0].fingerprint[0]
+            TransactionPipeline.flush()
+    finally:
+        TransactionPipeline.clear()
+        AccountsManager.get_lane("test_user_A").reset()
+        config.set_option("INCREMENTAL_EXECUTION", "False")
+        config.set_option("PIPELINE_TRANSACTIONS", "False")
+
+    # Then
+    tx_hashes = scenario_data.steps_fingerprints[fingerprint]
+    nonces = [int(tx_hash.split("_")[1]) for tx_hash in tx_hashes]
+    assert nonces == [nonces[0], nonces[0] + 1, nonces[0] + 2]
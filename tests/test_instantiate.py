@@ -1,11 +1,14 @@
+import os
 from pathlib import Path
+import shutil
+
 import yaml
 
 from mxpyserializer.abi_serializer import AbiSerializer
 
 from mxops.data.execution_data import ScenarioData
 from mxops.execution.checks import SuccessCheck
-from mxops.execution.scene import Scene, execute_scene
+from mxops.execution.scene import Scene, execute_scene, load_scene
 from mxops.execution.steps import (
     ContractCallStep,
     ContractDeployStep,
@@ -99,3 +102,24 @@ def test_abi_loading(test_data_folder_path: Path):
 
     # Then
     assert list(serializer.endpoints.keys()) == ["getSum", "upgrade", "add", "init"]
+
+
+def test_scene_cache(test_data_folder_path: Path, tmp_path: Path):
+    # Given
+    scene_path = tmp_path / "deploy_scene.yaml"
+    shutil.copy(test_data_folder_path / "deploy_scene.yaml", scene_path)
+
+    # When
+    first_scene = load_scene(scene_path)
+    first_scene.steps[0].contract_id = "modified-id"
+    second_scene = load_scene(scene_path)
+    with open(scene_path, "a", encoding="utf-8") as file:
+        file.write("\n  - type: ContractQuery\n    contract: abc\n    endpoint: get\n")
+    os.utime(scene_path, ns=(0, 0))
+    third_scene = load_scene(scene_path)
+
+    # Then
+    assert second_scene is not first_scene
+    assert second_scene.steps[0].contract_id == "SEGLD-minter"
+    assert len(second_scene.steps) == 6
+    assert len(third_scene.steps) == 7
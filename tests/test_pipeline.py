@@ -0,0 +1,256 @@
+from concurrent.futures import Future
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from multiversx_sdk_core import AddressComputer
+from multiversx_sdk_network_providers.transactions import TransactionOnNetwork
+import pytest
+
+from mxops import errors
+from mxops.config.config import Config
+from mxops.data.execution_data import ScenarioData
+from mxops.execution.account import AccountsManager
+from mxops.execution.network import send_many
+from mxops.execution.pipeline import TransactionPipeline
+from mxops.execution.scene import execute_step
+from mxops.execution.steps import (
+    ContractDeployFromSourceBatchStep,
+    EgldTransferStep,
+    FungibleIssueStep,
+)
+
+
+def test_pipeline_acceptance():
+    # Given
+    config = Config.get_config()
+    transfer_step = EgldTransferStep(
+        sender="test_user_A", receiver="test_user_B", amount=1
+    )
+    issue_step = FungibleIssueStep(
+        sender="test_user_A",
+        token_name="MyToken",
+        token_ticker="MTK",
+        initial_supply=1,
+        num_decimals=0,
+    )
+
+    # When
+    config.set_option("PIPELINE_TRANSACTIONS", "True")
+    accepted_transfer = TransactionPipeline.accepts(transfer_step)
+    accepted_issue = TransactionPipeline.accepts(issue_step)
+    config.set_option("PIPELINE_TRANSACTIONS", "False")
+    accepted_when_disabled = TransactionPipeline.accepts(transfer_step)
+
+    # Then
+    assert accepted_transfer
+    assert not accepted_issue
+    assert not accepted_when_disabled
+
+
+def test_pipeline_in_flight_limit(test_data_folder_path: Path):
+    # Given
+    config = Config.get_config()
+    config.set_option("MAX_IN_FLIGHT_TXS_PER_SENDER", "2")
+    with open(test_data_folder_path / "api_responses" / "swap.json") as file:
+        on_chain_tx = TransactionOnNetwork.from_proxy_http_response(**json.load(file))
+    account = AccountsManager.get_account("test_user_A")
+    start_nonce = account.nonce
+    steps = [
+        EgldTransferStep(sender="test_user_A", receiver="test_user_B", amount=i)
+        for i in range(3)
+    ]
+    sent_nonces = []
+    tracked_hashes = []
+
+    def mock_send_many(txs):
+        sent_nonces.extend(tx.nonce for tx in txs)
+        return [f"hash_{tx.nonce}" for tx in txs]
+
+    def mock_track(tx_hash):
+        tracked_hashes.append(tx_hash)
+        future = Future()
+        future.set_result(on_chain_tx)
+        return future
+
+    # When
+    with patch(
+        "mxops.execution.pipeline.send_many", side_effect=mock_send_many
+    ), patch("mxops.execution.pipeline.FinalityTracker.get") as mock_get_tracker:
+        mock_get_tracker.return_value.track.side_effect = mock_track
+        for step in steps:
+            TransactionPipeline.submit(step)
+        n_in_flight_before_flush = TransactionPipeline.get_n_in_flight("test_user_A")
+        TransactionPipeline.flush()
+
+    # Then
+    config.set_option("MAX_IN_FLIGHT_TXS_PER_SENDER", "50")
+    assert sent_nonces == [start_nonce, start_nonce + 1, start_nonce + 2]
+    assert tracked_hashes == [f"hash_{nonce}" for nonce in sent_nonces]
+    assert n_in_flight_before_flush == 1
+    assert TransactionPipeline.get_n_in_flight("test_user_A") == 0
+
+
+def test_deploy_from_source_batch():
+    # Given
+    source_code = b"\x00asm_source_code"
+    batch_step = ContractDeployFromSourceBatchStep(
+        sender="test_user_A",
+        source_contract="my_test_contract",
+        contract_ids=[f"cloned_contract_{i}" for i in range(3)],
+        gas_limit=10000000,
+        checks=[],
+    )
+    account = AccountsManager.get_account("test_user_A")
+    start_nonce = account.nonce
+    scenario_data = ScenarioData.get()
+    sent_txs = []
+
+    def mock_send_transactions(txs):
+        sent_txs.extend(txs)
+        return len(txs), {str(i): f"hash_{tx.nonce}" for i, tx in enumerate(txs)}
+
+    # When
+    with patch("mxops.execution.steps.ProxyRegistry.get_proxy") as mock_proxy:
+        mock_proxy.return_value.get_account.return_value.code = source_code
+        mock_proxy.return_value.send_transactions.side_effect = mock_send_transactions
+        execute_step(batch_step, scenario_data)
+
+    # Then
+    assert mock_proxy.return_value.get_account.call_count == 1
+    assert [tx.nonce for tx in sent_txs] == [start_nonce + i for i in range(3)]
+    assert all(tx.data.startswith(source_code.hex().encode()) for tx in sent_txs)
+    for i, tx in enumerate(sent_txs):
+        expected_address = AddressComputer().compute_contract_address(
+            account.address, tx.nonce
+        )
+        contract_address = scenario_data.get_contract_value(
+            f"cloned_contract_{i}", "address"
+        )
+        assert contract_address == expected_address.bech32()
+
+
+def test_send_many_chunks():
+    # Given
+    config = Config.get_config()
+    config.set_option("TX_SEND_CHUNK_SIZE", "2")
+    txs = [f"tx_{i}" for i in range(3)]
+    responses = [(1, {"0": "hash_0"}), (1, {"0": "hash_2"})]
+
+    # When
+    with patch("mxops.execution.network.ProxyRegistry.get_proxy") as mock_proxy:
+        mock_proxy.return_value.send_transactions.side_effect = responses
+        tx_hashes = send_many(txs)
+
+    # Then
+    config.set_option("TX_SEND_CHUNK_SIZE", "100")
+    assert tx_hashes == ["hash_0", None, "hash_2"]
+    assert [
+        call.args[0] for call in mock_proxy.return_value.send_transactions.mock_calls
+    ] == [["tx_0", "tx_1"], ["tx_2"]]
+
+
+def test_pipeline_rejected_transaction():
+    # Given
+    config = Config.get_config()
+    config.set_option("PIPELINE_TRANSACTIONS", "True")
+    steps = [
+        EgldTransferStep(
+            sender="test_user_A", receiver="test_user_B", amount=i, checks=[]
+        )
+        for i in range(2)
+    ]
+    nonces = []
+
+    def mock_send_many(txs):
+        nonces.extend(tx.nonce for tx in txs)
+        return ["hash_0", None]
+
+    # When
+    with patch("mxops.execution.pipeline.send_many", side_effect=mock_send_many):
+        for step in steps:
+            TransactionPipeline.submit(step)
+        with pytest.raises(errors.TransactionNotAccepted) as error:
+            TransactionPipeline.flush()
+    config.set_option("PIPELINE_TRANSACTIONS", "False")
+
+    # Then
+    assert str(nonces[1]) in str(error.value)
+    assert TransactionPipeline.get_n_in_flight("test_user_A") == 0
+
+
+def test_pipeline_rejected_nonce_filled():
+    # Given
+    config = Config.get_config()
+    config.set_option("PIPELINE_TRANSACTIONS", "True")
+    account = AccountsManager.get_account("test_user_A")
+    start_nonce = account.nonce
+    steps = [
+        EgldTransferStep(
+            sender="test_user_A", receiver="test_user_B", amount=i + 1, checks=[]
+        )
+        for i in range(3)
+    ]
+    sent_txs = []
+
+    def mock_send_many(txs):
+        sent_txs.append(txs)
+        if len(sent_txs) == 1:
+            return ["hash_0", None, "hash_2"]
+        return ["hash_filler"]
+
+    # When
+    try:
+        with patch("mxops.execution.pipeline.send_many", side_effect=mock_send_many):
+            for step in steps:
+                TransactionPipeline.submit(step)
+            with pytest.raises(errors.TransactionNotAccepted):
+                TransactionPipeline.flush()
+        n_in_flight = AccountsManager.get_lane("test_user_A").get_n_in_flight()
+    finally:
+        TransactionPipeline.clear()
+        AccountsManager.get_lane("test_user_A").reset()
+        config.set_option("PIPELINE_TRANSACTIONS", "False")
+
+    # Then
+    assert len(sent_txs) == 2
+    filler = sent_txs[1][0]
+    assert filler.nonce == start_nonce + 1
+    assert filler.amount == 0
+    assert filler.receiver == filler.sender == account.address.to_bech32()
+    assert len(filler.signature) == 64
+    assert account.nonce == start_nonce + 3
+    assert n_in_flight == 1
+
+
+def test_deploy_from_source_batch_wallet_pool():
+    # Given
+    source_code = b"\x00asm_source_code"
+    with patch("mxops.execution.account.ProxyRegistry.get_proxy") as mock_proxy:
+        mock_proxy.return_value.get_account.return_value.balance = 10**18
+        AccountsManager.load_wallet_pool("deploy_pool", ["test_user_A", "test_user_B"])
+    batch_step = ContractDeployFromSourceBatchStep(
+        sender="deploy_pool",
+        source_contract="my_test_contract",
+        contract_ids=[f"pool_cloned_contract_{i}" for i in range(3)],
+        gas_limit=10000000,
+        checks=[],
+    )
+    sent_txs = []
+
+    def mock_send_transactions(txs):
+        sent_txs.extend(txs)
+        return len(txs), {str(i): f"hash_{tx.nonce}" for i, tx in enumerate(txs)}
+
+    # When
+    with patch("mxops.execution.steps.ProxyRegistry.get_proxy") as mock_proxy:
+        mock_proxy.return_value.get_account.return_value.code = source_code
+        mock_proxy.return_value.send_transactions.side_effect = mock_send_transactions
+        execute_step(batch_step, ScenarioData.get())
+
+    # Then
+    senders = [
+        AccountsManager.get_account(name).address.to_bech32()
+        for name in ("test_user_A", "test_user_B", "test_user_A")
+    ]
+    assert [tx.sender for tx in sent_txs] == senders
@@ -0,0 +1,28 @@
+from itertools import islice
+
+from mxops.execution.polling import AdaptivePollingPolicy, FixedPollingPolicy
+
+
+def test_fixed_polling_policy():
+    # Given
+    policy = FixedPollingPolicy(3)
+
+    # When
+    delays = list(islice(policy.get_delays(), 4))
+
+    # Then
+    assert delays == [3, 3, 3, 3]
+
+
+def test_adaptive_polling_policy():
+    # Given
+    policy = AdaptivePollingPolicy(first_delay=0.5, backoff_factor=2, max_delay=6)
+
+    # When
+    delays = list(islice(policy.get_delays(), 6))
+    policy.record_completion(5)
+    learned_delays = list(islice(policy.get_delays(), 2))
+
+    # Then
+    assert delays == [0.5, 1, 2, 4, 6, 6]
+    assert learned_delays == [4, 6]
@@ -0,0 +1,19 @@
+from mxops.execution.proxy import ProxyRegistry
+
+
+def test_proxy_registry_reuse():
+    # Given
+    url_a = "http://localhost:7950"
+    url_b = "https://devnet-gateway.multiversx.com"
+
+    # When
+    proxy_a = ProxyRegistry.get_proxy(url_a)
+    proxy_a_bis = ProxyRegistry.get_proxy(url_a)
+    proxy_b = ProxyRegistry.get_proxy(url_b)
+    stats = ProxyRegistry.get_connections_stats()
+
+    # Then
+    assert proxy_a is proxy_a_bis
+    assert proxy_a is not proxy_b
+    assert proxy_a.session is not proxy_b.session
+    assert stats[url_a] == {"requests": 0, "opened": 0, "reused": 0}
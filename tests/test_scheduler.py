@@ -0,0 +1,205 @@
+import os
+from pathlib import Path
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from mxops.data.execution_data import ScenarioData
+from mxops.execution.account import AccountsManager
+from mxops.execution.scene import execute_step
+from mxops.execution.scheduler import (
+    build_dependency_graph,
+    execute_steps_in_parallel,
+)
+from mxops.execution.steps import (
+    ContractCallStep,
+    ContractDeployStep,
+    ContractQueryStep,
+    EgldTransferStep,
+    LoopStep,
+    PythonStep,
+)
+from mxops.execution.user_modules import load_user_module
+
+
+def test_dependency_graph():
+    # Given
+    steps = [
+        ContractDeployStep(
+            sender="alice", wasm_path="a.wasm", contract_id="contract_a", gas_limit=1
+        ),
+        ContractDeployStep(
+            sender="bob", wasm_path="b.wasm", contract_id="contract_b", gas_limit=1
+        ),
+        ContractCallStep(
+            sender="charlie",
+            contract="contract_a",
+            endpoint="setB",
+            gas_limit=1,
+            arguments=["%contract_b.address"],
+        ),
+        ContractQueryStep(contract="contract_b", endpoint="getValue"),
+        EgldTransferStep(sender="dave", receiver="erin", amount=1),
+        PythonStep(module_path="module.py", function="func"),
+        EgldTransferStep(sender="erin", receiver="frank", amount=1),
+    ]
+
+    # When
+    predecessors = build_dependency_graph(steps)
+
+    # Then
+    assert predecessors == [
+        set(),
+        set(),
+        {0, 1},
+        {1, 2},
+        set(),
+        {0, 1, 2, 3, 4},
+        {4, 5},
+    ]
+
+
+def test_parallel_execution_order():
+    # Given
+    steps = [
+        EgldTransferStep(sender="alice", receiver="bob", amount=0),
+        EgldTransferStep(sender="charlie", receiver="dave", amount=1),
+        EgldTransferStep(sender="bob", receiver="erin", amount=2),
+    ]
+    completed = []
+    lock = threading.Lock()
+
+    def execute_function(step: EgldTransferStep):
+        if step.amount == 0:
+            time.sleep(0.05)
+        with lock:
+            completed.append(step.amount)
+
+    # When
+    execute_steps_in_parallel(steps, execute_function, 3)
+
+    # Then
+    assert completed == [1, 0, 2]
+
+
+def test_parallel_execution_error():
+    # Given
+    steps = [
+        EgldTransferStep(sender="alice", receiver="bob", amount=0),
+        EgldTransferStep(sender="alice", receiver="bob", amount=1),
+        EgldTransferStep(sender="charlie", receiver="dave", amount=2),
+    ]
+    executed = []
+
+    def execute_function(step: EgldTransferStep):
+        executed.append(step.amount)
+        if step.amount == 0:
+            raise ValueError("failed step")
+
+    # When
+    with pytest.raises(ValueError, match="failed step"):
+        execute_steps_in_parallel(steps, execute_function, 2)
+
+    # Then
+    assert 1 not in executed
+
+
+def test_parallel_loop_variables_scope(tmp_path: Path):
+    # Given
+    module_path = tmp_path / "record_module.py"
+    module_path.write_text(
+        "import threading\nimport time\n\nVALUES = []\n\n\n"
+        "def record(value):\n"
+        "    time.sleep(0.01)\n"
+        "    VALUES.append((value, threading.get_ident()))\n"
+    )
+    loop_step = LoopStep(
+        steps=[PythonStep(module_path.as_posix(), "record", ["$LOOP_VAR:int"])],
+        var_name="LOOP_VAR",
+        var_start=0,
+        var_end=20,
+        parallelism=4,
+    )
+    os.environ.pop("LOOP_VAR", None)
+
+    # When
+    execute_step(loop_step, ScenarioData.get())
+
+    # Then
+    recorded = load_user_module(module_path).VALUES
+    assert sorted(value for value, _ in recorded) == list(range(20))
+    assert len({thread_id for _, thread_id in recorded}) > 1
+    assert "LOOP_VAR" not in os.environ
+
+
+def test_parallel_loop_nonces():
+    # Given
+    account = AccountsManager.get_account("test_user_A")
+    start_nonce = account.nonce
+    loop_step = LoopStep(
+        steps=[
+            EgldTransferStep(
+                sender="test_user_A",
+                receiver="test_user_B",
+                amount="$AMOUNT:int",
+                checks=[],
+            )
+        ],
+        var_name="AMOUNT",
+        var_list=list(range(1, 31)),
+        parallelism=8,
+    )
+    sent = []
+
+    def mock_send(tx):
+        time.sleep(0.001)
+        sent.append((tx.nonce, tx.amount))
+        return f"hash_{tx.nonce}"
+
+    # When
+    with patch("mxops.execution.steps.send", side_effect=mock_send):
+        execute_step(loop_step, ScenarioData.get())
+
+    # Then
+    assert [nonce for nonce, _ in sent] == list(range(start_nonce, start_nonce + 30))
+    assert sorted(value for _, value in sent) == list(range(1, 31))
+    assert account.nonce == start_nonce + 30
+
+
+def test_loop_wallet_pool_fan_out():
+    # Given
+    with patch("mxops.execution.account.ProxyRegistry.get_proxy") as mock_proxy:
+        mock_proxy.return_value.get_account.return_value.balance = 10**18
+        AccountsManager.load_wallet_pool(
+            "fan_out_pool", ["test_user_A", "test_user_B"]
+        )
+    loop_step = LoopStep(
+        steps=[
+            EgldTransferStep(
+                sender="fan_out_pool",
+                receiver="test_user_B",
+                amount="$AMOUNT:int",
+                checks=[],
+            )
+        ],
+        var_name="AMOUNT",
+        var_list=list(range(1, 11)),
+        parallelism=4,
+    )
+    sent = []
+
+    def mock_send(tx):
+        sent.append((tx.sender, tx.amount))
+        return f"hash_{tx.nonce}"
+
+    # When
+    with patch("mxops.execution.steps.send", side_effect=mock_send):
+        execute_step(loop_step, ScenarioData.get())
+
+    # Then
+    senders = [sender for sender, _ in sent]
+    assert senders.count(senders[0]) == 5
+    assert len(set(senders)) == 2
+    assert sorted(value for _, value in sent) == list(range(1, 11))
@@ -0,0 +1,36 @@
+from copy import deepcopy
+
+from mxops.config.config import Config
+from mxops.execution.signing import TransactionSigner
+from mxops.execution.steps import EgldTransferStep
+
+
+def test_sign_many_in_workers():
+    # Given
+    config = Config.get_config()
+    transactions = [
+        (
+            sender,
+            EgldTransferStep(
+                sender=sender, receiver="test_user_B", amount=i
+            ).build_transaction(),
+        )
+        for i, sender in enumerate(["test_user_A", "test_user_B"] * 2)
+    ]
+    local_transactions = deepcopy(transactions)
+
+    # When
+    config.set_option("SIGNING_WORKERS", "2")
+    try:
+        TransactionSigner.sign_many(transactions)
+    finally:
+        TransactionSigner.terminate()
+        config.set_option("SIGNING_WORKERS", "0")
+    TransactionSigner.sign_many(local_transactions)
+
+    # Then
+    assert [tx.signature for _, tx in transactions] == [
+        tx.signature for _, tx in local_transactions
+    ]
+    assert all(len(tx.signature) == 64 for _, tx in transactions)
+    assert TransactionSigner.get_signing_rate() > 0
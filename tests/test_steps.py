@@ -1,6 +1,27 @@
+import base64
+import hashlib
 import os
-from mxops.data.execution_data import ScenarioData
-from mxops.execution.steps import PythonStep
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from multiversx_sdk_core import AddressComputer
+
+import pytest
+
+from mxops import errors
+from mxops.config.config import Config
+from mxops.data.execution_data import InternalContractData, ScenarioData
+from mxops.execution.scene import execute_step
+from mxops.execution.account import AccountsManager
+from mxops.execution.steps import (
+    ContractDeployStep,
+    ContractUpgradeStep,
+    LoopStep,
+    PythonStep,
+)
+from mxops.execution.user_modules import clear_user_modules_cache, load_user_module
+from mxops.execution import utils
+from mxops.utils.msc import get_file_hash
 
 
 def test_python_step():
@@ -37,6 +58,273 @@ def test_python_step():
     assert os_value_2 == "4582"
 
 
+def test_python_step_module_cache(tmp_path: Path):
+    # Given
+    module_path = tmp_path / "value_module.py"
+    module_path.write_text("VERSION = 1\n\n\ndef count():\n    return 'a'\n")
+    step = PythonStep(module_path.as_posix(), "count")
+
+    # When
+    step.execute()
+    first_module = load_user_module(module_path)
+    step.execute()
+    second_module = load_user_module(module_path)
+    module_path.write_text("def count():\n    return 'b'\n")
+    stat = os.stat(module_path)
+    os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    step.execute()
+    reloaded_module = load_user_module(module_path)
+    clear_user_modules_cache()
+    module_after_clear = load_user_module(module_path)
+
+    # Then
+    assert first_module is second_module
+    assert os.environ["MXOPS_COUNT_RESULT"] == "b"
+    assert not hasattr(reloaded_module, "VERSION")
+    assert module_after_clear is not reloaded_module
+
+
+def test_python_step_in_worker(tmp_path: Path):
+    # Given
+    module_path = tmp_path / "worker_module.py"
+    module_path.write_text(
+        "import os\nimport time\n\n\n"
+        "def get_pid(duration):\n"
+        "    time.sleep(duration)\n"
+        "    return str(os.getpid())\n"
+    )
+    config = Config.get_config()
+    config.set_option("PYTHON_STEP_TIMEOUT", "30")
+    step = PythonStep(module_path.as_posix(), "get_pid", [0], in_worker=True)
+    slow_step = PythonStep(module_path.as_posix(), "get_pid", [5], in_worker=True)
+
+    # When
+    step.execute()
+    config.set_option("PYTHON_STEP_TIMEOUT", "0.5")
+    with pytest.raises(errors.PythonFunctionTimeout):
+        slow_step.execute()
+    config.set_option("PYTHON_STEP_TIMEOUT", "600")
+
+    # Then
+    assert step.PARALLELIZABLE
+    assert os.environ["MXOPS_GET_PID_RESULT"] != str(os.getpid())
+
+
 def test_query_step():
     # Given
     pass
+
+
+def test_loop_step_csv_resume(tmp_path: Path):
+    # Given
+    csv_path = tmp_path / "airdrop.csv"
+    csv_path.write_text(
+        "RECEIVER,AMOUNT\n" + "".join(f"user_{i},{i}\n" for i in range(6))
+    )
+    module_path = tmp_path / "airdrop_module.py"
+    module_path.write_text(
+        "SENT = []\nFAILURES = []\n\n\n"
+        "def send(receiver, amount):\n"
+        "    if amount == 3 and len(FAILURES) == 0:\n"
+        "        FAILURES.append(amount)\n"
+        "        raise RuntimeError('network error')\n"
+        "    SENT.append((receiver, amount))\n"
+    )
+    loop_step = LoopStep(
+        steps=[
+            PythonStep(module_path.as_posix(), "send", ["$RECEIVER", "$AMOUNT:int"])
+        ],
+        var_name="ROW_INDEX",
+        var_file=csv_path.as_posix(),
+        resume_key="airdrop_offset",
+    )
+    scenario_data = ScenarioData.get()
+
+    # When
+    with pytest.raises(RuntimeError):
+        execute_step(loop_step, scenario_data)
+    offset_after_failure = scenario_data.get_value("airdrop_offset")
+    execute_step(loop_step, scenario_data)
+
+    # Then
+    assert offset_after_failure == 3
+    assert scenario_data.get_value("airdrop_offset") == 0
+    assert load_user_module(module_path).SENT == [(f"user_{i}", i) for i in range(6)]
+
+
+def test_loop_step_rerun_after_completion(tmp_path: Path):
+    # Given
+    module_path = tmp_path / "rerun_module.py"
+    module_path.write_text(
+        "CALLS = []\n\n\ndef record(value):\n    CALLS.append(value)\n"
+    )
+    loop_step = LoopStep(
+        steps=[PythonStep(module_path.as_posix(), "record", ["$INDEX"])],
+        var_name="INDEX",
+        var_list=[1, 2, 3],
+        resume_key="rerun_offset",
+    )
+    scenario_data = ScenarioData.get()
+
+    # When
+    execute_step(loop_step, scenario_data)
+    execute_step(loop_step, scenario_data)
+
+    # Then
+    assert load_user_module(module_path).CALLS == ["1", "2", "3"] * 2
+    assert scenario_data.get_value("rerun_offset") == 0
+
+
+def test_loop_step_csv_extra_columns(tmp_path: Path):
+    # Given
+    csv_path = tmp_path / "rows.csv"
+    csv_path.write_text("NAME,VALUE\nn0,0\nn1,1,extra\n")
+    loop_step = LoopStep(steps=[], var_name="ROW", var_file=csv_path.as_posix())
+
+    # When
+    variables = loop_step.generate_variables()
+    first_variables = next(variables)
+    with pytest.raises(ValueError) as error:
+        next(variables)
+
+    # Then
+    assert first_variables == {"ROW": 0, "NAME": "n0", "VALUE": "0"}
+    assert "Line 3" in str(error.value)
+
+
+def test_loop_step_jsonl_chunks(tmp_path: Path):
+    # Given
+    jsonl_path = tmp_path / "rows.jsonl"
+    jsonl_path.write_text(
+        "".join(f'{{"NAME": "n{i}", "VALUE": {i}}}\n' for i in range(5)) + "\n"
+    )
+    loop_step = LoopStep(
+        steps=[], var_name="ROW", var_file=jsonl_path.as_posix(), chunk_size=2
+    )
+
+    # When
+    chunks = list(loop_step.generate_chunks())
+
+    # Then
+    assert [offset for offset, _ in chunks] == [2, 4, 5]
+    assert chunks[2][1] == [{"ROW": 4, "NAME": "n4", "VALUE": 4}]
+
+
+def test_upgrade_skip_if_unchanged(tmp_path: Path):
+    # Given
+    wasm_path = tmp_path / "upgraded.wasm"
+    wasm_path.write_bytes(b"\x00asm_code")
+    scenario_data = ScenarioData.get()
+    scenario_data.add_contract_data(
+        InternalContractData(
+            contract_id="upgraded_contract",
+            address="erd1qqqqqqqqqqqqqpgqdmq43snzxutandvqefxgj89r6fh528v9dwnswvgq9t",
+            serializer=None,
+            wasm_hash=get_file_hash(wasm_path),
+            deploy_time=1,
+            last_upgrade_time=1,
+            saved_values={},
+        )
+    )
+    step = ContractUpgradeStep(
+        sender="test_user_A",
+        contract="upgraded_contract",
+        wasm_path=wasm_path.as_posix(),
+        gas_limit=10000000,
+        skip_if_unchanged=True,
+    )
+    code_hash = hashlib.blake2b(wasm_path.read_bytes(), digest_size=32).digest()
+
+    # When
+    with patch("mxops.execution.steps.ProxyRegistry.get_proxy") as mock_proxy, patch(
+        "mxops.execution.steps.TransactionStep.execute"
+    ) as mock_execute:
+        mock_account = mock_proxy.return_value.get_account.return_value
+        mock_account.code_hash = base64.b64encode(code_hash).decode()
+        step.execute()
+        n_upgrades_unchanged = mock_execute.call_count
+        wasm_path.write_bytes(b"\x00asm_new_code")
+        step.execute()
+        n_upgrades_changed = mock_execute.call_count
+
+    # Then
+    assert n_upgrades_unchanged == 0
+    assert n_upgrades_changed == 1
+    assert mock_proxy.return_value.get_account.call_count == 1
+
+
+def test_deploy_address_computed_at_signing(tmp_path: Path):
+    # Given
+    wasm_path = tmp_path / "deployed.wasm"
+    wasm_path.write_bytes(b"\x00asm_code")
+    step = ContractDeployStep(
+        sender="test_user_A",
+        wasm_path=wasm_path.as_posix(),
+        contract_id="locally_computed_contract",
+        gas_limit=10000000,
+        checks=[],
+    )
+    AccountsManager.get_account("test_user_A").nonce = 42
+    scenario_data = ScenarioData.get()
+    expected_address = AddressComputer().compute_contract_address(
+        utils.get_address_instance("test_user_A"), 42
+    )
+
+    # When
+    tx = step.build_signed_transaction()
+    registered_address = scenario_data.get_contract_value(
+        "locally_computed_contract", "address"
+    )
+    failed_tx = MagicMock()
+    failed_tx.logs.events = []
+    with pytest.raises(errors.ParsingError):
+        step.process_on_chain_transaction(failed_tx)
+
+    # Then
+    assert tx.nonce == 42
+    assert registered_address == expected_address.bech32()
+    assert "locally_computed_contract" not in scenario_data.contracts_data
+
+
+def test_deploy_registration_released(tmp_path: Path):
+    # Given
+    wasm_path = tmp_path / "released.wasm"
+    wasm_path.write_bytes(b"\x00asm_code")
+    step = ContractDeployStep(
+        sender="test_user_A",
+        wasm_path=wasm_path.as_posix(),
+        contract_id="released_contract",
+        gas_limit=10000000,
+        checks=[],
+    )
+    account = AccountsManager.get_account("test_user_A")
+    account.nonce = 42
+    scenario_data = ScenarioData.get()
+
+    # When
+    with patch("mxops.execution.steps.send", side_effect=RuntimeError("timeout")):
+        with pytest.raises(RuntimeError):
+            step.execute()
+    nonce_after_failed_send = account.nonce
+    registered_after_failed_send = "released_contract" in scenario_data.contracts_data
+    step.build_signed_transaction()
+    # the process stops before sending and the nonce is synchronised again
+    account.nonce = 42
+    AccountsManager.get_lane("test_user_A").reset()
+    tx = step.build_signed_transaction()
+    AccountsManager.get_lane("test_user_A").reset()
+    registered_address = scenario_data.get_contract_value(
+        "released_contract", "address"
+    )
+    scenario_data.remove_contract_data("released_contract")
+
+    # Then
+    assert nonce_after_failed_send == 42
+    assert not registered_after_failed_send
+    assert tx.nonce == 42
+    assert (
+        registered_address
+        == AddressComputer()
+        .compute_contract_address(utils.get_address_instance("test_user_A"), 42)
+        .bech32()
+    )
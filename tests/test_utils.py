@@ -1,7 +1,12 @@
+import hashlib
+from pathlib import Path
+from unittest.mock import patch
+
 from multiversx_sdk_core import Address
 import pytest
 
 from mxops.execution.utils import get_address_instance
+from mxops.utils import artifacts
 
 
 @pytest.mark.parametrize(
@@ -33,3 +38,31 @@ def test_get_address_instance(address_str: str, expected_result: Address):
     result = get_address_instance(address_str)
     # Then
     assert expected_result.bech32() == result.bech32()
+
+
+def test_artifacts_cache(tmp_path: Path):
+    # Given
+    wasm_path = tmp_path / "contract.wasm"
+    wasm_path.write_bytes(b"\x00asm_v1")
+    artifacts.clear_artifacts_cache()
+
+    # When
+    with patch(
+        "mxops.utils.artifacts._read_artifact", wraps=artifacts._read_artifact
+    ) as mock_read:
+        artifact = artifacts.load_artifact(wasm_path)
+        cached_artifact = artifacts.load_artifact(wasm_path)
+        wasm_path.write_bytes(b"\x00asm_v2_longer")
+        new_artifact = artifacts.load_artifact(wasm_path)
+
+    # Then
+    assert artifacts.get_n_cached_artifacts() == 1
+    assert mock_read.call_count == 2
+    assert cached_artifact is artifact
+    assert artifact.content == b"\x00asm_v1"
+    assert new_artifact.content == b"\x00asm_v2_longer"
+    assert new_artifact.sha256 == hashlib.sha256(new_artifact.content).hexdigest()
+    assert (
+        new_artifact.code_hash
+        == hashlib.blake2b(new_artifact.content, digest_size=32).hexdigest()
+    )